@@ -19,9 +19,13 @@ from app.database import Base
 
 # Import all models so they're registered with Base.metadata
 from app.models import (  # noqa: F401
+    IdempotencyKey,
     Invoice,
     InvoiceItem,
+    RateLimitBucket,
     SubmissionAttempt,
+    SubmissionJob,
+    SubmissionPayload,
     Tenant,
     User,
 )
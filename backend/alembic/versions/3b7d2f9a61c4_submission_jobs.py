@@ -0,0 +1,47 @@
+"""submission_jobs
+
+Revision ID: 3b7d2f9a61c4
+Revises: 10e4fac5e5d4
+Create Date: 2026-10-16 09:12:44.210391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2f9a61c4'
+down_revision: Union[str, Sequence[str], None] = '10e4fac5e5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE invoicestatus ADD VALUE IF NOT EXISTS 'QUEUED'")
+    op.create_table('submission_jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('invoice_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='submissionjobstatus'), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True, comment='Failure detail when the job did not succeed'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_submission_jobs_invoice_id'), 'submission_jobs', ['invoice_id'], unique=False)
+    op.create_index(op.f('ix_submission_jobs_tenant_id'), 'submission_jobs', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_submission_jobs_tenant_id'), table_name='submission_jobs')
+    op.drop_index(op.f('ix_submission_jobs_invoice_id'), table_name='submission_jobs')
+    op.drop_table('submission_jobs')
+    sa.Enum(name='submissionjobstatus').drop(op.get_bind(), checkfirst=True)
+    # PostgreSQL cannot drop a single enum value; 'QUEUED' stays on invoicestatus.
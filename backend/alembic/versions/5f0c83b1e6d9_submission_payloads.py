@@ -0,0 +1,42 @@
+"""submission_payloads
+
+Revision ID: 5f0c83b1e6d9
+Revises: d2a95c7e4f18
+Create Date: 2026-10-16 14:02:41.774203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0c83b1e6d9'
+down_revision: Union[str, Sequence[str], None] = 'd2a95c7e4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('submission_payloads',
+    sa.Column('sha256', sa.String(length=64), nullable=False, comment='Hex SHA-256 of the uncompressed request body'),
+    sa.Column('invoice_id', sa.Uuid(), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False, comment='zlib-compressed request body'),
+    sa.Column('size_bytes', sa.Integer(), nullable=False, comment='Uncompressed size'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_index(op.f('ix_submission_payloads_invoice_id'), 'submission_payloads', ['invoice_id'], unique=False)
+    op.add_column('submission_attempts', sa.Column('payload_sha256', sa.String(length=64), nullable=True, comment='SHA-256 of the exact request body sent (see submission_payloads)'))
+    op.create_foreign_key(op.f('submission_attempts_payload_sha256_fkey'), 'submission_attempts', 'submission_payloads', ['payload_sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('submission_attempts_payload_sha256_fkey'), 'submission_attempts', type_='foreignkey')
+    op.drop_column('submission_attempts', 'payload_sha256')
+    op.drop_index(op.f('ix_submission_payloads_invoice_id'), table_name='submission_payloads')
+    op.drop_table('submission_payloads')
@@ -0,0 +1,36 @@
+"""submission_job_leases
+
+Revision ID: 8c41e0d5b2a7
+Revises: 3b7d2f9a61c4
+Create Date: 2026-10-16 10:03:18.775102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e0d5b2a7'
+down_revision: Union[str, Sequence[str], None] = '3b7d2f9a61c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('submission_jobs', sa.Column('lease_owner', sa.String(length=100), nullable=True, comment='Worker currently holding the job'))
+    op.add_column('submission_jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True, comment='Job may be reclaimed by another worker after this time'))
+    op.add_column('submission_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('submission_jobs', sa.Column('claim_count', sa.Integer(), server_default='0', nullable=False, comment='Number of times a worker has claimed this job'))
+    op.create_index('ix_submission_jobs_status_created_at', 'submission_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submission_jobs_status_created_at', table_name='submission_jobs')
+    op.drop_column('submission_jobs', 'claim_count')
+    op.drop_column('submission_jobs', 'heartbeat_at')
+    op.drop_column('submission_jobs', 'lease_expires_at')
+    op.drop_column('submission_jobs', 'lease_owner')
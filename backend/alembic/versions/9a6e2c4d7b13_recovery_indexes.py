@@ -0,0 +1,29 @@
+"""recovery_indexes
+
+Revision ID: 9a6e2c4d7b13
+Revises: 5f0c83b1e6d9
+Create Date: 2026-10-16 15:37:12.408519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6e2c4d7b13'
+down_revision: Union[str, Sequence[str], None] = '5f0c83b1e6d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_submission_attempts_outcome_attempted_at', 'submission_attempts', ['outcome', 'attempted_at'], unique=False)
+    op.create_index('ix_invoices_status_updated_at', 'invoices', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_status_updated_at', table_name='invoices')
+    op.drop_index('ix_submission_attempts_outcome_attempted_at', table_name='submission_attempts')
@@ -0,0 +1,47 @@
+"""shared_submission_payloads
+
+Revision ID: a7d4e1c9f352
+Revises: f3c6a9d2b814
+Create Date: 2026-10-17 12:21:05.390817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e1c9f352'
+down_revision: Union[str, Sequence[str], None] = 'f3c6a9d2b814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Snapshots are shared by identical bodies, so no invoice owns (or cascades) them
+    op.drop_index(op.f('ix_submission_payloads_invoice_id'), table_name='submission_payloads')
+    op.drop_constraint(op.f('submission_payloads_invoice_id_fkey'), 'submission_payloads', type_='foreignkey')
+    op.drop_column('submission_payloads', 'invoice_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('submission_payloads', sa.Column('invoice_id', sa.Uuid(), nullable=True))
+    # Give each snapshot to the first invoice whose attempt sent it
+    op.execute(
+        """
+        UPDATE submission_payloads p
+        SET invoice_id = (
+            SELECT a.invoice_id FROM submission_attempts a
+            WHERE a.payload_sha256 = p.sha256
+            ORDER BY a.attempted_at
+            LIMIT 1
+        )
+        """
+    )
+    op.execute("DELETE FROM submission_payloads WHERE invoice_id IS NULL")
+    op.alter_column('submission_payloads', 'invoice_id', nullable=False)
+    op.create_foreign_key(op.f('submission_payloads_invoice_id_fkey'), 'submission_payloads', 'invoices', ['invoice_id'], ['id'], ondelete='CASCADE')
+    op.create_index(op.f('ix_submission_payloads_invoice_id'), 'submission_payloads', ['invoice_id'], unique=False)
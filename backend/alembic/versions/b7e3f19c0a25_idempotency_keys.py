@@ -0,0 +1,41 @@
+"""idempotency_keys
+
+Revision ID: b7e3f19c0a25
+Revises: 9a6e2c4d7b13
+Create Date: 2026-10-16 16:48:30.152907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3f19c0a25'
+down_revision: Union[str, Sequence[str], None] = '9a6e2c4d7b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False, comment='Client-supplied Idempotency-Key header'),
+    sa.Column('request_fingerprint', sa.String(length=64), nullable=False, comment='SHA-256 of method, path, query and body of the first request'),
+    sa.Column('response_status', sa.Integer(), nullable=True, comment='HTTP status of the stored response (null while in progress)'),
+    sa.Column('response_body', sa.Text(), nullable=True),
+    sa.Column('response_headers', sa.JSON(), nullable=True, comment='Headers replayed with the response (e.g. Location)'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tenant_id', 'key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_expires_at'), 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_idempotency_keys_expires_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
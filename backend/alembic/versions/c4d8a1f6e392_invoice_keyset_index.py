@@ -0,0 +1,28 @@
+"""invoice_keyset_index
+
+Revision ID: c4d8a1f6e392
+Revises: b7e3f19c0a25
+Create Date: 2026-10-16 19:05:41.227310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8a1f6e392'
+down_revision: Union[str, Sequence[str], None] = 'b7e3f19c0a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_invoices_tenant_created_at_id', 'invoices', ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_tenant_created_at_id', table_name='invoices')
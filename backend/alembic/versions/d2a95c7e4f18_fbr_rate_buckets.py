@@ -0,0 +1,33 @@
+"""fbr_rate_buckets
+
+Revision ID: d2a95c7e4f18
+Revises: 8c41e0d5b2a7
+Create Date: 2026-10-16 11:27:05.318846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a95c7e4f18'
+down_revision: Union[str, Sequence[str], None] = '8c41e0d5b2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fbr_rate_buckets',
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False, comment='Token balance at updated_at (negative while callers are waiting)'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('fbr_rate_buckets')
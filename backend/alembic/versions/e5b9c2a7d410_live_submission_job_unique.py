@@ -0,0 +1,43 @@
+"""live_submission_job_unique
+
+Revision ID: e5b9c2a7d410
+Revises: c4d8a1f6e392
+Create Date: 2026-10-17 09:12:40.518273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c2a7d410'
+down_revision: Union[str, Sequence[str], None] = 'c4d8a1f6e392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest live job per invoice; later duplicates could double-send
+    op.execute(
+        """
+        UPDATE submission_jobs
+        SET status = 'FAILED', error = 'Duplicate live job for the invoice', finished_at = now()
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY invoice_id ORDER BY created_at) AS n
+                FROM submission_jobs
+                WHERE status IN ('QUEUED', 'RUNNING')
+            ) live
+            WHERE n > 1
+        )
+        """
+    )
+    op.create_index('uq_submission_jobs_live_invoice', 'submission_jobs', ['invoice_id'], unique=True, postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_submission_jobs_live_invoice', table_name='submission_jobs', postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"))
@@ -0,0 +1,29 @@
+"""invoice_needs_review
+
+Revision ID: f3c6a9d2b814
+Revises: e5b9c2a7d410
+Create Date: 2026-10-17 11:02:17.846120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c6a9d2b814'
+down_revision: Union[str, Sequence[str], None] = 'e5b9c2a7d410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE invoicestatus ADD VALUE IF NOT EXISTS 'NEEDS_REVIEW'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Hand them back to the reconciler.
+    # PostgreSQL cannot drop a single enum value; 'NEEDS_REVIEW' stays on invoicestatus.
+    op.execute("UPDATE invoices SET status = 'UNKNOWN' WHERE status = 'NEEDS_REVIEW'")
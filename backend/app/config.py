@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     app_env: Literal["development", "staging", "production"] = "development"
     debug: bool = False
     secret_key: str = Field(..., min_length=32)
+    secret_encryption_key: str = Field(
+        default="", description="Fernet key for secrets at rest (default: derived from SECRET_KEY)"
+    )
 
     # Database
     database_url: PostgresDsn
@@ -39,12 +42,132 @@ class Settings(BaseSettings):
     fbr_sandbox_url: str = "https://gw.fbr.gov.pk/di_data/v1/di/postinvoicedata_sb"
     fbr_production_url: str = ""
     fbr_timeout_seconds: int = 30
+    fbr_connect_timeout_seconds: float = 5.0
+    fbr_pool_timeout_seconds: float = 5.0
     fbr_max_retries: int = 3
-    fbr_retry_delay_seconds: int = 2
+    fbr_retry_delay_seconds: int = 2  # Base delay for exponential backoff
+
+    # Retry policy
+    fbr_retry_statuses: list[int] = [429, 502, 503, 504]
+    fbr_retry_max_delay_seconds: float = Field(default=30.0, gt=0, description="Cap on a single backoff")
+    fbr_retry_max_elapsed_seconds: float = Field(default=60.0, gt=0, description="Give up once retrying would exceed this")
+    fbr_retry_budget_ratio: float = Field(default=0.2, ge=0, description="Retry tokens earned per first attempt, per tenant")
+    fbr_retry_budget_min_per_second: float = Field(default=0.5, ge=0, description="Steady retry allowance per tenant")
+    fbr_retry_budget_burst: int = Field(default=10, ge=1)
+
+    # Attempt ledger (submission_attempts writes)
+    attempt_ledger_flush_mode: Literal["immediate", "batched"] = Field(
+        default="immediate",
+        description="batched: write response summaries in periodic batches instead of with each outcome",
+    )
+    attempt_ledger_flush_interval_seconds: float = Field(default=1.0, gt=0)
+    attempt_ledger_flush_batch_size: int = Field(default=100, ge=1)
+
+    # Adaptive read timeout: p99 of recent latency x multiplier, capped by fbr_timeout_seconds
+    fbr_adaptive_timeout_enabled: bool = True
+    fbr_adaptive_timeout_multiplier: float = Field(default=3.0, ge=1.0)
+    fbr_adaptive_timeout_min_seconds: float = Field(default=2.0, gt=0)
+    fbr_latency_window_size: int = Field(default=500, ge=10, description="Recent latencies kept per endpoint")
+    fbr_latency_min_samples: int = Field(default=20, ge=1, description="Samples needed before adapting")
     fbr_auth_token: str = Field(default="", alias="FBR_SANDBOX_TOKEN", description="FBR Bearer Token")
     fbr_sandbox_invoice_detail_url: str = Field(default="", description="Validation Endpoint")
     fbr_sandbox_invoice_detail_token: str = Field(default="", description="Validation Token")
+
+    # Per-tenant FBR tokens (decrypted tokens are cached in memory)
+    fbr_token_cache_size: int = Field(default=1024, ge=1, description="Tenants whose decrypted token is kept")
+    fbr_token_cache_ttl_seconds: float = Field(default=300.0, gt=0)
+
+    # FBR HTTP connection pool (shared by all requests in the process)
+    fbr_max_connections: int = Field(default=100, ge=1)
+    fbr_max_keepalive_connections: int = Field(default=20, ge=0)
+    fbr_keepalive_expiry_seconds: float = 30.0
+    fbr_http2: bool = Field(default=False, description="Negotiate HTTP/2 with the FBR gateway")
+    fbr_warm_on_startup: bool = Field(default=True, description="Open a pooled connection at startup")
     
+    # Outbound rate limiting (token buckets)
+    fbr_rate_limit_enabled: bool = True
+    fbr_rate_limit_backend: Literal["memory", "postgres"] = Field(
+        default="memory",
+        description="memory: per process; postgres: shared by all workers and nodes",
+    )
+    fbr_global_rate_per_second: float = Field(default=20.0, gt=0)
+    fbr_global_burst: int = Field(default=40, ge=1)
+    fbr_tenant_rate_per_second: float = Field(default=5.0, gt=0)
+    fbr_tenant_burst: int = Field(default=10, ge=1)
+
+    # Circuit breaker around the FBR gateway
+    fbr_breaker_enabled: bool = True
+    fbr_breaker_window_seconds: float = Field(default=60.0, gt=0)
+    fbr_breaker_failure_rate: float = Field(default=0.5, gt=0, le=1)
+    fbr_breaker_min_calls: int = Field(default=10, ge=1, description="Calls in the window before the rate is judged")
+    fbr_breaker_open_seconds: float = Field(default=30.0, gt=0, description="Cool-down before a half-open probe")
+
+    # Record/replay cassettes for FBR traffic (off | record | replay)
+    fbr_cassette_mode: Literal["off", "record", "replay"] = "off"
+    fbr_cassette_path: str = Field(default="cassettes/fbr.jsonl", description="JSON Lines cassette file")
+    fbr_cassette_latency_scale: float = Field(
+        default=1.0, ge=0, description="Replay: recorded latency multiplier (0 = no delay)"
+    )
+    fbr_cassette_ignore_fields: list[str] = Field(
+        default=["invoiceDate"], description="Replay: top-level payload fields ignored when matching"
+    )
+
+    # Batch submission
+    submit_batch_max_invoices: int = Field(default=5000, ge=1)
+    submit_batch_concurrency: int = Field(default=10, ge=1, description="Concurrent FBR calls per batch")
+
+    # Batch pre-validation
+    validate_batch_concurrency: int = Field(default=20, ge=1, description="Concurrent FBR validation calls per batch")
+    fbr_validation_cache_size: int = Field(default=10000, ge=1, description="Validation results kept by payload hash")
+    fbr_validation_cache_ttl_seconds: float = Field(default=3600.0, gt=0)
+
+    # Idempotency-Key replay on create/submit
+    idempotency_key_ttl_hours: int = Field(default=24, ge=1, description="How long a stored response is replayed")
+    idempotency_in_progress_timeout_seconds: int = Field(
+        default=300, ge=1, description="Age after which an unfinished reservation may be taken over"
+    )
+
+    # Status event stream (SSE) and cross-process LISTEN/NOTIFY
+    status_stream_heartbeat_seconds: float = Field(default=15.0, gt=0, description="Keep-alive comment interval")
+    status_stream_queue_size: int = Field(
+        default=1000, ge=1, description="Undelivered events per subscriber before it is cut off"
+    )
+    status_listener_retry_seconds: float = Field(default=5.0, gt=0, description="Reconnect delay for LISTEN")
+
+    # Submission jobs (async mode)
+    submission_dispatch: Literal["in_process", "worker"] = Field(
+        default="in_process",
+        description="Run queued submissions as in-process background tasks or leave them to worker processes",
+    )
+    submission_worker_concurrency: int = Field(default=10, ge=1)
+    submission_worker_poll_seconds: float = 1.0
+    submission_lease_seconds: int = Field(default=120, ge=10)
+    submission_heartbeat_seconds: int = Field(default=30, ge=1)
+    submission_max_claims: int = Field(default=3, ge=1, description="Claims before a job is given up as UNKNOWN")
+
+    # Reconciliation of UNKNOWN invoices
+    reconciliation_dispatch: Literal["in_process", "worker", "off"] = Field(
+        default="in_process",
+        description="Sweep UNKNOWN invoices from the API process, from `python -m app.workers.reconciler`, or not at all",
+    )
+    reconciliation_interval_seconds: float = Field(default=60.0, gt=0)
+    reconciliation_chunk_size: int = Field(default=200, ge=1, description="UNKNOWN invoices claimed per transaction")
+    reconciliation_concurrency: int = Field(default=10, ge=1, description="Concurrent FBR lookups per chunk")
+    reconciliation_cooldown_seconds: int = Field(
+        default=300, ge=0, description="Skip invoices with any attempt more recent than this"
+    )
+    reconciliation_max_attempts: int = Field(
+        default=5, ge=1, description="Inconclusive probes before an UNKNOWN invoice is left to manual review"
+    )
+
+    # Crash recovery of submissions orphaned by a dead process
+    recovery_grace_seconds: int = Field(
+        default=900,
+        ge=0,
+        description="Idle time before an in-flight submission is considered orphaned (must exceed the longest batch)",
+    )
+    recovery_lookback_hours: int = Field(default=72, ge=1, description="How far back to look for orphaned attempts")
+
     # Mock Mode (for development without IP whitelisting)
     use_mock_fbr: bool = Field(default=False, description="Use mock FBR service instead of real API")
 
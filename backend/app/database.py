@@ -29,6 +29,17 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def pool_status() -> dict[str, int]:
+    """Connection pool usage of this process, for metrics and load tests."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
@@ -109,13 +109,6 @@ DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 
 # FBR Service dependency
-from app.services.fbr_service import FBRService
-
-
-def get_fbr_service() -> FBRService:
-    """Provide FBR service instance for dependency injection."""
-    return FBRService()
-
+from app.services.fbr_service import FBRService, get_fbr_service
 
 FBRServiceDep = Annotated[FBRService, Depends(get_fbr_service)]
-
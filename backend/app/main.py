@@ -4,6 +4,7 @@ IRIS Digital Invoicing Backend API.
 FastAPI application entry point with router registration and middleware configuration.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -11,7 +12,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routers import auth_router, health_router, invoices_router
+from app.routers import (
+    auth_router,
+    health_router,
+    invoices_router,
+    submissions_router,
+    tenants_router,
+)
+from app.services.fbr_client import fbr_clients
+from app.services.status_events import StatusEventListener
+from app.workers.reconciler import Reconciler, recover_orphans
+from app.workers.submitter import SubmissionWorker
 
 settings = get_settings()
 
@@ -22,12 +33,41 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Application lifespan handler.
     
     Runs startup and shutdown tasks.
+
+    With in-process dispatch an embedded submission worker drains jobs that
+    were deferred while the FBR circuit was open; with worker dispatch the
+    dedicated worker processes do that. Likewise an embedded reconciler
+    sweeps UNKNOWN invoices unless RECONCILIATION_DISPATCH says otherwise.
+    Submissions orphaned by a previous process are recovered at startup
+    either way (the embedded reconciler does this on its first sweep).
+    A status listener relays other processes' status transitions to this
+    process's event streams.
     """
     # Startup
-    # Future: Initialize database connection pool, background tasks, etc.
+    await fbr_clients.start()
+    listener = StatusEventListener()
+    listener_task = asyncio.create_task(listener.run())
+    drainer = None
+    if settings.submission_dispatch == "in_process":
+        drainer = SubmissionWorker()
+        drainer_task = asyncio.create_task(drainer.run())
+    reconciler = None
+    if settings.reconciliation_dispatch == "in_process":
+        reconciler = Reconciler()
+        reconciler_task = asyncio.create_task(reconciler.run())
+    else:
+        await recover_orphans()
     yield
     # Shutdown
-    # Future: Close connections, cleanup resources
+    if drainer is not None:
+        drainer.stop()
+        await drainer_task
+    if reconciler is not None:
+        reconciler.stop()
+        await reconciler_task
+    listener.stop()
+    await listener_task
+    await fbr_clients.aclose()
 
 
 app = FastAPI(
@@ -52,6 +92,8 @@ app.add_middleware(
 app.include_router(health_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(invoices_router, prefix="/api/v1")
+app.include_router(submissions_router, prefix="/api/v1")
+app.include_router(tenants_router, prefix="/api/v1")
 
 
 @app.get("/")
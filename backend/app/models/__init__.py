@@ -1,8 +1,12 @@
 """ORM models package."""
 
+from app.models.idempotency_key import IdempotencyKey
 from app.models.invoice import BuyerRegistrationType, Invoice, InvoiceStatus, InvoiceType
 from app.models.invoice_item import InvoiceItem
+from app.models.rate_limit_bucket import RateLimitBucket
 from app.models.submission_attempt import SubmissionAttempt, SubmissionOutcome
+from app.models.submission_job import SubmissionJob, SubmissionJobStatus
+from app.models.submission_payload import SubmissionPayload
 from app.models.tenant import Tenant
 from app.models.user import User
 
@@ -16,4 +20,9 @@ __all__ = [
     "InvoiceItem",
     "SubmissionAttempt",
     "SubmissionOutcome",
+    "SubmissionPayload",
+    "SubmissionJob",
+    "SubmissionJobStatus",
+    "RateLimitBucket",
+    "IdempotencyKey",
 ]
@@ -0,0 +1,66 @@
+"""
+IdempotencyKey model - stored responses for retried API requests.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response recorded under a client-supplied Idempotency-Key.
+
+    Keys are scoped per tenant (the primary key is (tenant_id, key)), so a
+    repeat request is answered with a single primary-key lookup. A row
+    without a response_status is a reservation held by a request that is
+    still running.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="Client-supplied Idempotency-Key header",
+    )
+    request_fingerprint: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="SHA-256 of method, path, query and body of the first request",
+    )
+    response_status: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="HTTP status of the stored response (null while in progress)",
+    )
+    response_body: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    response_headers: Mapped[dict | None] = mapped_column(
+        JSON,
+        nullable=True,
+        comment="Headers replayed with the response (e.g. Location)",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(tenant_id={self.tenant_id}, key={self.key}, status={self.response_status})>"
@@ -7,7 +7,7 @@ import uuid
 from datetime import date, datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -15,6 +15,7 @@ from app.database import Base
 if TYPE_CHECKING:
     from app.models.invoice_item import InvoiceItem
     from app.models.submission_attempt import SubmissionAttempt
+    from app.models.submission_job import SubmissionJob
     from app.models.tenant import Tenant
 
 
@@ -30,9 +31,11 @@ class InvoiceStatus(str, enum.Enum):
     """Status of the invoice submission."""
 
     DRAFT = "draft"
+    QUEUED = "queued"
     SUBMITTED = "submitted"
     FAILED = "failed"
     UNKNOWN = "unknown"
+    NEEDS_REVIEW = "needs_review"
 
 
 class BuyerRegistrationType(str, enum.Enum):
@@ -55,6 +58,10 @@ class Invoice(Base):
     # Unique constraint: invoiceRefNo must be unique per tenant
     __table_args__ = (
         UniqueConstraint("tenant_id", "invoice_ref_no", name="uq_tenant_invoice_ref"),
+        # Reconciliation and crash recovery scan QUEUED/UNKNOWN invoices by age
+        Index("ix_invoices_status_updated_at", "status", "updated_at"),
+        # Newest-first listing; keyset pages seek straight to their cursor
+        Index("ix_invoices_tenant_created_at_id", "tenant_id", text("created_at DESC"), text("id DESC")),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -158,6 +165,10 @@ class Invoice(Base):
         cascade="all, delete-orphan",
         order_by="SubmissionAttempt.attempt_number",
     )
+    jobs: Mapped[list["SubmissionJob"]] = relationship(
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+    )
     referenced_invoice: Mapped["Invoice | None"] = relationship(
         remote_side=[id],
         foreign_keys=[referenced_invoice_id],
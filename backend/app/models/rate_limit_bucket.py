@@ -0,0 +1,38 @@
+"""
+RateLimitBucket model - shared token-bucket state for outbound FBR calls.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket shared by all API and worker processes.
+
+    Only used when FBR_RATE_LIMIT_BACKEND=postgres. Rows are keyed by
+    bucket name ("global" or "tenant:<id>") and updated atomically.
+    """
+
+    __tablename__ = "fbr_rate_buckets"
+
+    key: Mapped[str] = mapped_column(
+        String(100),
+        primary_key=True,
+    )
+    tokens: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Token balance at updated_at (negative while callers are waiting)",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<RateLimitBucket(key={self.key}, tokens={self.tokens})>"
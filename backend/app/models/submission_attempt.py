@@ -4,9 +4,9 @@ SubmissionAttempt model - audit log for invoice submission attempts.
 
 import enum
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -33,6 +33,10 @@ class SubmissionAttempt(Base):
     """
 
     __tablename__ = "submission_attempts"
+    __table_args__ = (
+        # Crash recovery scans write-ahead attempts left UNKNOWN by outcome and age
+        Index("ix_submission_attempts_outcome_attempted_at", "outcome", "attempted_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -52,9 +56,10 @@ class SubmissionAttempt(Base):
         nullable=False,
         comment="Sequential attempt number for this invoice",
     )
+    # Database time, like the lease timestamps it is compared with
     attempted_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        default=func.now(),
         nullable=False,
     )
     
@@ -93,6 +98,12 @@ class SubmissionAttempt(Base):
         nullable=True,
         comment="Response time in milliseconds",
     )
+    payload_sha256: Mapped[str | None] = mapped_column(
+        String(64),
+        ForeignKey("submission_payloads.sha256"),
+        nullable=True,
+        comment="SHA-256 of the exact request body sent (see submission_payloads)",
+    )
 
     # Relationships
     invoice: Mapped["Invoice"] = relationship(back_populates="attempts")
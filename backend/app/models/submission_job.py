@@ -0,0 +1,116 @@
+"""
+SubmissionJob model - queued asynchronous submissions to FBR.
+"""
+
+import enum
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+from app.models.invoice import Invoice
+
+
+class SubmissionJobStatus(str, enum.Enum):
+    """Lifecycle of an asynchronous submission job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class SubmissionJob(Base):
+    """
+    Handle for an invoice submission that runs outside the HTTP request.
+
+    The job tracks the lifecycle of the background work; the individual
+    FBR calls it makes are recorded in the submission_attempts ledger.
+    """
+
+    __tablename__ = "submission_jobs"
+
+    # Workers claim the oldest queued (or lease-expired) jobs first.
+    # An invoice has at most one live job, so it is never sent twice.
+    __table_args__ = (
+        Index("ix_submission_jobs_status_created_at", "status", "created_at"),
+        Index(
+            "uq_submission_jobs_live_invoice",
+            "invoice_id",
+            unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # Ownership
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    invoice_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("invoices.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Lifecycle
+    status: Mapped[SubmissionJobStatus] = mapped_column(
+        Enum(SubmissionJobStatus),
+        nullable=False,
+        default=SubmissionJobStatus.QUEUED,
+    )
+    error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Failure detail when the job did not succeed",
+    )
+
+    # Worker lease (SELECT ... FOR UPDATE SKIP LOCKED claims)
+    lease_owner: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="Worker currently holding the job",
+    )
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Job may be reclaimed by another worker after this time",
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    claim_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of times a worker has claimed this job",
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    # Relationships
+    invoice: Mapped["Invoice"] = relationship(back_populates="jobs")
+
+    def __repr__(self) -> str:
+        return f"<SubmissionJob(invoice_id={self.invoice_id}, status={self.status.value})>"
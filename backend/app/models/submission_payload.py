@@ -0,0 +1,51 @@
+"""
+SubmissionPayload model - frozen request bodies sent to FBR.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SubmissionPayload(Base):
+    """
+    Canonical payload snapshot, content-addressed by SHA-256.
+
+    The exact bytes sent to FBR are stored zlib-compressed once per distinct
+    body; every attempt references the snapshot it sent via
+    SubmissionAttempt.payload_sha256. Retries, reconciliation and support
+    exports reuse these bytes instead of rebuilding them from the invoice.
+
+    Rows are immutable and owned by no invoice: identical bodies (e.g. two
+    invoices with a blank invoiceRefNo) share one row, so deleting an
+    invoice must never take the snapshot another invoice's attempts use.
+    """
+
+    __tablename__ = "submission_payloads"
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="Hex SHA-256 of the uncompressed request body",
+    )
+    body: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="zlib-compressed request body",
+    )
+    size_bytes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Uncompressed size",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<SubmissionPayload(sha256={self.sha256[:12]}, size_bytes={self.size_bytes})>"
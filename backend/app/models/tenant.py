@@ -54,7 +54,7 @@ class Tenant(Base):
         nullable=False,
     )
     
-    # FBR integration credentials (encrypted in production)
+    # FBR integration credentials (Fernet-encrypted, see app.utils.security)
     fbr_token: Mapped[str | None] = mapped_column(
         Text,
         nullable=True,
@@ -3,6 +3,8 @@
 from app.routers.auth import router as auth_router
 from app.routers.health import router as health_router
 from app.routers.invoices import router as invoices_router
+from app.routers.submissions import router as submissions_router
+from app.routers.tenants import router as tenants_router
 
-__all__ = ["auth_router", "health_router", "invoices_router"]
+__all__ = ["auth_router", "health_router", "invoices_router", "submissions_router", "tenants_router"]
 
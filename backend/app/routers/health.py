@@ -8,6 +8,14 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
+from app.database import pool_status
+from app.services import reconciliation_service
+from app.services.circuit_breaker import get_circuit_breaker
+from app.services.latency_tracker import get_latency_tracker
+from app.services.status_events import get_status_event_bus
+from app.services.tenant_credentials import get_tenant_token_cache
+from app.services.validation_cache import get_validation_cache
+
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
@@ -32,8 +40,35 @@ async def readiness_check() -> dict:
     
     Indicates whether the application is ready to serve traffic.
     In future, this can check database connectivity, etc.
+
+    An open FBR circuit does not make the API unready (submissions are
+    queued), but its state is reported for dashboards and alerting.
     """
     return {
         "ready": True,
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "fbr_circuit": get_circuit_breaker().snapshot(),
+    }
+
+
+@router.get("/metrics")
+async def metrics() -> dict:
+    """
+    FBR gateway metrics for this process.
+
+    Reports the rolling latency percentiles per FBR endpoint with the
+    adaptive read timeout currently derived from them, the circuit
+    breaker state, the tenant token and validation result caches, the
+    status event stream, reconciliation verdicts (including invoices
+    moved to NEEDS_REVIEW) and database connection pool usage.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "fbr_latency": get_latency_tracker().snapshot(),
+        "fbr_circuit": get_circuit_breaker().snapshot(),
+        "fbr_token_cache": get_tenant_token_cache().snapshot(),
+        "fbr_validation_cache": get_validation_cache().snapshot(),
+        "status_events": get_status_event_bus().snapshot(),
+        "reconciliation": reconciliation_service.snapshot(),
+        "db_pool": pool_status(),
     }
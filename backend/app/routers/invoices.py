@@ -4,33 +4,57 @@ Invoice router - CRUD endpoints for invoices.
 All endpoints require authentication and are tenant-scoped.
 """
 
-from uuid import UUID
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Literal
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
+from app.config import get_settings
 from app.dependencies import CurrentUserDep, DbSession, FBRServiceDep
-from app.models import InvoiceStatus, InvoiceType
+from app.models import InvoiceStatus, InvoiceType, SubmissionJob
 from app.schemas.common import PaginationParams
 from app.schemas.invoice import (
     InvoiceCreate,
+    InvoiceCursorListResponse,
     InvoiceListResponse,
     InvoiceResponse,
     InvoiceStatusEnum,
+    InvoiceStatusResponse,
     InvoiceSummaryResponse,
     InvoiceTypeEnum,
     InvoiceUpdate,
+    SubmitBatchItemResult,
+    SubmitBatchRequest,
+    SubmitBatchResponse,
     SuggestRefNoResponse,
+    ValidateBatchItemResult,
+    ValidateBatchRequest,
+    ValidateBatchResponse,
+)
+from app.schemas.submission import SubmissionJobResponse
+from app.services import idempotency_service, invoice_service, submission_service
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyMismatchError,
 )
-from app.services import invoice_service
 from app.services.invoice_service import (
+    InvalidCursorError,
     InvoiceNotDraftError,
     InvoiceNotFoundError,
     InvoiceRefNoBlockedError,
     InvoiceRefNoExistsError,
     ReferencedInvoiceNotFoundError,
+    SubmissionDeferredError,
 )
+from app.services.status_events import Subscription, get_status_event_bus
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
+settings = get_settings()
 
 
 # =============================================================================
@@ -104,6 +128,109 @@ def _invoice_to_summary(invoice) -> InvoiceSummaryResponse:
     )
 
 
+def _job_accepted_response(job: SubmissionJob) -> JSONResponse:
+    """202 Accepted with the submission job handle and its Location."""
+    job_response = submission_service.build_job_response(job, InvoiceStatus.QUEUED)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job_response.model_dump(mode="json"),
+        headers={"Location": f"/api/v1/submissions/{job.id}"},
+    )
+
+
+async def _idempotent(
+    request: Request,
+    db: DbSession,
+    tenant_id: UUID,
+    key: str | None,
+    status_code: int,
+    handler: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run a handler at most once per Idempotency-Key.
+
+    A repeat of a completed request replays the stored status, body and
+    Location header (marked with Idempotent-Replayed). Client errors are
+    stored and replayed too; unexpected errors release the key so the
+    request can be retried.
+    """
+    if key is None:
+        return await handler()
+
+    fingerprint = idempotency_service.request_fingerprint(
+        request.method,
+        request.url.path,
+        request.url.query,
+        await request.body(),
+    )
+    try:
+        record = await idempotency_service.begin(db, tenant_id, key, fingerprint)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        ) from e
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+    if record is not None:
+        return Response(
+            content=record.response_body,
+            status_code=record.response_status,
+            media_type="application/json",
+            headers={**(record.response_headers or {}), "Idempotent-Replayed": "true"},
+        )
+
+    try:
+        result = await handler()
+    except HTTPException as e:
+        await db.rollback()
+        if e.status_code >= 500:
+            await idempotency_service.release(db, tenant_id, key)
+        else:
+            await idempotency_service.complete(
+                db,
+                tenant_id,
+                key,
+                e.status_code,
+                json.dumps({"detail": e.detail}).encode(),
+                e.headers,
+            )
+        raise
+    except Exception:
+        await db.rollback()
+        await idempotency_service.release(db, tenant_id, key)
+        raise
+
+    if not isinstance(result, Response):
+        result = JSONResponse(status_code=status_code, content=jsonable_encoder(result))
+    replay_headers = {"Location": result.headers["location"]} if "location" in result.headers else None
+    await idempotency_service.complete(db, tenant_id, key, result.status_code, result.body, replay_headers)
+    return result
+
+
+async def _sse_events(subscription: Subscription) -> AsyncIterator[str]:
+    """Render a subscription as Server-Sent Events with keep-alive comments."""
+    yield "retry: 3000\n\n"
+    while True:
+        try:
+            event = await asyncio.wait_for(
+                subscription.queue.get(),
+                timeout=settings.status_stream_heartbeat_seconds,
+            )
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+            continue
+        if event is None:
+            # Fell behind; the client reconnects and re-reads current statuses
+            yield "event: overflow\ndata: {}\n\n"
+            return
+        yield f"event: status\ndata: {json.dumps(event.to_dict())}\n\n"
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
@@ -111,29 +238,59 @@ def _invoice_to_summary(invoice) -> InvoiceSummaryResponse:
 
 @router.get(
     "",
-    response_model=InvoiceListResponse,
+    response_model=InvoiceListResponse | InvoiceCursorListResponse,
     summary="List invoices",
-    description="Get paginated list of invoices for the current tenant.",
+    description=(
+        "Get paginated list of invoices for the current tenant, newest first. "
+        "Pass `cursor` (a previous page's `next_cursor`) for keyset pagination, "
+        "which costs the same at any depth but returns no total."
+    ),
 )
 async def list_invoices(
     current_user: CurrentUserDep,
     db: DbSession,
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
-    status: InvoiceStatusEnum | None = Query(default=None, description="Filter by status"),
+    cursor: str | None = Query(
+        default=None, description='next_cursor of the previous page ("" for the first keyset page)'
+    ),
+    status_: InvoiceStatusEnum | None = Query(default=None, alias="status", description="Filter by status"),
     type: InvoiceTypeEnum | None = Query(default=None, description="Filter by type"),
-) -> InvoiceListResponse:
+) -> InvoiceListResponse | InvoiceCursorListResponse:
     """
     List all invoices for the authenticated user's tenant.
 
-    Supports filtering by status and type, with pagination.
+    Supports filtering by status and type, with page-number or cursor
+    pagination. Page-number responses carry a next_cursor too, so a client
+    can switch to cursors after the first page.
     """
-    pagination = PaginationParams(page=page, page_size=page_size)
-
     # Convert enum to model enum if provided
-    status_filter = InvoiceStatus(status.value) if status else None
+    status_filter = InvoiceStatus(status_.value) if status_ else None
     type_filter = InvoiceType(type.value) if type else None
 
+    if cursor is not None:
+        try:
+            invoices, next_cursor = await invoice_service.list_invoices_after(
+                db,
+                current_user.tenant.id,
+                page_size,
+                cursor,
+                status_filter=status_filter,
+                type_filter=type_filter,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            ) from e
+        return InvoiceCursorListResponse(
+            items=[_invoice_to_summary(inv) for inv in invoices],
+            page_size=page_size,
+            next_cursor=next_cursor,
+        )
+
+    pagination = PaginationParams(page=page, page_size=page_size)
+
     invoices, total = await invoice_service.list_invoices(
         db,
         current_user.tenant.id,
@@ -143,6 +300,7 @@ async def list_invoices(
     )
 
     total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    has_more = pagination.offset + len(invoices) < total
 
     return InvoiceListResponse(
         items=[_invoice_to_summary(inv) for inv in invoices],
@@ -150,6 +308,7 @@ async def list_invoices(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=invoice_service.encode_cursor(invoices[-1]) if invoices and has_more else None,
     )
 
 
@@ -161,9 +320,16 @@ async def list_invoices(
     description="Create a new draft invoice with line items.",
 )
 async def create_invoice(
+    request: Request,
     current_user: CurrentUserDep,
     db: DbSession,
     data: InvoiceCreate,
+    idempotency_key: str | None = Header(
+        default=None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Replay the stored response if this key was already used",
+    ),
 ) -> InvoiceResponse:
     """
     Create a new draft invoice.
@@ -171,7 +337,24 @@ async def create_invoice(
     - Invoice reference number must be unique per tenant
     - At least 1 line item is required
     - Debit/Credit notes must reference an existing submitted Sales Invoice
+    - A retry with the same Idempotency-Key returns the first response
     """
+    return await _idempotent(
+        request,
+        db,
+        current_user.tenant.id,
+        idempotency_key,
+        status.HTTP_201_CREATED,
+        lambda: _create_invoice(current_user, db, data),
+    )
+
+
+async def _create_invoice(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    data: InvoiceCreate,
+) -> InvoiceResponse:
+    """Create the draft and map service errors to HTTP errors."""
     try:
         invoice = await invoice_service.create_invoice(
             db,
@@ -196,6 +379,43 @@ async def create_invoice(
         )
 
 
+@router.get(
+    "/events",
+    summary="Stream invoice status changes",
+    description=(
+        "Server-Sent Events stream of status transitions for the current tenant, "
+        "or for one batch submission with `batch_id`."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_status_events(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    batch_id: UUID | None = Query(default=None, description="Only this batch's invoices"),
+) -> StreamingResponse:
+    """
+    Stream status transitions as they are committed.
+
+    - Each `status` event carries `invoice_id`, `status` and `batch_id`
+    - Transitions made by workers and other API nodes are included
+    - An `overflow` event ends the stream if the client falls behind
+    """
+    tenant_id = current_user.tenant.id
+    # Authenticated once; the stream must not pin a pooled connection
+    await db.close()
+
+    async def _stream() -> AsyncIterator[str]:
+        with get_status_event_bus().subscribe(tenant_id, batch_id) as subscription:
+            async for chunk in _sse_events(subscription):
+                yield chunk
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/suggest-ref",
     response_model=SuggestRefNoResponse,
@@ -223,6 +443,113 @@ async def suggest_ref_no(
     )
 
 
+@router.post(
+    "/submit-batch",
+    response_model=SubmitBatchResponse,
+    summary="Submit invoices to FBR in bulk",
+    description="Submit many draft invoices concurrently and return per-invoice outcomes.",
+)
+async def submit_invoices_batch(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    fbr_service: FBRServiceDep,
+    data: SubmitBatchRequest,
+) -> SubmitBatchResponse:
+    """
+    Submit a batch of draft invoices to FBR.
+
+    - Invoices are sent concurrently (bounded by `SUBMIT_BATCH_CONCURRENCY`)
+    - Invoices that are not found or not drafts are reported, not submitted
+    - If the FBR circuit opens, the remaining invoices are queued as jobs
+    """
+    if len(data.invoice_ids) > settings.submit_batch_max_invoices:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.submit_batch_max_invoices} invoices",
+        )
+
+    batch_id = data.batch_id or uuid4()
+    outcomes = await invoice_service.submit_invoices_batch(
+        db,
+        current_user.tenant.id,
+        data.invoice_ids,
+        fbr_service,
+        batch_id=batch_id,
+    )
+
+    results = [
+        SubmitBatchItemResult(
+            invoice_id=invoice_id,
+            status=InvoiceStatusEnum(invoice_status.value) if invoice_status else None,
+            error=error,
+        )
+        for invoice_id, invoice_status, error in outcomes
+    ]
+    submitted = sum(1 for r in results if r.status == InvoiceStatusEnum.SUBMITTED and r.error is None)
+    queued = sum(1 for r in results if r.status == InvoiceStatusEnum.QUEUED and r.error is None)
+
+    return SubmitBatchResponse(
+        batch_id=batch_id,
+        submitted=submitted,
+        failed=len(results) - submitted - queued,
+        queued=queued,
+        results=results,
+    )
+
+
+@router.post(
+    "/validate-batch",
+    response_model=ValidateBatchResponse,
+    summary="Validate invoices with FBR in bulk",
+    description="Validate many draft invoices against FBR concurrently, without submitting them.",
+)
+async def validate_invoices_batch(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    fbr_service: FBRServiceDep,
+    data: ValidateBatchRequest,
+) -> ValidateBatchResponse:
+    """
+    Pre-validate a batch of draft invoices with FBR.
+
+    - Invoices are validated concurrently (bounded by `VALIDATE_BATCH_CONCURRENCY`)
+    - Results are cached by payload hash; re-validating an unchanged draft does not call FBR
+    - Invoices that are not found or not drafts are reported, not validated
+    """
+    if len(data.invoice_ids) > settings.submit_batch_max_invoices:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.submit_batch_max_invoices} invoices",
+        )
+
+    outcomes = await invoice_service.validate_invoices_batch(
+        db,
+        current_user.tenant.id,
+        data.invoice_ids,
+        fbr_service,
+    )
+
+    results = [
+        ValidateBatchItemResult(
+            invoice_id=invoice_id,
+            valid=invoice_service.validation_verdict(response) if response else None,
+            cached=cached,
+            error=error,
+            fbr_response=response,
+        )
+        for invoice_id, response, error, cached in outcomes
+    ]
+    valid = sum(1 for r in results if r.valid is True)
+    invalid = sum(1 for r in results if r.valid is False)
+
+    return ValidateBatchResponse(
+        valid=valid,
+        invalid=invalid,
+        errors=len(results) - valid - invalid,
+        results=results,
+    )
+
+
 @router.get(
     "/{invoice_id}",
     response_model=InvoiceResponse,
@@ -254,6 +581,67 @@ async def get_invoice(
     return _invoice_to_response(invoice)
 
 
+@router.get(
+    "/{invoice_id}/status",
+    response_model=InvoiceStatusResponse,
+    summary="Get invoice status (long-poll)",
+    description=(
+        "Return the invoice status. With `wait`, block until it differs from `known` "
+        "or the wait expires."
+    ),
+)
+async def get_invoice_status(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    invoice_id: UUID,
+    known: InvoiceStatusEnum | None = Query(
+        default=None,
+        description="Status the client already has",
+    ),
+    wait: int = Query(default=0, ge=0, le=60, description="Seconds to wait for a change"),
+) -> InvoiceStatusResponse:
+    """
+    Long-poll an invoice's status.
+
+    - Returns at once if the status differs from `known` (or `known` is omitted)
+    - Otherwise waits up to `wait` seconds for a committed transition, from this
+      process or from any worker via LISTEN/NOTIFY
+    - Only the status column is read; items are never loaded
+    """
+    tenant_id = current_user.tenant.id
+    known_status = InvoiceStatus(known.value) if known else None
+
+    # Subscribe before reading so a transition committed in between is not missed
+    with get_status_event_bus().subscribe(tenant_id, invoice_id=invoice_id) as subscription:
+        current = await invoice_service.get_invoice_status(db, tenant_id, invoice_id)
+        if current is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Invoice not found: {invoice_id}",
+            )
+        if current == known_status and wait:
+            # Do not hold a pooled connection while parked
+            await db.close()
+            deadline = asyncio.get_running_loop().time() + wait
+            while current == known_status:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    break
+                current = event.status
+
+    return InvoiceStatusResponse(
+        invoice_id=invoice_id,
+        status=InvoiceStatusEnum(current.value),
+        changed=current != known_status,
+    )
+
+
 @router.put(
     "/{invoice_id}",
     response_model=InvoiceResponse,
@@ -331,27 +719,90 @@ async def delete_invoice(
     "/{invoice_id}/submit",
     response_model=InvoiceResponse,
     summary="Submit invoice to FBR",
-    description="Submit a draft invoice to FBR IRIS system.",
+    description=(
+        "Submit a draft invoice to FBR IRIS system. With `mode=async` the invoice "
+        "is queued and 202 Accepted is returned with a submission job handle."
+    ),
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": SubmissionJobResponse,
+            "description": "Submission queued (mode=async, or FBR circuit open)",
+        },
+    },
 )
 async def submit_invoice(
+    request: Request,
     current_user: CurrentUserDep,
     db: DbSession,
     fbr_service: FBRServiceDep,
+    background_tasks: BackgroundTasks,
     invoice_id: UUID,
-) -> InvoiceResponse:
+    mode: Literal["sync", "async"] = Query(
+        default="sync",
+        description="`sync` waits for FBR; `async` queues the submission and returns a job",
+    ),
+    idempotency_key: str | None = Header(
+        default=None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Replay the stored response if this key was already used",
+    ),
+) -> InvoiceResponse | JSONResponse:
     """
     Submit invoice to FBR.
     
     - Transition status from DRAFT -> SUBMITTED (or FAILED)
     - Logs submission attempt
+    - In async mode: DRAFT -> QUEUED, poll `GET /submissions/{job_id}`
+    - If the FBR circuit is open, sync submissions are queued the same way
+    - A retry with the same Idempotency-Key returns the first response
+      without calling FBR again
     """
+    return await _idempotent(
+        request,
+        db,
+        current_user.tenant.id,
+        idempotency_key,
+        status.HTTP_200_OK,
+        lambda: _submit_invoice(current_user, db, fbr_service, background_tasks, invoice_id, mode),
+    )
+
+
+async def _submit_invoice(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    fbr_service: FBRServiceDep,
+    background_tasks: BackgroundTasks,
+    invoice_id: UUID,
+    mode: Literal["sync", "async"],
+) -> InvoiceResponse | JSONResponse:
+    """Submit (or queue) the invoice and map service errors to HTTP errors."""
     try:
-        invoice = await invoice_service.submit_invoice(
-            db,
-            current_user.tenant.id,
-            invoice_id,
-            fbr_service,
-        )
+        if mode == "async":
+            job = await submission_service.enqueue_submission(
+                db,
+                current_user.tenant.id,
+                invoice_id,
+            )
+            if settings.submission_dispatch == "in_process":
+                background_tasks.add_task(
+                    submission_service.process_submission_job,
+                    job.id,
+                    fbr_service,
+                )
+            return _job_accepted_response(job)
+
+        try:
+            invoice = await invoice_service.submit_invoice(
+                db,
+                current_user.tenant.id,
+                invoice_id,
+                fbr_service,
+            )
+        except SubmissionDeferredError as e:
+            # FBR is down: the submission was queued instead of failing the
+            # request. The job is drained once the circuit closes.
+            return _job_accepted_response(e.job)
         return _invoice_to_response(invoice)
     except InvoiceNotFoundError:
         raise HTTPException(
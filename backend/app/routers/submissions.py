@@ -0,0 +1,89 @@
+"""
+Submissions router - status of asynchronous submission jobs and the
+payloads sent by individual attempts.
+
+All endpoints require authentication and are tenant-scoped.
+"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Response, status
+
+from app.dependencies import CurrentUserDep, DbSession
+from app.schemas.submission import SubmissionJobResponse
+from app.services import submission_service
+from app.services.submission_service import (
+    SubmissionAttemptNotFoundError,
+    SubmissionJobNotFoundError,
+)
+
+router = APIRouter(prefix="/submissions", tags=["Submissions"])
+
+
+@router.get(
+    "/{job_id}",
+    response_model=SubmissionJobResponse,
+    summary="Get submission job",
+    description="Get the status of an asynchronous submission and its FBR attempts.",
+)
+async def get_submission(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    job_id: UUID,
+) -> SubmissionJobResponse:
+    """
+    Get submission job status.
+
+    Poll this endpoint after submitting with `mode=async` until the job
+    status is `succeeded` or `failed`.
+    """
+    try:
+        job, invoice_status, attempts = await submission_service.get_submission_job(
+            db,
+            current_user.tenant.id,
+            job_id,
+        )
+    except SubmissionJobNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Submission job not found: {job_id}",
+        ) from e
+
+    return submission_service.build_job_response(job, invoice_status, attempts)
+
+
+@router.get(
+    "/attempts/{attempt_id}/payload",
+    summary="Export attempt payload",
+    description="Download the exact request body an attempt sent to FBR.",
+    response_class=Response,
+    responses={200: {"content": {"application/json": {}}}},
+)
+async def get_attempt_payload(
+    current_user: CurrentUserDep,
+    db: DbSession,
+    attempt_id: UUID,
+) -> Response:
+    """
+    Export the frozen payload of a submission attempt.
+
+    The body is returned byte-for-byte as sent, with its SHA-256 in the
+    `X-Payload-SHA256` header, for support cases with FBR.
+    """
+    try:
+        sha256, body = await submission_service.get_attempt_payload(
+            db,
+            current_user.tenant.id,
+            attempt_id,
+        )
+    except SubmissionAttemptNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Payload not found for attempt: {attempt_id}",
+        ) from e
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Payload-SHA256": sha256},
+    )
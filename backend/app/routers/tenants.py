@@ -0,0 +1,35 @@
+"""
+Tenant router - the current tenant's FBR integration settings.
+
+All endpoints require authentication and act on the caller's tenant.
+"""
+
+from fastapi import APIRouter, Response, status
+
+from app.dependencies import CurrentUserDep, DbSession
+from app.schemas.tenant import FBRTokenUpdate
+from app.services.tenant_credentials import rotate_fbr_token
+
+router = APIRouter(prefix="/tenant", tags=["Tenant"])
+
+
+@router.put(
+    "/fbr-token",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    summary="Rotate FBR token",
+    description="Replace the tenant's FBR bearer token. Takes effect immediately, without a restart.",
+)
+async def update_fbr_token(
+    request: FBRTokenUpdate,
+    current_user: CurrentUserDep,
+    db: DbSession,
+) -> Response:
+    """
+    Rotate the tenant's FBR token.
+
+    The token is stored encrypted and never returned by the API. Sending
+    null removes it, so submissions use the platform token again.
+    """
+    await rotate_fbr_token(db, current_user.tenant.id, request.fbr_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
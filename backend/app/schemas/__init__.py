@@ -5,17 +5,31 @@ from app.schemas.common import DecimalField, PaginatedResponse, PaginationParams
 from app.schemas.invoice import (
     BuyerRegistrationTypeEnum,
     InvoiceCreate,
+    InvoiceCursorListResponse,
     InvoiceItemCreate,
     InvoiceItemResponse,
     InvoiceItemUpdate,
     InvoiceListResponse,
     InvoiceResponse,
     InvoiceStatusEnum,
+    InvoiceStatusResponse,
     InvoiceSummaryResponse,
     InvoiceTypeEnum,
     InvoiceUpdate,
+    SubmitBatchItemResult,
+    SubmitBatchRequest,
+    SubmitBatchResponse,
     SuggestRefNoResponse,
+    ValidateBatchItemResult,
+    ValidateBatchRequest,
+    ValidateBatchResponse,
 )
+from app.schemas.submission import (
+    SubmissionAttemptResponse,
+    SubmissionJobResponse,
+    SubmissionJobStatusEnum,
+)
+from app.schemas.tenant import FBRTokenUpdate
 
 __all__ = [
     # Auth
@@ -40,5 +54,19 @@ __all__ = [
     "InvoiceResponse",
     "InvoiceSummaryResponse",
     "InvoiceListResponse",
+    "InvoiceCursorListResponse",
+    "InvoiceStatusResponse",
+    "SubmitBatchRequest",
+    "SubmitBatchItemResult",
+    "SubmitBatchResponse",
     "SuggestRefNoResponse",
+    "ValidateBatchRequest",
+    "ValidateBatchItemResult",
+    "ValidateBatchResponse",
+    # Submission
+    "SubmissionJobStatusEnum",
+    "SubmissionAttemptResponse",
+    "SubmissionJobResponse",
+    # Tenant
+    "FBRTokenUpdate",
 ]
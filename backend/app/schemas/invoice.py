@@ -11,7 +11,7 @@ These schemas enforce PRD requirements:
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -36,9 +36,11 @@ class InvoiceStatusEnum(str, Enum):
     """Invoice status for API."""
 
     DRAFT = "draft"
+    QUEUED = "queued"
     SUBMITTED = "submitted"
     FAILED = "failed"
     UNKNOWN = "unknown"
+    NEEDS_REVIEW = "needs_review"
 
 
 class BuyerRegistrationTypeEnum(str, Enum):
@@ -352,6 +354,93 @@ class InvoiceListResponse(PaginatedResponse):
     """Paginated list of invoice summaries."""
 
     items: list[InvoiceSummaryResponse]
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the following page (switches to keyset pagination)"
+    )
+
+
+class InvoiceCursorListResponse(BaseModel):
+    """Keyset-paginated list of invoice summaries (no total count)."""
+
+    items: list[InvoiceSummaryResponse]
+    page_size: int = Field(..., ge=1, le=100, description="Items per page")
+    next_cursor: str | None = Field(default=None, description="Cursor for the following page; null on the last")
+
+
+class SubmitBatchRequest(BaseModel):
+    """Request to submit many draft invoices in one call."""
+
+    invoice_ids: list[UUID] = Field(
+        ...,
+        min_length=1,
+        description="Draft invoice IDs to submit",
+    )
+    batch_id: UUID | None = Field(
+        default=None,
+        description=(
+            "Client-chosen batch ID, so `GET /invoices/events?batch_id=` can be opened "
+            "before submitting (generated if omitted)"
+        ),
+    )
+
+
+class SubmitBatchItemResult(BaseModel):
+    """Outcome for a single invoice in a batch submission."""
+
+    invoice_id: UUID
+    status: InvoiceStatusEnum | None = Field(
+        default=None,
+        description="Invoice status after the batch (null if not found)",
+    )
+    error: str | None = None
+
+
+class SubmitBatchResponse(BaseModel):
+    """Per-invoice outcomes of a batch submission."""
+
+    batch_id: UUID = Field(..., description="Tags this batch's status events")
+    submitted: int = Field(..., description="Invoices accepted by FBR")
+    failed: int = Field(..., description="Invoices rejected by FBR or not submittable")
+    queued: int = Field(default=0, description="Invoices deferred to the submission queue (FBR circuit open)")
+    results: list[SubmitBatchItemResult]
+
+
+class ValidateBatchRequest(BaseModel):
+    """Request to validate many draft invoices against FBR in one call."""
+
+    invoice_ids: list[UUID] = Field(
+        ...,
+        min_length=1,
+        description="Draft invoice IDs to validate",
+    )
+
+
+class ValidateBatchItemResult(BaseModel):
+    """Validation outcome for a single invoice in a batch."""
+
+    invoice_id: UUID
+    valid: bool | None = Field(
+        default=None,
+        description="Whether FBR accepts the invoice (null if it could not be validated)",
+    )
+    cached: bool = Field(
+        default=False,
+        description="Result reused from an earlier validation of the same payload",
+    )
+    error: str | None = None
+    fbr_response: dict[str, Any] | None = Field(
+        default=None,
+        description="FBR validation response, with per-item status and error codes",
+    )
+
+
+class ValidateBatchResponse(BaseModel):
+    """Per-invoice outcomes of a batch validation."""
+
+    valid: int = Field(..., description="Invoices FBR accepts")
+    invalid: int = Field(..., description="Invoices FBR rejects")
+    errors: int = Field(..., description="Invoices that could not be validated")
+    results: list[ValidateBatchItemResult]
 
 
 class SuggestRefNoResponse(BaseModel):
@@ -363,3 +452,14 @@ class SuggestRefNoResponse(BaseModel):
     last_ref_no: str | None = Field(
         description="The last successfully submitted invoiceRefNo"
     )
+
+
+class InvoiceStatusResponse(BaseModel):
+    """Current status of one invoice (long-poll endpoint)."""
+
+    invoice_id: UUID
+    status: InvoiceStatusEnum
+    changed: bool = Field(
+        ...,
+        description="Whether the status differs from the client's known status",
+    )
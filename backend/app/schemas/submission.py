@@ -0,0 +1,54 @@
+"""
+Submission job and attempt schemas for API responses.
+"""
+
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.invoice import InvoiceStatusEnum
+
+
+class SubmissionJobStatusEnum(str, Enum):
+    """Submission job status for API."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class SubmissionAttemptResponse(BaseModel):
+    """A single FBR call recorded in the submission_attempts ledger."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    attempt_number: int
+    attempted_at: datetime
+    http_status: int | None = None
+    outcome: str
+    diagnostic_id: str
+    response_time_ms: int | None = None
+    payload_sha256: str | None = Field(
+        default=None,
+        description="SHA-256 of the exact request body sent",
+    )
+
+
+class SubmissionJobResponse(BaseModel):
+    """Status of an asynchronous submission job."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: UUID = Field(..., description="Handle for polling the submission")
+    invoice_id: UUID
+    status: SubmissionJobStatusEnum
+    invoice_status: InvoiceStatusEnum
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    attempts: list[SubmissionAttemptResponse] = []
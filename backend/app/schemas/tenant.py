@@ -0,0 +1,16 @@
+"""
+Tenant schemas for managing a tenant's FBR integration settings.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class FBRTokenUpdate(BaseModel):
+    """Request schema for rotating the tenant's FBR bearer token."""
+
+    fbr_token: str | None = Field(
+        ...,
+        min_length=1,
+        max_length=4096,
+        description="New FBR bearer token, or null to fall back to the platform token",
+    )
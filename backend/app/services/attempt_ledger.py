@@ -0,0 +1,302 @@
+"""
+Attempt ledger writer.
+
+Writes submission_attempts rows on the submission hot path with the fewest
+round trips: the write-ahead row is one INSERT ... RETURNING committed before
+the FBR call, and the outcome is one UPDATE by primary key.
+
+In "batched" flush mode the outcome UPDATE carries only the fields that
+reconciliation and the job API depend on (outcome, status code, timing);
+the bulky response_summary is buffered and written in periodic executemany
+batches. The write-ahead UNKNOWN row is always durable before the network
+call, whatever the mode.
+
+The request body itself is frozen once per submission: stored zlib-compressed
+in submission_payloads under its SHA-256, which each attempt references.
+Snapshots are shared by identical bodies and never updated or deleted.
+"""
+
+import asyncio
+import hashlib
+import uuid
+import zlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import and_, bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings, get_settings
+from app.database import async_session_maker
+from app.models.submission_attempt import SubmissionAttempt, SubmissionOutcome
+from app.models.submission_payload import SubmissionPayload
+
+logger = structlog.get_logger()
+
+_attempts = SubmissionAttempt.__table__
+
+
+class AttemptLedger:
+    """Writes write-ahead attempt rows and their outcomes."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        settings: Settings | None = None,
+    ):
+        self.session_factory = session_factory or async_session_maker
+        self.settings = settings or get_settings()
+        self._pending: list[dict[str, Any]] = []
+        self._scheduled: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    @property
+    def batched(self) -> bool:
+        """Whether response summaries are buffered and flushed in batches."""
+        return self.settings.attempt_ledger_flush_mode == "batched"
+
+    async def store_payload(self, body: bytes) -> str:
+        """
+        Freeze a request body and return its SHA-256.
+
+        Identical bodies are stored once (INSERT ... ON CONFLICT DO NOTHING),
+        whichever invoices send them; an existing row is never rewritten.
+        """
+        sha256 = hashlib.sha256(body).hexdigest()
+        async with self.session_factory() as db:
+            await db.execute(
+                pg_insert(SubmissionPayload)
+                .values(
+                    sha256=sha256,
+                    body=zlib.compress(body),
+                    size_bytes=len(body),
+                )
+                .on_conflict_do_nothing(index_elements=[SubmissionPayload.sha256])
+            )
+            await db.commit()
+        return sha256
+
+    async def open(
+        self,
+        invoice_id: uuid.UUID,
+        attempt_number: int,
+        endpoint: str,
+        payload_sha256: str | None = None,
+    ) -> tuple[uuid.UUID, datetime]:
+        """
+        Durably record an attempt as UNKNOWN before it is sent.
+
+        Args:
+            invoice_id: Invoice being submitted
+            attempt_number: 1-based attempt number within the submission
+            endpoint: FBR URL the attempt is sent to
+            payload_sha256: Frozen body the attempt sends (from store_payload)
+
+        Returns:
+            Tuple of (attempt id, attempted_at)
+        """
+        attempt_id = uuid.uuid4()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                insert(SubmissionAttempt)
+                .values(
+                    id=attempt_id,
+                    invoice_id=invoice_id,
+                    attempt_number=attempt_number,
+                    endpoint=endpoint,
+                    outcome=SubmissionOutcome.UNKNOWN,
+                    diagnostic_id=attempt_id.hex[:8],  # Use prefix of ID as diagnostic ref
+                    response_summary="",
+                    payload_sha256=payload_sha256,
+                )
+                .returning(SubmissionAttempt.id, SubmissionAttempt.attempted_at)
+            )
+            row = result.one()
+            await db.commit()
+        return row.id, row.attempted_at
+
+    async def close(
+        self,
+        attempt_id: uuid.UUID,
+        outcome: SubmissionOutcome,
+        *,
+        http_status: int | None = None,
+        response_time_ms: int | None = None,
+        response_summary: str = "",
+    ) -> None:
+        """Record the outcome of an attempt with a single UPDATE."""
+        values: dict[str, Any] = {
+            "outcome": outcome,
+            "http_status": http_status,
+            "response_time_ms": response_time_ms,
+        }
+        if self.batched:
+            self._defer_summary(attempt_id, response_summary)
+        else:
+            values["response_summary"] = response_summary
+
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SubmissionAttempt)
+                .where(SubmissionAttempt.id == attempt_id)
+                .values(**values)
+            )
+            await db.commit()
+
+    def _defer_summary(self, attempt_id: uuid.UUID, response_summary: str) -> None:
+        if not response_summary:
+            return
+        self._pending.append({"attempt_id": attempt_id, "summary": response_summary})
+
+        if len(self._pending) >= self.settings.attempt_ledger_flush_batch_size:
+            self._start_flush()
+        elif self._scheduled is None or self._scheduled.done():
+            self._scheduled = asyncio.create_task(self._flush_later())
+
+    def _start_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.settings.attempt_ledger_flush_interval_seconds)
+        # Run the write as its own task so cancelling the timer never interrupts it
+        self._start_flush()
+
+    async def flush(self) -> int:
+        """
+        Write buffered response summaries in one executemany UPDATE.
+
+        Returns:
+            Number of attempts updated
+        """
+        batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(_attempts)
+                    .where(_attempts.c.id == bindparam("attempt_id"))
+                    .values(response_summary=bindparam("summary")),
+                    batch,
+                )
+                await db.commit()
+        except Exception:
+            # Summaries are diagnostic only; the outcome is already recorded.
+            logger.exception("attempt_ledger_flush_failed", dropped=len(batch))
+            return 0
+
+        return len(batch)
+
+    async def aclose(self) -> None:
+        """Flush anything still buffered and wait for running flushes (shutdown)."""
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+        await self.flush()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+def _decode_payload(sha256: str, compressed: bytes) -> bytes:
+    body = zlib.decompress(compressed)
+    if hashlib.sha256(body).hexdigest() != sha256:
+        raise ValueError(f"Stored payload does not match its hash: {sha256}")
+    return body
+
+
+async def load_payload(db: AsyncSession, sha256: str) -> bytes | None:
+    """
+    Load a frozen request body by its SHA-256.
+
+    Returns:
+        The exact bytes that were sent, or None if no such snapshot exists
+
+    Raises:
+        ValueError: If the stored body no longer matches its hash
+    """
+    result = await db.execute(
+        select(SubmissionPayload.body).where(SubmissionPayload.sha256 == sha256)
+    )
+    compressed = result.scalar_one_or_none()
+    if compressed is None:
+        return None
+    return _decode_payload(sha256, compressed)
+
+
+async def load_payloads(db: AsyncSession, sha256s: Iterable[str]) -> dict[str, bytes]:
+    """
+    Load many frozen request bodies in one query.
+
+    Snapshots that are missing or no longer match their hash are left out
+    (and logged), so callers fall back to rebuilding those bodies.
+
+    Returns:
+        Mapping of SHA-256 to the exact bytes that were sent
+    """
+    wanted = set(sha256s)
+    if not wanted:
+        return {}
+
+    result = await db.execute(
+        select(SubmissionPayload.sha256, SubmissionPayload.body).where(
+            SubmissionPayload.sha256.in_(wanted)
+        )
+    )
+    bodies: dict[str, bytes] = {}
+    for sha256, compressed in result:
+        try:
+            bodies[sha256] = _decode_payload(sha256, compressed)
+        except (ValueError, zlib.error):
+            logger.error("submission_payload_corrupt", sha256=sha256)
+    return bodies
+
+
+async def attempts_since(
+    db: AsyncSession,
+    invoice_id: uuid.UUID,
+    since: datetime,
+) -> tuple[bool, bool, bool]:
+    """
+    Summarize the attempts made for an invoice since a point in time.
+
+    Used to settle a submission that crashed mid-flight: once an attempt
+    row is open, the POST may have reached FBR.
+
+    Returns:
+        Tuple of (any attempt succeeded, any attempt's outcome is unresolved
+        (UNKNOWN or TIMEOUT), any attempt was opened at all)
+    """
+    result = await db.execute(
+        select(
+            func.coalesce(func.bool_or(SubmissionAttempt.outcome == SubmissionOutcome.SUCCESS), False),
+            func.coalesce(
+                func.bool_or(
+                    SubmissionAttempt.outcome.in_([SubmissionOutcome.UNKNOWN, SubmissionOutcome.TIMEOUT])
+                ),
+                False,
+            ),
+            func.count(SubmissionAttempt.id) > 0,
+        ).where(
+            and_(
+                SubmissionAttempt.invoice_id == invoice_id,
+                SubmissionAttempt.attempted_at >= since,
+            )
+        )
+    )
+    accepted, unresolved, attempted = result.one()
+    return accepted, unresolved, attempted
+
+
+_attempt_ledger: AttemptLedger | None = None
+
+
+def get_attempt_ledger() -> AttemptLedger:
+    """Get the process-wide attempt ledger writer."""
+    global _attempt_ledger
+    if _attempt_ledger is None:
+        _attempt_ledger = AttemptLedger()
+    return _attempt_ledger
@@ -0,0 +1,174 @@
+"""
+Circuit breaker around the FBR gateway.
+
+Tracks timeouts, connection errors and 5xx responses in a sliding window.
+When the failure rate crosses the configured threshold the circuit opens and
+submissions fail fast (and are deferred to the submission job queue) instead
+of each waiting through the full timeout/retry ladder. After a cool-down a
+single half-open probe is let through; its outcome closes or re-opens the
+circuit.
+"""
+
+import enum
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+from app.config import Settings, get_settings
+
+logger = structlog.get_logger()
+
+
+class CircuitState(str, enum.Enum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the FBR circuit is open."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f"FBR gateway circuit is open; retry in {retry_after:.0f}s"
+        )
+
+
+class CircuitBreaker:
+    """Sliding-window failure-rate circuit breaker."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.settings = settings or get_settings()
+        self._clock = clock
+        self._window: deque[tuple[float, bool]] = deque()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (OPEN becomes HALF_OPEN once the cool-down has passed)."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.settings.fbr_breaker_open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info("fbr_circuit_half_open")
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit will allow a probe (0 if not open)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        elapsed = self._clock() - self._opened_at
+        return max(0.0, self.settings.fbr_breaker_open_seconds - elapsed)
+
+    def allows_traffic(self) -> bool:
+        """Whether new work should be started (does not reserve a probe)."""
+        if not self.settings.fbr_breaker_enabled:
+            return True
+        return self.state != CircuitState.OPEN
+
+    def before_call(self) -> None:
+        """
+        Gate an outbound call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the
+                probe already in flight
+        """
+        if not self.settings.fbr_breaker_enabled:
+            return
+
+        state = self.state
+        if state == CircuitState.OPEN:
+            raise CircuitOpenError(self.retry_after())
+        if state == CircuitState.HALF_OPEN:
+            now = self._clock()
+            # A probe that never reported back (e.g. cancelled) is considered
+            # lost after another cool-down period, so the circuit cannot wedge.
+            if (
+                self._probe_in_flight
+                and now - self._probe_started_at < self.settings.fbr_breaker_open_seconds
+            ):
+                raise CircuitOpenError(0.0)
+            self._probe_in_flight = True
+            self._probe_started_at = now
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy gateway."""
+        self._record(failed=False)
+
+    def record_failure(self) -> None:
+        """Record a timeout, connection error or 5xx response."""
+        self._record(failed=True)
+
+    def _record(self, *, failed: bool) -> None:
+        if not self.settings.fbr_breaker_enabled:
+            return
+
+        now = self._clock()
+        state = self.state
+
+        if state == CircuitState.HALF_OPEN:
+            if failed:
+                self._open(now)
+            else:
+                self._state = CircuitState.CLOSED
+                self._window.clear()
+                logger.info("fbr_circuit_closed")
+            self._probe_in_flight = False
+            return
+
+        self._window.append((now, failed))
+        cutoff = now - self.settings.fbr_breaker_window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+
+        if state == CircuitState.CLOSED and self._should_open():
+            self._open(now)
+
+    def _should_open(self) -> bool:
+        total = len(self._window)
+        if total < self.settings.fbr_breaker_min_calls:
+            return False
+        failures = sum(1 for _, failed in self._window if failed)
+        return failures / total >= self.settings.fbr_breaker_failure_rate
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        logger.warning("fbr_circuit_opened", window_calls=len(self._window))
+
+    def snapshot(self) -> dict[str, Any]:
+        """State summary for health checks."""
+        failures = sum(1 for _, failed in self._window if failed)
+        return {
+            "state": self.state.value,
+            "window_calls": len(self._window),
+            "window_failures": failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+        }
+
+
+_circuit_breaker: CircuitBreaker | None = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide FBR circuit breaker."""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
@@ -0,0 +1,239 @@
+"""
+Record/replay cassettes for FBR gateway traffic.
+
+RecordingTransport sits between the pooled FBR client and the network.
+It appends every request/response pair to a cassette file (JSON Lines), with
+the response body kept byte-for-byte. That includes IRIS quirks such as
+trailing commas. It also keeps the observed latency. Transport errors
+such as read timeouts are recorded too.
+
+ReplayTransport serves a cassette with no network. Requests are matched on
+method, URL path and canonical JSON body; volatile fields such as
+invoiceDate are ignored. Identical requests get their recorded responses in
+order, and the last one repeats. Each response is delayed by its recorded
+latency times latency_scale, so 0 replays at full speed. A recorded
+latency longer than the request's read timeout becomes a ReadTimeout.
+
+Authorization headers are never written to a cassette.
+
+Enable with FBR_CASSETTE_MODE=record|replay (see build_fbr_client), or
+pass a transport to httpx.AsyncClient directly in tests.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+import structlog
+
+from app.config import Settings, get_settings
+
+logger = structlog.get_logger()
+
+# Headers describing the wire encoding; the cassette stores the decoded body
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+
+class CassetteMissError(httpx.ConnectError):
+    """
+    A replayed request has no recorded response.
+
+    Raised before anything could have reached FBR, so it is a connect error:
+    FBRService records the attempt as NETWORK_ERROR, not UNKNOWN.
+    """
+
+    def __init__(self, method: str, path: str, request: httpx.Request | None = None):
+        self.method = method
+        self.path = path
+        super().__init__(f"No recorded response for {method} {path}", request=request)
+
+
+def request_key(method: str, url: str, body: bytes, ignore_fields: Iterable[str] = ()) -> str:
+    """
+    Match key for a request: method, URL path and canonical body.
+
+    JSON object bodies are compared with sorted keys and without
+    `ignore_fields` (top level); other bodies are compared as raw bytes.
+    """
+    canonical = body
+    try:
+        data = orjson.loads(body) if body else None
+    except orjson.JSONDecodeError:
+        pass
+    else:
+        if isinstance(data, dict):
+            for field in ignore_fields:
+                data.pop(field, None)
+        canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.sha256(method.upper().encode() + b" " + urlsplit(url).path.encode() + b"\n")
+    digest.update(canonical)
+    return digest.hexdigest()
+
+
+def _response_headers(headers: httpx.Headers) -> dict[str, str]:
+    return {k: v for k, v in headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to a real transport and appends each exchange to a cassette."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.path = Path(path)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _append(self, request: httpx.Request, elapsed_ms: float, **outcome: Any) -> None:
+        entry = {
+            "method": request.method,
+            "path": request.url.path,
+            "request_body": request.content.decode("utf-8", errors="replace"),
+            "elapsed_ms": round(elapsed_ms, 1),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            **outcome,
+        }
+        with self.path.open("ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+            try:
+                body = await response.aread()
+            finally:
+                await response.aclose()
+        except httpx.TransportError as e:
+            self._append(
+                request,
+                (time.perf_counter() - started) * 1000,
+                error=type(e).__name__,
+                message=str(e),
+            )
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        headers = _response_headers(response.headers)
+        self._append(
+            request,
+            elapsed_ms,
+            status=response.status_code,
+            headers=headers,
+            body=body.decode("utf-8", errors="replace"),
+        )
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded exchanges from cassettes, delayed by their recorded latency."""
+
+    def __init__(
+        self,
+        paths: str | Path | Iterable[str | Path],
+        latency_scale: float = 1.0,
+        ignore_fields: Iterable[str] = (),
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        self.latency_scale = latency_scale
+        self.ignore_fields = tuple(ignore_fields)
+        self.sleep = sleep
+        self.misses: list[tuple[str, str]] = []
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._served: dict[str, int] = {}
+        for path in paths:
+            with Path(path).open("rb") as f:
+                for line in f:
+                    if line.strip():
+                        self.add(orjson.loads(line))
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Add one recorded exchange (re-keyed with this transport's ignore_fields)."""
+        key = request_key(
+            entry["method"], entry["path"], entry["request_body"].encode(), self.ignore_fields
+        )
+        self._entries.setdefault(key, []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _next(self, key: str) -> dict[str, Any] | None:
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return entries[min(served, len(entries) - 1)]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        entry = self._next(
+            request_key(request.method, str(request.url), request.content, self.ignore_fields)
+        )
+        if entry is None:
+            self.misses.append((request.method, request.url.path))
+            logger.warning("fbr_cassette_miss", method=request.method, path=request.url.path)
+            raise CassetteMissError(request.method, request.url.path, request=request)
+
+        delay = entry["elapsed_ms"] / 1000 * self.latency_scale
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        if read_timeout is not None and delay > read_timeout:
+            await self.sleep(read_timeout)
+            raise httpx.ReadTimeout("Replayed latency exceeds the read timeout", request=request)
+        await self.sleep(delay)
+
+        if entry.get("error"):
+            error_class = getattr(httpx, entry["error"], httpx.TransportError)
+            raise error_class(entry.get("message", ""), request=request)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"].encode(),
+            request=request,
+        )
+
+
+def build_cassette_transport(
+    settings: Settings | None = None,
+    limits: httpx.Limits | None = None,
+) -> httpx.AsyncBaseTransport | None:
+    """
+    Transport for FBR_CASSETTE_MODE, or None when cassettes are off.
+
+    Args:
+        settings: Cassette settings (defaults to the app settings)
+        limits: Connection pool limits of the network transport (record mode);
+            a custom transport owns the pool, so the client's limits do not apply
+    """
+    settings = settings or get_settings()
+    mode = settings.fbr_cassette_mode
+    if mode == "record":
+        logger.info("fbr_cassette_recording", path=settings.fbr_cassette_path)
+        return RecordingTransport(
+            settings.fbr_cassette_path,
+            transport=httpx.AsyncHTTPTransport(limits=limits or httpx.Limits(), http2=settings.fbr_http2),
+        )
+    if mode == "replay":
+        replay = ReplayTransport(
+            settings.fbr_cassette_path,
+            latency_scale=settings.fbr_cassette_latency_scale,
+            ignore_fields=settings.fbr_cassette_ignore_fields,
+        )
+        logger.info("fbr_cassette_replaying", path=settings.fbr_cassette_path, exchanges=len(replay))
+        return replay
+    return None
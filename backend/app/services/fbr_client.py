@@ -0,0 +1,149 @@
+"""
+Process-wide FBR HTTP client registry.
+
+Owns the pooled httpx.AsyncClient used for every call to the FBR gateway and
+the FBR service instance (real or mock) built on top of it. The registry is
+started and warmed in the application lifespan and closed on shutdown, so
+TLS sessions to the gateway are reused across requests. Startup also seeds
+the adaptive-timeout latency windows from the submission ledger.
+"""
+
+from typing import TYPE_CHECKING
+
+import httpx
+import structlog
+
+from app.config import Settings, get_settings
+from app.database import async_session_maker
+from app.services.attempt_ledger import get_attempt_ledger
+from app.services.fbr_cassette import build_cassette_transport
+from app.services.latency_tracker import get_latency_tracker
+
+if TYPE_CHECKING:
+    from app.services.fbr_service import FBRService
+    from app.services.mock_fbr_service import MockFBRService
+
+logger = structlog.get_logger()
+
+
+def build_fbr_client(settings: Settings | None = None) -> httpx.AsyncClient:
+    """
+    Build an httpx.AsyncClient configured for the FBR gateway.
+
+    Connection limits, keepalive, HTTP/2 and the connect/read/write/pool
+    timeouts all come from Settings. With FBR_CASSETTE_MODE set, traffic is
+    recorded to or replayed from a cassette (see app.services.fbr_cassette).
+    """
+    settings = settings or get_settings()
+
+    limits = httpx.Limits(
+        max_connections=settings.fbr_max_connections,
+        max_keepalive_connections=settings.fbr_max_keepalive_connections,
+        keepalive_expiry=settings.fbr_keepalive_expiry_seconds,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.fbr_connect_timeout_seconds,
+        read=float(settings.fbr_timeout_seconds),
+        write=float(settings.fbr_timeout_seconds),
+        pool=settings.fbr_pool_timeout_seconds,
+    )
+
+    transport = build_cassette_transport(settings, limits=limits)
+
+    return httpx.AsyncClient(
+        headers={
+            "Authorization": f"Bearer {settings.fbr_auth_token}",
+            "Content-Type": "application/json",
+        },
+        limits=limits,
+        timeout=timeout,
+        http2=settings.fbr_http2,
+        transport=transport,
+    )
+
+
+class FBRClientRegistry:
+    """
+    Holds the shared FBR HTTP client and service for this process.
+
+    The service is created lazily on first use so that scripts and tests
+    that never run the application lifespan still get a working instance.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._service: "FBRService | MockFBRService | None" = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client (created on first access)."""
+        if self._client is None or self._client.is_closed:
+            self._client = build_fbr_client()
+        return self._client
+
+    def get_service(self) -> "FBRService | MockFBRService":
+        """
+        Get the shared FBR service (real or mock based on configuration).
+
+        Both implementations are created here so that callers never
+        instantiate services (and HTTP clients) per request.
+        """
+        if self._service is None:
+            settings = get_settings()
+            if settings.use_mock_fbr:
+                from app.services.mock_fbr_service import MockFBRService
+
+                self._service = MockFBRService(record_attempts=True)
+                logger.info("fbr_service_mode", mode="MOCK", reason="USE_MOCK_FBR=true")
+            else:
+                from app.services.fbr_service import FBRService
+
+                self._service = FBRService(client=self.client)
+                logger.info("fbr_service_mode", mode="REAL", url=settings.fbr_url)
+        return self._service
+
+    async def start(self) -> None:
+        """
+        Create the shared service and, for the real gateway, seed the latency
+        windows from the submission ledger and open a pooled connection so the
+        first submission does not pay for the TLS handshake.
+        """
+        settings = get_settings()
+        self.get_service()
+
+        if settings.use_mock_fbr:
+            return
+
+        await self._seed_latency()
+
+        if not settings.fbr_warm_on_startup or settings.fbr_cassette_mode != "off":
+            return
+
+        try:
+            await self.client.head(settings.fbr_url)
+            logger.info("fbr_client_warmed", url=settings.fbr_url)
+        except httpx.HTTPError as e:
+            # Warm-up is best effort; the gateway may reject HEAD or be unreachable.
+            logger.warning("fbr_client_warmup_failed", url=settings.fbr_url, error=str(e))
+
+    async def _seed_latency(self) -> None:
+        """Load recent latencies so adaptive timeouts apply from the first call."""
+        try:
+            async with async_session_maker() as db:
+                loaded = await get_latency_tracker().seed_from_ledger(db)
+            logger.info("fbr_latency_seeded", samples=loaded)
+        except Exception as e:
+            # Best effort; the static timeout applies until samples accumulate.
+            logger.warning("fbr_latency_seed_failed", error=str(e))
+
+    async def aclose(self) -> None:
+        """Flush the attempt ledger, close the shared client and drop the service."""
+        await get_attempt_ledger().aclose()
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._service = None
+
+
+# Process-wide registry
+fbr_clients = FBRClientRegistry()
@@ -0,0 +1,108 @@
+"""
+FBR (IRIS) payload serializer.
+
+Builds the DI API request body straight to JSON bytes with orjson. Field
+mappings are declared once as tables of (IRIS key, extractor) pairs rather
+than hand-written per call, and Decimal amounts are emitted verbatim as JSON
+numbers (via orjson.Fragment) so large values never pass through float.
+
+Reference: IRIS Documentation.md Section 4.1
+"""
+
+from collections.abc import Callable
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+
+import orjson
+
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+
+_ZERO = Decimal("0")
+
+
+def _decimal_text(value: str | None) -> Decimal:
+    """Parse a free-text amount column (blank means zero)."""
+    if value is None or not value.strip():
+        return _ZERO
+    return Decimal(value.strip())
+
+
+def _or(getter: Callable[[Any], Any], default: str) -> Callable[[Any], Any]:
+    return lambda obj: getter(obj) or default
+
+
+def _tenant(attr: str, transform: Callable[[str], str] = str) -> Callable[[Invoice], str]:
+    def get(invoice: Invoice) -> str:
+        value = getattr(invoice.tenant, attr, None) if invoice.tenant else None
+        return transform(value) if value else ""
+
+    return get
+
+
+def _digits(value: str) -> str:
+    return value.replace("-", "")
+
+
+# Item fields per IRIS spec. Decimal columns are passed through untouched.
+ITEM_FIELDS: tuple[tuple[str, Callable[[InvoiceItem], Any]], ...] = (
+    ("hsCode", attrgetter("hs_code")),
+    ("productDescription", attrgetter("product_description")),
+    ("rate", attrgetter("rate")),  # e.g., "18%"
+    ("uoM", attrgetter("uom")),
+    ("quantity", attrgetter("quantity")),
+    ("totalValues", attrgetter("total_values")),
+    ("valueSalesExcludingST", attrgetter("value_sales_excluding_st")),
+    ("fixedNotifiedValueOrRetailPrice", attrgetter("fixed_notified_value")),
+    ("salesTaxApplicable", attrgetter("sales_tax_applicable")),
+    ("salesTaxWithheldAtSource", attrgetter("sales_tax_withheld")),
+    ("extraTax", lambda item: _decimal_text(item.extra_tax)),
+    ("furtherTax", attrgetter("further_tax")),
+    ("sroScheduleNo", _or(attrgetter("sro_schedule_no"), "")),
+    ("fedPayable", attrgetter("fed_payable")),
+    ("discount", attrgetter("discount")),
+    ("saleType", _or(attrgetter("sale_type"), "Goods at standard rate (default)")),
+    ("sroItemSerialNo", _or(attrgetter("sro_item_serial_no"), "")),
+)
+
+# Invoice header fields per IRIS spec; "items" is appended last.
+INVOICE_FIELDS: tuple[tuple[str, Callable[[Invoice], Any]], ...] = (
+    ("invoiceType", lambda inv: inv.invoice_type.value),  # "Sale Invoice" or "Debit Note"
+    ("invoiceDate", lambda inv: inv.invoice_date.strftime("%Y-%m-%d")),
+    ("sellerNTNCNIC", _tenant("seller_ntn", _digits)),
+    ("sellerBusinessName", _tenant("business_name")),
+    ("sellerProvince", _tenant("province")),
+    ("sellerAddress", _tenant("address")),
+    ("buyerNTNCNIC", lambda inv: _digits(inv.buyer_ntn_cnic)),
+    ("buyerBusinessName", attrgetter("buyer_business_name")),
+    ("buyerProvince", attrgetter("buyer_province")),
+    ("buyerAddress", attrgetter("buyer_address")),
+    ("buyerRegistrationType", lambda inv: inv.buyer_registration_type.value),  # "Registered" or "Unregistered"
+    (
+        "invoiceRefNo",
+        lambda inv: inv.invoice_ref_no if inv.invoice_type.value == "Debit Note" else "",
+    ),
+    ("scenarioId", attrgetter("scenario_id")),  # Required for sandbox
+)
+
+
+def _default(value: Any) -> Any:
+    """orjson fallback: emit Decimals as exact JSON numbers."""
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise TypeError(f"Non-finite amount cannot be sent to FBR: {value}")
+        return orjson.Fragment(format(value, "f"))
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def build_payload(invoice: Invoice) -> dict[str, Any]:
+    """Map an Invoice (items and tenant loaded) to the IRIS payload structure."""
+    payload = {key: get(invoice) for key, get in INVOICE_FIELDS}
+    payload["items"] = [{key: get(item) for key, get in ITEM_FIELDS} for item in invoice.items]
+    return payload
+
+
+def serialize_payload(invoice: Invoice) -> bytes:
+    """Serialize an Invoice to IRIS request body bytes."""
+    return orjson.dumps(build_payload(invoice), default=_default)
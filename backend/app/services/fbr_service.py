@@ -5,190 +5,326 @@ Handles submission of invoices to the FBR API.
 """
 
 import asyncio
-import uuid
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import httpx
 import structlog
-from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.models.invoice import Invoice
-from app.models.submission_attempt import SubmissionAttempt, SubmissionOutcome
+from app.models.submission_attempt import SubmissionOutcome
 from app.models.tenant import Tenant
+from app.services.attempt_ledger import AttemptLedger, get_attempt_ledger
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from app.services.fbr_client import build_fbr_client
+from app.services.fbr_payload import serialize_payload
+from app.services.latency_tracker import LatencyTracker, get_latency_tracker
+from app.services.rate_limiter import FBRRateLimiter, get_rate_limiter
+from app.services.retry_policy import RetryPolicy, get_retry_policy
+from app.services.tenant_credentials import TenantTokenCache, TenantTokenError, get_tenant_token_cache
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Error returned when an attempt may have reached FBR but no answer came back
+# (e.g. a read timeout). The invoice goes to UNKNOWN for reconciliation.
+SUBMISSION_OUTCOME_UNKNOWN = "Submission Outcome Unknown"
+
+# Error returned when FBR answers 200 but rejects the invoice or an item
+# (validationResponse statusCode "01"). The invoice goes to FAILED.
+SUBMISSION_REJECTED = "Invoice Rejected by FBR"
+
+# Timeouts raised before the request could have been sent
+_UNSENT_TIMEOUTS = (httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _rejected(body: Any) -> bool:
+    """Whether an IRIS response body rejects the invoice or any of its items."""
+    if not isinstance(body, dict) or not isinstance(body.get("validationResponse"), dict):
+        return False
+    validation = body["validationResponse"]
+    items = validation.get("invoiceStatuses") or []
+    return validation.get("statusCode") == "01" or any(
+        isinstance(item, dict) and item.get("statusCode") == "01" for item in items
+    )
+
 
 class FBRService:
     """Service for interacting with FBR IRIS 2.0 API."""
 
-    def __init__(self):
-        self.headers = {
-            "Authorization": f"Bearer {settings.fbr_auth_token}",
-            "Content-Type": "application/json",
-        }
-        self.client = httpx.AsyncClient(
-            headers=self.headers,
-            timeout=float(settings.fbr_timeout_seconds),
-        )
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        rate_limiter: FBRRateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        latency: LatencyTracker | None = None,
+        retry_policy: RetryPolicy | None = None,
+        ledger: AttemptLedger | None = None,
+        tokens: TenantTokenCache | None = None,
+    ):
+        """
+        Args:
+            client: Shared pooled client (from the FBR client registry).
+                If omitted, the service builds and owns a private client.
+            rate_limiter: Token buckets gating outbound calls
+                (defaults to the process-wide limiter).
+            breaker: Circuit breaker around the gateway
+                (defaults to the process-wide breaker).
+            latency: Latency windows that drive the read timeout
+                (defaults to the process-wide tracker).
+            retry_policy: Backoff, Retry-After and retry budget rules
+                (defaults to the process-wide policy).
+            ledger: Writer for submission_attempts rows, which uses its own
+                short-lived sessions (defaults to the process-wide writer).
+            tokens: Decrypted per-tenant FBR tokens, injected as the
+                Authorization header per request (defaults to the process-wide cache).
+        """
+        self._owns_client = client is None
+        self.client = client or build_fbr_client()
+        self.headers = dict(self.client.headers)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.breaker = breaker or get_circuit_breaker()
+        self.latency = latency or get_latency_tracker()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.ledger = ledger or get_attempt_ledger()
+        self.tokens = tokens or get_tenant_token_cache()
 
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP client if this service owns it."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _timeout(self, read_timeout: float) -> httpx.Timeout:
+        """Per-request timeout with the adaptive read timeout."""
+        return httpx.Timeout(
+            connect=settings.fbr_connect_timeout_seconds,
+            read=read_timeout,
+            write=float(settings.fbr_timeout_seconds),
+            pool=settings.fbr_pool_timeout_seconds,
+        )
 
-    def _build_payload(self, invoice: Invoice) -> dict[str, Any]:
+    def _build_payload(self, invoice: Invoice) -> bytes:
         """
-        Construct FBR JSON payload from Invoice model.
+        Construct the FBR JSON request body from Invoice model.
         
-        Maps internal model fields to official IRIS API expected keys.
+        Maps internal model fields to official IRIS API expected keys
+        (see app.services.fbr_payload). Amounts keep their exact Decimal value.
         Reference: IRIS Documentation.md Section 4.1
         """
-        # Build items array per IRIS spec
-        items = []
-        for item in invoice.items:
-            item_payload = {
-                "hsCode": item.hs_code,
-                "productDescription": item.product_description,
-                "rate": item.rate,  # e.g., "18%"
-                "uoM": item.uom,
-                "quantity": float(item.quantity),
-                "totalValues": float(item.total_values),
-                "valueSalesExcludingST": float(item.value_sales_excluding_st),
-                "fixedNotifiedValueOrRetailPrice": float(item.fixed_notified_value),
-                "salesTaxApplicable": float(item.sales_tax_applicable),
-                "salesTaxWithheldAtSource": float(item.sales_tax_withheld),
-                "extraTax": float(item.extra_tax) if item.extra_tax and item.extra_tax.strip() else 0.0,
-                "furtherTax": float(item.further_tax),
-                "sroScheduleNo": item.sro_schedule_no or "",
-                "fedPayable": float(item.fed_payable),
-                "discount": float(item.discount),
-                "saleType": item.sale_type or "Goods at standard rate (default)",
-                "sroItemSerialNo": item.sro_item_serial_no or "",
-            }
-            items.append(item_payload)
-
-        # Build main payload per IRIS spec
-        payload = {
-            "invoiceType": invoice.invoice_type.value,  # "Sale Invoice" or "Debit Note"
-            "invoiceDate": invoice.invoice_date.strftime("%Y-%m-%d"),
-            "sellerNTNCNIC": invoice.tenant.seller_ntn.replace("-", "") if invoice.tenant and invoice.tenant.seller_ntn else "",
-            "sellerBusinessName": invoice.tenant.business_name if invoice.tenant else "",
-            "sellerProvince": invoice.tenant.province if invoice.tenant else "",
-            "sellerAddress": invoice.tenant.address if invoice.tenant else "",
-            "buyerNTNCNIC": invoice.buyer_ntn_cnic.replace("-", ""),
-            "buyerBusinessName": invoice.buyer_business_name,
-            "buyerProvince": invoice.buyer_province,
-            "buyerAddress": invoice.buyer_address,
-            "buyerRegistrationType": invoice.buyer_registration_type.value,  # "Registered" or "Unregistered"
-            "invoiceRefNo": invoice.invoice_ref_no if invoice.invoice_type.value == "Debit Note" else "",
-            "scenarioId": invoice.scenario_id,  # Required for sandbox
-            "items": items,
-        }
-        
-        return payload
+        return serialize_payload(invoice)
 
-    async def submit_invoice(self, invoice: Invoice, db: Session) -> dict[str, Any]:
+    async def submit_invoice(
+        self,
+        invoice: Invoice,
+        ensure_claim: Callable[[], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
         """
-        Submit invoice to FBR with retry logic.
+        Submit invoice to FBR, retrying according to the retry policy.
 
         Returns the JSON response from FBR.
         Does NOT update Invoice status - caller handles DB state.
         However, it DOES Create SubmissionAttempt logs locally.
+
+        Attempts are written through short-lived sessions, so no pooled
+        database connection is held while waiting on FBR. Callers should
+        likewise end their own transaction before calling this.
+
+        If an attempt may have been received by FBR without a response
+        (a read timeout or a dropped connection) and no later attempt
+        succeeds, the error is SUBMISSION_OUTCOME_UNKNOWN rather than a
+        plain failure; so is a 200 whose body cannot be decoded. A 200
+        whose validationResponse rejects the invoice is returned with error
+        SUBMISSION_REJECTED.
+
+        `ensure_claim`, if given, is awaited before every attempt is opened;
+        a background job passes a lease check here so that it stops sending
+        once another worker has reclaimed it.
+
+        Raises:
+            CircuitOpenError: If the gateway circuit is open before the first
+                attempt (nothing was sent; the caller should defer)
+            Whatever `ensure_claim` raises, before the attempt it guards
         """
+        # Canonical body, built once; every attempt sends exactly these bytes
         payload = self._build_payload(invoice)
+        payload_sha256 = None
         url = settings.fbr_url
+        # The tenant's own token on the shared pool (global token if it has none)
+        try:
+            headers = self.tokens.auth_headers(invoice.tenant)
+        except TenantTokenError as e:
+            # Nothing was sent; the invoice fails and can be resubmitted once fixed
+            return {"error": "FBR Credentials Unavailable", "detail": str(e)}
         
-        # Log attempt start
+        # Log attempt start (never the Authorization header)
         logger.info("submitting_to_fbr", ref_no=invoice.invoice_ref_no, url=url)
-        
-        # --- DEBUGGING LOGS ---
-        print(f"\n[DEBUG] FBR Submission to {url}")
-        print(f"[DEBUG] Authorization Header: {self.client.headers.get('Authorization', 'MISSING')[:15]}... (Len: {len(self.client.headers.get('Authorization', ''))})")
-        print(f"[DEBUG] Payload: {payload}")
-        # ----------------------
+        logger.debug("fbr_payload", ref_no=invoice.invoice_ref_no, payload_bytes=len(payload))
 
         attempt_count = 0
-        max_retries = settings.fbr_max_retries
         last_exception = None
+        ambiguous = False
+        retry = self.retry_policy.begin(str(invoice.tenant_id))
         
-        while attempt_count < max_retries:
+        while True:
+            # Fail fast while the gateway is known to be down. Before the first
+            # attempt the caller defers the submission; mid-ladder we stop retrying.
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                if attempt_count == 0:
+                    raise
+                last_exception = e
+                break
+
+            await self.rate_limiter.acquire(str(invoice.tenant_id))
+
+            if ensure_claim is not None:
+                await ensure_claim()
+
             attempt_count += 1
-            attempt_id = uuid.uuid4()
-            
-            # Create attempt log (Synchronous DB write for safety? Or Async?)
-            # We are in async context.
-            attempt = SubmissionAttempt(
-                id=attempt_id,
-                invoice_id=invoice.id,
-                attempt_number=attempt_count,
-                endpoint=url,
-                outcome=SubmissionOutcome.UNKNOWN,
-                diagnostic_id=attempt_id.hex[:8], # Use prefix of ID as diagnostic ref
-            )
-            db.add(attempt)
-            await db.commit() # Commit start of attempt
+
+            # Freeze the body (compressed, by SHA-256) on the first attempt
+            if payload_sha256 is None:
+                payload_sha256 = await self.ledger.store_payload(payload)
+
+            # Write-ahead: the UNKNOWN row is committed before anything is sent
+            attempt_id, _ = await self.ledger.open(invoice.id, attempt_count, url, payload_sha256)
+            closed = False
             
+            read_timeout = self.latency.read_timeout(url)
             try:
-                response = await self.client.post(url, json=payload)
+                # Timed here rather than via response.elapsed, which custom
+                # transports (test doubles, cassettes, proxies) may not set
+                started = time.perf_counter()
+                response = await self.client.post(
+                    url, content=payload, headers=headers, timeout=self._timeout(read_timeout)
+                )
+                response_time_ms = int((time.perf_counter() - started) * 1000)
+
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
                 
-                # Update attempt
-                attempt.http_status = response.status_code
-                attempt.response_summary = response.text[:1000] # Truncate if huge
-                attempt.response_time_ms = int(response.elapsed.total_seconds() * 1000)
+                self.latency.record(url, response_time_ms)
                 
                 if response.status_code == 200:
-                    attempt.outcome = SubmissionOutcome.SUCCESS
-                    # Parse JSON check if it really is success (FBR might return 200 with error msg)
+                    # Parsed once, before the attempt is closed
                     try:
-                        resp_json = response.json()
-                        if resp_json.get("Code") != 100: # Assuming 100 is logic success? Need to verify FBR codes.
-                             # For now, treat HTTP 200 as technical success.
-                             pass
-                    except:
-                        pass
+                        body = response.json()
+                    except ValueError:
+                        body = None
+                    if not isinstance(body, dict):
+                        # FBR may have accepted an invoice whose answer we
+                        # cannot read; the reconciler resolves it, no resend
+                        outcome = SubmissionOutcome.UNKNOWN
+                    elif _rejected(body):
+                        # FBR answers 200 with statusCode "01" when it rejects the invoice
+                        outcome = SubmissionOutcome.VALIDATION_ERROR
+                    else:
+                        outcome = SubmissionOutcome.SUCCESS
+                elif self.retry_policy.is_retryable_status(response.status_code):
+                    outcome = SubmissionOutcome.NETWORK_ERROR # Throttled / gateway unavailable
                 else:
-                    attempt.outcome = SubmissionOutcome.VALIDATION_ERROR # or AUTH_ERROR
+                    outcome = SubmissionOutcome.VALIDATION_ERROR # or AUTH_ERROR
                 
-                await db.commit()
+                await self.ledger.close(
+                    attempt_id,
+                    outcome,
+                    http_status=response.status_code,
+                    response_time_ms=response_time_ms,
+                    response_summary=response.text[:1000], # Truncate if huge
+                )
+                closed = True
                 
                 if response.status_code == 200:
-                    return response.json()
+                    if outcome == SubmissionOutcome.UNKNOWN:
+                        return {"error": SUBMISSION_OUTCOME_UNKNOWN, "body": response.text}
+                    if outcome == SubmissionOutcome.VALIDATION_ERROR:
+                        return {"error": SUBMISSION_REJECTED, **body}
+                    return body
                 
-                # If 500 or 429, maybe retry? 
-                # For now, we only retry on Network Timeout (below).
-                # 4xx/5xx are typically terminal for payload issues.
-                return {"error": f"HTTP {response.status_code}", "body": response.text}
+                # 429/502/503/504 are retried per the retry policy;
+                # other 4xx/5xx are terminal for payload issues.
+                delay = retry.next_delay(response=response)
+                if delay is None:
+                    if ambiguous:
+                        # An earlier attempt may still have been accepted
+                        return {"error": SUBMISSION_OUTCOME_UNKNOWN, "body": response.text}
+                    return {"error": f"HTTP {response.status_code}", "body": response.text}
+                await asyncio.sleep(delay)
 
             except httpx.TimeoutException as e:
+                self.breaker.record_failure()
+                # Count the timeout as a sample at the limit, so a gateway that
+                # slows down for real pushes the adaptive timeout back up.
+                self.latency.record(url, read_timeout * 1000)
                 last_exception = e
-                attempt.outcome = SubmissionOutcome.TIMEOUT
-                attempt.response_summary = str(e)
-                await db.commit()
+                if not isinstance(e, _UNSENT_TIMEOUTS):
+                    ambiguous = True
+                await self.ledger.close(
+                    attempt_id,
+                    SubmissionOutcome.TIMEOUT,
+                    response_time_ms=int(read_timeout * 1000),
+                    response_summary=str(e),
+                )
                 
-                if attempt_count < max_retries:
-                    await asyncio.sleep(settings.fbr_retry_delay_seconds)
-                    continue
+                delay = retry.next_delay(exc=e)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
             except Exception as e:
+                if closed:
+                    # The attempt's outcome is recorded; never downgrade it
+                    raise
                 # Other connection errors
+                if isinstance(e, httpx.TransportError):
+                    self.breaker.record_failure()
                 last_exception = e
-                attempt.outcome = SubmissionOutcome.UNKNOWN # Network error
-                attempt.response_summary = str(e)
-                await db.commit()
-                break # Don't retry generic errors blindly
+                if isinstance(e, httpx.ConnectError):
+                    outcome = SubmissionOutcome.NETWORK_ERROR # Never reached FBR
+                else:
+                    outcome = SubmissionOutcome.UNKNOWN # Network error
+                    ambiguous = True
+                await self.ledger.close(attempt_id, outcome, response_summary=str(e))
+
+                # Only failures the policy knows are safe (e.g. connect errors) are retried
+                delay = retry.next_delay(exc=e)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
         
-        # If we exit loop, we failed
+        # If we exit loop, we failed (or cannot tell whether FBR accepted it)
+        if ambiguous:
+            return {"error": SUBMISSION_OUTCOME_UNKNOWN, "detail": str(last_exception)}
         return {"error": "Submission Failed", "detail": str(last_exception)}
 
-    async def validate_invoice(self, invoice: Invoice, db: Session) -> dict[str, Any]:
+    async def validate_invoice(self, invoice: Invoice, payload: bytes | None = None) -> dict[str, Any]:
         """
         Call the FBR validation endpoint (Invoice Details).
+
+        `payload` is a frozen body to send as-is (e.g. from submission_payloads
+        during reconciliation); by default the body is built from the invoice.
+
+        Calls go over the shared pooled client with per-request headers, so
+        validating a batch reuses connections instead of opening one each.
+
+        Throttled and unavailable responses, timeouts and connection errors
+        are retried according to the retry policy.
         """
-        payload = self._build_payload(invoice)
+        if payload is None:
+            payload = self._build_payload(invoice)
         
-        # Use specific validation token/url if available, else fallback
-        token = settings.fbr_sandbox_invoice_detail_token or settings.fbr_auth_token
+        # Tenant's own token if it has one, else the validation/global token
+        if invoice.tenant is not None and invoice.tenant.fbr_token:
+            try:
+                token = self.tokens.token_for(invoice.tenant)
+            except TenantTokenError as e:
+                return {"error": str(e)}
+        else:
+            token = settings.fbr_sandbox_invoice_detail_token or settings.fbr_auth_token
         url = settings.fbr_sandbox_invoice_detail_url
         
         if not url:
@@ -199,45 +335,59 @@ class FBRService:
             "Content-Type": "application/json"
         }
 
-        try:
-             async with httpx.AsyncClient(timeout=float(settings.fbr_timeout_seconds)) as client:
-                response = await client.post(url, json=payload, headers=headers)
-                try:
-                    return response.json()
-                except:
-                    return {"status_code": response.status_code, "text": response.text}
-        except Exception as e:
-            return {"error": str(e)}
+        retry = self.retry_policy.begin(str(invoice.tenant_id))
 
-# Service factory
-_fbr_service = None
-_mock_fbr_service = None
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                return {"error": str(e)}
+
+            read_timeout = self.latency.read_timeout(url)
+            try:
+                await self.rate_limiter.acquire(str(invoice.tenant_id))
+                started = time.perf_counter()
+                response = await self.client.post(
+                    url, content=payload, headers=headers, timeout=self._timeout(read_timeout)
+                )
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if isinstance(e, httpx.TimeoutException):
+                    self.latency.record(url, read_timeout * 1000)
+                delay = retry.next_delay(exc=e)
+                if delay is None:
+                    return {"error": str(e)}
+                await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                return {"error": str(e)}
+
+            self.latency.record(url, elapsed_ms)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
 
+            if response.status_code != 200:
+                delay = retry.next_delay(response=response)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+
+            try:
+                return response.json()
+            except:
+                return {"status_code": response.status_code, "text": response.text}
+
+# Service factory
 def get_fbr_service() -> FBRService:
     """
-    Get FBR service instance (real or mock based on configuration).
-    
-    Industry Best Practice:
-    - Automatically switches between real and mock based on USE_MOCK_FBR flag
-    - Allows seamless development without external dependencies
-    - Same interface for both implementations
+    Get the shared FBR service instance (real or mock based on configuration).
+
+    The instance and its pooled HTTP client live in the process-wide
+    registry, which is started and closed by the application lifespan.
     """
-    from app.config import get_settings
-    settings = get_settings()
-    
-    if settings.use_mock_fbr:
-        # Use mock service for development
-        global _mock_fbr_service
-        if _mock_fbr_service is None:
-            from app.services.mock_fbr_service import get_mock_fbr_service
-            _mock_fbr_service = get_mock_fbr_service()
-            logger.info("fbr_service_mode", mode="MOCK", reason="USE_MOCK_FBR=true")
-        return _mock_fbr_service
-    else:
-        # Use real FBR service
-        global _fbr_service
-        if _fbr_service is None:
-            _fbr_service = FBRService()
-            logger.info("fbr_service_mode", mode="REAL", url=settings.fbr_url)
-        return _fbr_service
+    from app.services.fbr_client import fbr_clients
 
+    return fbr_clients.get_service()
@@ -0,0 +1,217 @@
+"""
+Idempotency-Key handling for retried API requests.
+
+A client that retries POST /invoices or POST /invoices/{id}/submit with the
+same Idempotency-Key gets the stored response of the first request instead
+of a second invoice or a second FBR submission. Keys are tenant-scoped and
+kept for IDEMPOTENCY_KEY_TTL_HOURS; a repeat is answered from a single
+primary-key lookup without running any business logic.
+
+The key is reserved (a row without a response) and committed before the
+handler runs, so a concurrent duplicate sees it and gets 409 instead of
+racing the original. A reservation left behind by a crashed process can be
+taken over after IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS.
+"""
+
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import structlog
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.idempotency_key import IdempotencyKey
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """Raised when a key is reused with a different request."""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"Idempotency-Key '{key}' was already used for a different request")
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """Raised when the original request for a key is still running."""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"A request with Idempotency-Key '{key}' is still in progress")
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    """
+    SHA-256 identifying a request, so a reused key can be told apart.
+
+    Args:
+        method: HTTP method
+        path: URL path
+        query: Raw query string
+        body: Raw request body
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for part in (method.upper().encode(), path.encode(), query.encode()):
+        digest.update(part)
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def begin(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    key: str,
+    fingerprint: str,
+) -> IdempotencyKey | None:
+    """
+    Look up a key and reserve it if it is new.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        key: Idempotency-Key header value
+        fingerprint: request_fingerprint() of the current request
+
+    Returns:
+        The completed record to replay, or None if the caller now holds the
+        key and should run the request
+
+    Raises:
+        IdempotencyKeyMismatchError: If the key was used for another request
+        IdempotencyKeyInProgressError: If the original request is still running
+    """
+    now = datetime.now(timezone.utc)
+    record = await db.get(IdempotencyKey, (tenant_id, key), populate_existing=True)
+
+    if record is not None and record.expires_at <= now:
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at <= now,
+            )
+        )
+        await db.commit()
+        record = None
+
+    if record is not None:
+        if record.request_fingerprint != fingerprint:
+            raise IdempotencyKeyMismatchError(key)
+        if record.response_status is not None:
+            logger.info("idempotent_replay", tenant_id=str(tenant_id), key=key)
+            return record
+
+        stale_before = now - timedelta(seconds=settings.idempotency_in_progress_timeout_seconds)
+        if record.created_at > stale_before:
+            raise IdempotencyKeyInProgressError(key)
+
+        # The holder died without completing or releasing the key
+        taken = await db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.response_status.is_(None),
+                IdempotencyKey.created_at == record.created_at,
+            )
+            .values(created_at=now)
+            .returning(IdempotencyKey.key)
+        )
+        if taken.scalar_one_or_none() is None:
+            await db.rollback()
+            raise IdempotencyKeyInProgressError(key)
+        await db.commit()
+        logger.warning("idempotency_key_taken_over", tenant_id=str(tenant_id), key=key)
+        return None
+
+    reserved = await db.execute(
+        pg_insert(IdempotencyKey)
+        .values(
+            tenant_id=tenant_id,
+            key=key,
+            request_fingerprint=fingerprint,
+            created_at=now,
+            expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours),
+        )
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.tenant_id, IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    )
+    won = reserved.scalar_one_or_none() is not None
+    await db.commit()
+    if not won:
+        # A concurrent duplicate reserved it between our lookup and insert
+        raise IdempotencyKeyInProgressError(key)
+    return None
+
+
+async def complete(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    key: str,
+    status_code: int,
+    body: bytes,
+    headers: dict[str, str] | None = None,
+) -> None:
+    """
+    Store the response for a reserved key.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        key: Idempotency-Key header value
+        status_code: HTTP status of the response
+        body: Rendered JSON body
+        headers: Headers to replay with it
+    """
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.tenant_id == tenant_id, IdempotencyKey.key == key)
+        .values(
+            response_status=status_code,
+            response_body=body.decode(),
+            response_headers=headers or None,
+            expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours),
+        )
+    )
+    await db.commit()
+
+
+async def release(db: AsyncSession, tenant_id: uuid.UUID, key: str) -> None:
+    """Drop a reservation whose request failed unexpectedly, so it can be retried."""
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.tenant_id == tenant_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.response_status.is_(None),
+        )
+    )
+    await db.commit()
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    """
+    Delete expired keys.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of keys deleted
+    """
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.info("idempotency_keys_purged", count=result.rowcount)
+    return result.rowcount
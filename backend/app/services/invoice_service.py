@@ -8,24 +8,40 @@ Implements PRD requirements:
 - Suggest-next algorithm
 """
 
+import asyncio
+import base64
+import binascii
+import hashlib
+from collections.abc import Awaitable, Callable
 from datetime import date
 from datetime import date, datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_, select
+import orjson
+from sqlalchemy import Select, and_, func, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.models import InvoiceItem, Tenant
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import InvoiceItem, SubmissionJob, Tenant
 from app.models.invoice import Invoice, InvoiceStatus, InvoiceType
 from app.schemas.common import PaginationParams
 from app.schemas.invoice import InvoiceCreate, InvoiceItemCreate, InvoiceUpdate
-from app.services.fbr_service import FBRService
+from app.services.attempt_ledger import attempts_since
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.fbr_payload import serialize_payload
+from app.services.fbr_service import SUBMISSION_OUTCOME_UNKNOWN, FBRService
+from app.services.status_events import StatusEvent, record_transitions
+from app.services.validation_cache import get_validation_cache
 from app.utils.invoice_ref import (
     suggest_next_ref_no,
     validate_ref_no_format,
 )
 
+settings = get_settings()
+
 
 # =============================================================================
 # Exceptions
@@ -86,6 +102,23 @@ class ReferencedInvoiceNotFoundError(Exception):
         )
 
 
+class SubmissionDeferredError(Exception):
+    """Raised when a claimed invoice was handed to the job queue instead of sent."""
+
+    def __init__(self, invoice_id: UUID, job: SubmissionJob):
+        self.invoice_id = invoice_id
+        self.job = job
+        super().__init__(f"Submission of invoice {invoice_id} deferred to job {job.id}")
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__("Invalid pagination cursor")
+
+
 # =============================================================================
 # Query Functions
 # =============================================================================
@@ -97,6 +130,7 @@ async def get_invoice_by_id(
     invoice_id: UUID,
     *,
     with_items: bool = True,
+    with_tenant: bool = False,
 ) -> Invoice | None:
     """
     Get invoice by ID, scoped to tenant.
@@ -106,6 +140,7 @@ async def get_invoice_by_id(
         tenant_id: Tenant UUID for isolation
         invoice_id: Invoice UUID
         with_items: Whether to eagerly load items
+        with_tenant: Whether to eagerly load the tenant (needed for FBR payloads)
 
     Returns:
         Invoice or None if not found
@@ -116,11 +151,40 @@ async def get_invoice_by_id(
 
     if with_items:
         query = query.options(selectinload(Invoice.items))
+    if with_tenant:
+        query = query.options(selectinload(Invoice.tenant))
 
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
+async def get_invoice_status(
+    db: AsyncSession,
+    tenant_id: UUID,
+    invoice_id: UUID,
+) -> InvoiceStatus | None:
+    """
+    Get just the status of an invoice, scoped to tenant.
+
+    A single-column primary-key lookup for status polling; nothing else of
+    the invoice is loaded.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID for isolation
+        invoice_id: Invoice UUID
+
+    Returns:
+        InvoiceStatus or None if not found
+    """
+    result = await db.execute(
+        select(Invoice.status).where(
+            and_(Invoice.id == invoice_id, Invoice.tenant_id == tenant_id)
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def get_invoice_by_ref_no(
     db: AsyncSession,
     tenant_id: UUID,
@@ -145,6 +209,41 @@ async def get_invoice_by_ref_no(
     return result.scalar_one_or_none()
 
 
+def encode_cursor(invoice: Invoice) -> str:
+    """Opaque keyset cursor pointing just past `invoice` in newest-first order."""
+    raw = orjson.dumps([invoice.created_at.isoformat(), str(invoice.id)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, invoice_id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(invoice_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def _list_query(
+    tenant_id: UUID,
+    status_filter: InvoiceStatus | None,
+    type_filter: InvoiceType | None,
+) -> Select:
+    """A tenant's invoices with optional filters (unordered)."""
+    query = select(Invoice).where(Invoice.tenant_id == tenant_id)
+    if status_filter:
+        query = query.where(Invoice.status == status_filter)
+    if type_filter:
+        query = query.where(Invoice.invoice_type == type_filter)
+    return query
+
+
 async def list_invoices(
     db: AsyncSession,
     tenant_id: UUID,
@@ -156,6 +255,9 @@ async def list_invoices(
     """
     List invoices for a tenant with pagination and optional filters.
 
+    Pages are numbered (OFFSET/LIMIT), so deep pages scan every row before
+    them; large tenants should follow cursors (list_invoices_after) instead.
+
     Args:
         db: Database session
         tenant_id: Tenant UUID
@@ -166,24 +268,17 @@ async def list_invoices(
     Returns:
         Tuple of (invoices list, total count)
     """
-    # Base query
-    base_query = select(Invoice).where(Invoice.tenant_id == tenant_id)
-
-    # Apply filters
-    if status_filter:
-        base_query = base_query.where(Invoice.status == status_filter)
-    if type_filter:
-        base_query = base_query.where(Invoice.invoice_type == type_filter)
+    base_query = _list_query(tenant_id, status_filter, type_filter)
 
     # Count total
     count_query = select(func.count()).select_from(base_query.subquery())
     total_result = await db.execute(count_query)
     total = total_result.scalar_one()
 
-    # Get paginated results
+    # Get paginated results (id breaks created_at ties so pages never overlap)
     query = (
         base_query.options(selectinload(Invoice.items))
-        .order_by(Invoice.created_at.desc())
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
         .offset(pagination.offset)
         .limit(pagination.page_size)
     )
@@ -193,6 +288,54 @@ async def list_invoices(
     return invoices, total
 
 
+async def list_invoices_after(
+    db: AsyncSession,
+    tenant_id: UUID,
+    page_size: int,
+    cursor: str | None = None,
+    *,
+    status_filter: InvoiceStatus | None = None,
+    type_filter: InvoiceType | None = None,
+) -> tuple[list[Invoice], str | None]:
+    """
+    List a page of invoices after a keyset cursor, newest first.
+
+    Seeks on the (tenant_id, created_at DESC, id DESC) index, so every page
+    costs the same however deep it is. No total is counted.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        page_size: Invoices per page
+        cursor: next_cursor of the previous page (None or "" for the first page)
+        status_filter: Optional status filter
+        type_filter: Optional type filter
+
+    Returns:
+        Tuple of (invoices list, cursor of the next page or None on the last)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    query = _list_query(tenant_id, status_filter, type_filter)
+    if cursor:
+        created_at, invoice_id = decode_cursor(cursor)
+        query = query.where(tuple_(Invoice.created_at, Invoice.id) < tuple_(created_at, invoice_id))
+
+    # One extra row tells whether another page follows
+    result = await db.execute(
+        query.options(selectinload(Invoice.items))
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+        .limit(page_size + 1)
+    )
+    invoices = list(result.scalars().all())
+
+    if len(invoices) <= page_size:
+        return invoices, None
+    invoices = invoices[:page_size]
+    return invoices, encode_cursor(invoices[-1])
+
+
 # =============================================================================
 # Validation Functions
 # =============================================================================
@@ -220,7 +363,7 @@ async def check_ref_no_availability(
 
     Raises:
         InvoiceRefNoExistsError: If ref exists with DRAFT status
-        InvoiceRefNoBlockedError: If ref exists with SUBMITTED/UNKNOWN status
+        InvoiceRefNoBlockedError: If ref exists with QUEUED/SUBMITTED/UNKNOWN/NEEDS_REVIEW status
     """
     query = select(Invoice).where(
         and_(Invoice.invoice_ref_no == ref_no, Invoice.tenant_id == tenant_id)
@@ -233,7 +376,12 @@ async def check_ref_no_availability(
     existing = result.scalar_one_or_none()
 
     if existing:
-        if existing.status in (InvoiceStatus.SUBMITTED, InvoiceStatus.UNKNOWN):
+        if existing.status in (
+            InvoiceStatus.QUEUED,
+            InvoiceStatus.SUBMITTED,
+            InvoiceStatus.UNKNOWN,
+            InvoiceStatus.NEEDS_REVIEW,
+        ):
             raise InvoiceRefNoBlockedError(ref_no, existing.status)
         elif existing.status == InvoiceStatus.FAILED:
             # Failed can be retried, but we need a new invoice
@@ -445,7 +593,8 @@ async def submit_invoice(
     """
     Submit an invoice to FBR.
     
-    1. Verify invoice exists and is DRAFT.
+    1. Atomically claim the invoice (DRAFT -> QUEUED), so a concurrent
+       single, batch or queued submit cannot send it too.
     2. Call FBRService to submit.
     3. Update Invoice status based on outcome.
     
@@ -460,32 +609,411 @@ async def submit_invoice(
     Raises:
         InvoiceNotFoundError: If invoice not found
         InvoiceNotDraftError: If invoice is not in draft status
+        SubmissionDeferredError: If the FBR circuit is open; the invoice
+            stays QUEUED and a submission job sends it once FBR recovers
     """
-    invoice = await get_invoice_by_id(db, tenant_id, invoice_id)
-    
-    if not invoice:
-        raise InvoiceNotFoundError(invoice_id)
-        
-    if invoice.status != InvoiceStatus.DRAFT:
+    result = await db.execute(
+        update(Invoice)
+        .where(
+            and_(
+                Invoice.id == invoice_id,
+                Invoice.tenant_id == tenant_id,
+                Invoice.status == InvoiceStatus.DRAFT,
+            )
+        )
+        .values(status=InvoiceStatus.QUEUED)
+        .returning(Invoice.id)
+    )
+    if result.scalar_one_or_none() is None:
+        invoice = await get_invoice_by_id(db, tenant_id, invoice_id, with_items=False)
+        if not invoice:
+            raise InvoiceNotFoundError(invoice_id)
         raise InvoiceNotDraftError(invoice_id, invoice.status)
-        
+    await record_transitions(db, [StatusEvent(invoice_id, tenant_id, InvoiceStatus.QUEUED)])
+
+    invoice = await get_invoice_by_id(db, tenant_id, invoice_id, with_tenant=True)
+
+    try:
+        # send_to_fbr leaves the in-memory invoice current; no refresh needed
+        await send_to_fbr(db, invoice, fbr_service)
+    except CircuitOpenError as e:
+        # Nothing was sent and the claim is committed; hand it to the job queue
+        await db.rollback()
+        job = SubmissionJob(tenant_id=tenant_id, invoice_id=invoice_id)
+        db.add(job)
+        await db.commit()
+        raise SubmissionDeferredError(invoice_id, job) from e
+    
+    return invoice
+
+
+async def _crashed_submission_response(
+    invoice_id: UUID,
+    since: datetime,
+    error: Exception,
+) -> dict[str, Any]:
+    """
+    Build the response for a submission that raised instead of answering.
+
+    Once an attempt row is open the POST may have reached FBR, so the
+    invoice goes to the reconciler (UNKNOWN) unless the ledger shows FBR
+    accepted it; it only fails when nothing was sent.
+    """
+    async with async_session_maker() as db:
+        accepted, _, attempted = await attempts_since(db, invoice_id, since)
+    if accepted:
+        return {"detail": str(error)}
+    if attempted:
+        return {"error": SUBMISSION_OUTCOME_UNKNOWN, "detail": str(error)}
+    return {"error": "Submission Failed", "detail": str(error)}
+
+
+def _resulting_status(response: dict[str, Any]) -> InvoiceStatus:
+    """
+    Map an FBR submission response to the invoice status it leads to.
+
+    Failures where FBR may still have accepted the invoice leave it UNKNOWN
+    (ref stays blocked) for the reconciler; other failures mark it FAILED,
+    which provides immediate feedback.
+    """
+    if "error" not in response:
+        return InvoiceStatus.SUBMITTED
+    if response["error"] == SUBMISSION_OUTCOME_UNKNOWN:
+        return InvoiceStatus.UNKNOWN
+    return InvoiceStatus.FAILED
+
+
+async def send_to_fbr(
+    db: AsyncSession,
+    invoice: Invoice,
+    fbr_service: FBRService,
+    ensure_claim: Callable[[], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    """
+    Send a loaded invoice to FBR and record the resulting status transition.
+
+    Shared by the synchronous submit endpoint and background submission jobs.
+    The invoice must have its items and tenant loaded.
+
+    The caller's transaction is committed before the FBR call so that its
+    pooled connection is released while waiting on the gateway; the status
+    update afterwards checks a connection out again. The outcome is only
+    written while the invoice is still QUEUED, so it never overwrites a
+    status another path has settled in the meantime.
+
+    Args:
+        db: Database session
+        invoice: Invoice claimed for submission (QUEUED)
+        fbr_service: FBR service (real or mock)
+        ensure_claim: Awaited before every attempt and again before the
+            status is written; raises if the caller no longer owns the work
+
+    Returns:
+        The FBR response
+    """
+    # Release the connection for the duration of the outbound call
+    await db.commit()
+
     # Submit to FBR
-    response = await fbr_service.submit_invoice(invoice, db)
+    if ensure_claim is None:
+        response = await fbr_service.submit_invoice(invoice)
+    else:
+        response = await fbr_service.submit_invoice(invoice, ensure_claim=ensure_claim)
+        await ensure_claim()
     
     # Check outcome
-    is_success = "error" not in response
-    
-    if is_success:
-        invoice.status = InvoiceStatus.SUBMITTED
-        invoice.submitted_at = datetime.now(timezone.utc)
-    else:
-        # Mark as FAILED provides immediate feedback.
-        invoice.status = InvoiceStatus.FAILED
+    if not await settle_queued_invoice(
+        db, invoice.id, invoice.tenant_id, _resulting_status(response)
+    ):
+        await db.refresh(invoice, ["status", "submitted_at"])
     
     await db.commit()
-    await db.refresh(invoice)
-    
-    return invoice
+
+    return response
+
+
+async def settle_queued_invoice(
+    db: AsyncSession,
+    invoice_id: UUID,
+    tenant_id: UUID,
+    status: InvoiceStatus,
+) -> bool:
+    """
+    Move a still-QUEUED invoice to its final status by primary key (not committed).
+
+    Returns:
+        Whether the invoice was QUEUED and has been moved
+    """
+    values: dict[str, Any] = {"status": status}
+    if status == InvoiceStatus.SUBMITTED:
+        values["submitted_at"] = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(Invoice)
+        .where(and_(Invoice.id == invoice_id, Invoice.status == InvoiceStatus.QUEUED))
+        .values(**values)
+        .returning(Invoice.id)
+    )
+    if result.scalar_one_or_none() is None:
+        return False
+    await record_transitions(db, [StatusEvent(invoice_id, tenant_id, status)])
+    return True
+
+
+async def submit_invoices_batch(
+    db: AsyncSession,
+    tenant_id: UUID,
+    invoice_ids: list[UUID],
+    fbr_service: FBRService,
+    batch_id: UUID | None = None,
+) -> list[tuple[UUID, InvoiceStatus | None, str | None]]:
+    """
+    Submit many draft invoices to FBR concurrently.
+
+    1. Atomically claim the requested DRAFT invoices (DRAFT -> QUEUED); single
+       submits and the job queue claim the same way, so an invoice is only
+       ever sent by the path that claimed it.
+    2. Load the claimed invoices in one query with items and tenant.
+    3. Submit them under a semaphore (`submit_batch_concurrency`); the FBR
+       service records attempts through its own short-lived sessions, so no
+       connection is held while calls are in flight.
+    4. Apply the outcomes with one set-based UPDATE per resulting status
+       (SUBMITTED, FAILED, or UNKNOWN when FBR may have accepted the invoice
+       without answering; the reconciler resolves those), guarded on the
+       invoices still being QUEUED. Invoices rejected by an open FBR circuit stay QUEUED and get a
+       submission job, so they are sent once the gateway recovers.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        invoice_ids: Invoice UUIDs to submit
+        fbr_service: FBR service (real or mock)
+        batch_id: Tags the status events of this batch
+
+    Returns:
+        List of (invoice_id, resulting status or None if not found, error) in request order.
+        Deferred invoices are reported as QUEUED without an error.
+    """
+    requested = list(dict.fromkeys(invoice_ids))
+
+    # 1. Claim drafts
+    claim_result = await db.execute(
+        update(Invoice)
+        .where(
+            and_(
+                Invoice.id.in_(requested),
+                Invoice.tenant_id == tenant_id,
+                Invoice.status == InvoiceStatus.DRAFT,
+            )
+        )
+        .values(status=InvoiceStatus.QUEUED)
+        .returning(Invoice.id, func.now())
+    )
+    # now() is the claim transaction's start: every attempt of this batch is later
+    claim_rows = claim_result.all()
+    claimed_ids = {invoice_id for invoice_id, _ in claim_rows}
+    claimed_at = claim_rows[0][1] if claim_rows else None
+    await record_transitions(
+        db,
+        (StatusEvent(i, tenant_id, InvoiceStatus.QUEUED, batch_id) for i in claimed_ids),
+    )
+
+    # 2. Load claimed invoices with everything the payload needs
+    invoices: list[Invoice] = []
+    if claimed_ids:
+        result = await db.execute(
+            select(Invoice)
+            .where(Invoice.id.in_(claimed_ids))
+            .options(selectinload(Invoice.items), joinedload(Invoice.tenant))
+            .execution_options(populate_existing=True)
+        )
+        invoices = list(result.unique().scalars().all())
+
+    # Statuses of requested invoices that could not be claimed
+    unclaimed_ids = [i for i in requested if i not in claimed_ids]
+    current_status: dict[UUID, InvoiceStatus] = {}
+    if unclaimed_ids:
+        result = await db.execute(
+            select(Invoice.id, Invoice.status).where(
+                and_(Invoice.id.in_(unclaimed_ids), Invoice.tenant_id == tenant_id)
+            )
+        )
+        current_status = {row.id: row.status for row in result}
+
+    # Persist the claim and release the connection before calling FBR
+    await db.commit()
+
+    # 3. Submit concurrently
+    semaphore = asyncio.Semaphore(settings.submit_batch_concurrency)
+
+    deferred: set[UUID] = set()
+
+    async def _submit_one(invoice: Invoice) -> tuple[UUID, dict[str, Any] | None]:
+        async with semaphore:
+            try:
+                response = await fbr_service.submit_invoice(invoice)
+            except CircuitOpenError:
+                # Nothing was sent; leave the invoice QUEUED for the job queue
+                deferred.add(invoice.id)
+                return invoice.id, None
+            except Exception as e:
+                response = await _crashed_submission_response(invoice.id, claimed_at, e)
+        return invoice.id, response
+
+    gathered = await asyncio.gather(*(_submit_one(inv) for inv in invoices))
+    responses = {invoice_id: r for invoice_id, r in gathered if r is not None}
+
+    # 4. Apply outcomes set-based
+    statuses = {i: _resulting_status(r) for i, r in responses.items()}
+    by_status: dict[InvoiceStatus, list[UUID]] = {}
+    for invoice_id, status in statuses.items():
+        by_status.setdefault(status, []).append(invoice_id)
+
+    settled: list[StatusEvent] = []
+    for status, ids in by_status.items():
+        values: dict[str, Any] = {"status": status}
+        if status == InvoiceStatus.SUBMITTED:
+            values["submitted_at"] = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(Invoice)
+            .where(and_(Invoice.id.in_(ids), Invoice.status == InvoiceStatus.QUEUED))
+            .values(**values)
+            .returning(Invoice.id)
+        )
+        settled.extend(StatusEvent(i, tenant_id, status, batch_id) for i in result.scalars())
+    await record_transitions(db, settled)
+    if deferred:
+        db.add_all(
+            SubmissionJob(tenant_id=tenant_id, invoice_id=invoice_id) for invoice_id in deferred
+        )
+    await db.commit()
+
+    outcomes: list[tuple[UUID, InvoiceStatus | None, str | None]] = []
+    for invoice_id in requested:
+        if invoice_id in responses:
+            response = responses[invoice_id]
+            if "error" in response:
+                error = str(response.get("detail") or response.get("body") or response["error"])
+                outcomes.append((invoice_id, statuses[invoice_id], error))
+            else:
+                outcomes.append((invoice_id, InvoiceStatus.SUBMITTED, None))
+        elif invoice_id in deferred:
+            outcomes.append((invoice_id, InvoiceStatus.QUEUED, None))
+        elif invoice_id in current_status:
+            status = current_status[invoice_id]
+            outcomes.append(
+                (invoice_id, status, f"Invoice is not a draft (status: {status.value})")
+            )
+        else:
+            outcomes.append((invoice_id, None, f"Invoice not found: {invoice_id}"))
+
+    return outcomes
+
+
+def validation_verdict(response: dict[str, Any]) -> bool | None:
+    """
+    Whether an FBR validation response accepts the invoice.
+
+    Returns:
+        True if valid, False if FBR rejected the invoice or any item,
+        None if there was no conclusive answer (error, timeout)
+    """
+    validation = response.get("validationResponse")
+    if not isinstance(validation, dict):
+        return None
+    items = validation.get("invoiceStatuses") or []
+    if validation.get("statusCode") == "01" or any(
+        item.get("statusCode") == "01" for item in items if isinstance(item, dict)
+    ):
+        return False
+    return validation.get("statusCode") == "00"
+
+
+async def validate_invoices_batch(
+    db: AsyncSession,
+    tenant_id: UUID,
+    invoice_ids: list[UUID],
+    fbr_service: FBRService,
+) -> list[tuple[UUID, dict[str, Any] | None, str | None, bool]]:
+    """
+    Validate many draft invoices against FBR concurrently.
+
+    1. Load the requested DRAFT invoices in one query with items and tenant,
+       then release the connection.
+    2. Serialize each payload and look its SHA-256 up in the validation
+       cache; unchanged drafts reuse the earlier FBR answer.
+    3. Validate the rest under a semaphore (`validate_batch_concurrency`)
+       over the shared pooled client, caching conclusive answers.
+
+    Nothing is written: validation does not change invoice status.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        invoice_ids: Invoice UUIDs to validate
+        fbr_service: FBR service (real or mock)
+
+    Returns:
+        List of (invoice_id, FBR response or None, error, served from cache) in request order
+    """
+    requested = list(dict.fromkeys(invoice_ids))
+
+    result = await db.execute(
+        select(Invoice)
+        .where(Invoice.id.in_(requested), Invoice.tenant_id == tenant_id)
+        .options(selectinload(Invoice.items), joinedload(Invoice.tenant))
+    )
+    found = {invoice.id: invoice for invoice in result.unique().scalars().all()}
+    # Release the connection before calling FBR
+    await db.commit()
+
+    cache = get_validation_cache()
+    semaphore = asyncio.Semaphore(settings.validate_batch_concurrency)
+
+    async def _validate_one(invoice: Invoice) -> tuple[dict[str, Any] | None, str | None, bool]:
+        try:
+            payload = serialize_payload(invoice)
+        except (TypeError, ValueError) as e:
+            return None, str(e), False
+        sha256 = hashlib.sha256(payload).hexdigest()
+
+        cached = cache.get(sha256)
+        if cached is not None:
+            return cached, None, True
+
+        async with semaphore:
+            try:
+                response = await fbr_service.validate_invoice(invoice, payload)
+            except Exception as e:
+                return None, str(e), False
+
+        if validation_verdict(response) is None:
+            return response, str(response.get("error") or "No validation result from FBR"), False
+        cache.put(sha256, response)
+        return response, None, False
+
+    drafts = [found[i] for i in requested if i in found and found[i].status == InvoiceStatus.DRAFT]
+    validated = dict(
+        zip(
+            (invoice.id for invoice in drafts),
+            await asyncio.gather(*(_validate_one(invoice) for invoice in drafts)),
+            strict=True,
+        )
+    )
+
+    outcomes: list[tuple[UUID, dict[str, Any] | None, str | None, bool]] = []
+    for invoice_id in requested:
+        if invoice_id in validated:
+            response, error, cached = validated[invoice_id]
+            outcomes.append((invoice_id, response, error, cached))
+        elif invoice_id in found:
+            status = found[invoice_id].status
+            outcomes.append(
+                (invoice_id, None, f"Invoice is not a draft (status: {status.value})", False)
+            )
+        else:
+            outcomes.append((invoice_id, None, f"Invoice not found: {invoice_id}", False))
+
+    return outcomes
 
 
 # =============================================================================
@@ -0,0 +1,140 @@
+"""
+Adaptive FBR timeouts from observed latency.
+
+Keeps a rolling window of response times per FBR endpoint and derives the
+read timeout from the observed p99: a bounded multiple of what a healthy
+gateway actually needs, instead of a fixed FBR_TIMEOUT_SECONDS. Windows are
+seeded from the submission_attempts ledger at startup so a fresh process
+does not start from the static timeout.
+"""
+
+import math
+from collections import deque
+from typing import Any
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Settings, get_settings
+from app.models.submission_attempt import SubmissionAttempt
+
+logger = structlog.get_logger()
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(q / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class LatencyTracker:
+    """Rolling per-endpoint latency windows and the timeouts derived from them."""
+
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, elapsed_ms: float) -> None:
+        """Record one observed response time for an endpoint."""
+        window = self._samples.get(endpoint)
+        if window is None:
+            window = deque(maxlen=self.settings.fbr_latency_window_size)
+            self._samples[endpoint] = window
+        window.append(float(elapsed_ms))
+
+    def percentiles(self, endpoint: str) -> dict[str, float] | None:
+        """p50/p95/p99 in milliseconds, or None without enough samples."""
+        window = self._samples.get(endpoint)
+        if not window or len(window) < self.settings.fbr_latency_min_samples:
+            return None
+        ordered = sorted(window)
+        return {
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+        }
+
+    def read_timeout(self, endpoint: str) -> float:
+        """
+        Read timeout in seconds for the next call to an endpoint.
+
+        p99 times FBR_ADAPTIVE_TIMEOUT_MULTIPLIER, clamped to
+        [FBR_ADAPTIVE_TIMEOUT_MIN_SECONDS, FBR_TIMEOUT_SECONDS]. Falls back to
+        FBR_TIMEOUT_SECONDS while disabled or until the window has enough samples.
+        """
+        s = self.settings
+        ceiling = float(s.fbr_timeout_seconds)
+        if not s.fbr_adaptive_timeout_enabled:
+            return ceiling
+
+        stats = self.percentiles(endpoint)
+        if stats is None:
+            return ceiling
+
+        adaptive = stats["p99"] / 1000 * s.fbr_adaptive_timeout_multiplier
+        return min(ceiling, max(s.fbr_adaptive_timeout_min_seconds, adaptive))
+
+    async def seed_from_ledger(self, db: AsyncSession) -> int:
+        """
+        Fill the windows with the most recent latencies from submission_attempts.
+
+        Returns:
+            Number of samples loaded
+        """
+        size = self.settings.fbr_latency_window_size
+        recent = (
+            select(
+                SubmissionAttempt.endpoint,
+                SubmissionAttempt.response_time_ms,
+                SubmissionAttempt.attempted_at,
+                func.row_number()
+                .over(
+                    partition_by=SubmissionAttempt.endpoint,
+                    order_by=SubmissionAttempt.attempted_at.desc(),
+                )
+                .label("rn"),
+            )
+            .where(SubmissionAttempt.response_time_ms.is_not(None))
+            .subquery()
+        )
+        result = await db.execute(
+            select(recent.c.endpoint, recent.c.response_time_ms)
+            .where(recent.c.rn <= size)
+            .order_by(recent.c.endpoint, recent.c.attempted_at)
+        )
+
+        loaded = 0
+        for endpoint, elapsed_ms in result:
+            self.record(endpoint, elapsed_ms)
+            loaded += 1
+        return loaded
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-endpoint latency percentiles and current read timeouts for metrics."""
+        endpoints = {}
+        for endpoint, window in self._samples.items():
+            stats = self.percentiles(endpoint)
+            endpoints[endpoint] = {
+                "samples": len(window),
+                "p50_ms": stats["p50"] if stats else None,
+                "p95_ms": stats["p95"] if stats else None,
+                "p99_ms": stats["p99"] if stats else None,
+                "read_timeout_seconds": round(self.read_timeout(endpoint), 3),
+            }
+        return {
+            "adaptive": self.settings.fbr_adaptive_timeout_enabled,
+            "default_timeout_seconds": float(self.settings.fbr_timeout_seconds),
+            "endpoints": endpoints,
+        }
+
+
+_latency_tracker: LatencyTracker | None = None
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide FBR latency tracker."""
+    global _latency_tracker
+    if _latency_tracker is None:
+        _latency_tracker = LatencyTracker()
+    return _latency_tracker
@@ -0,0 +1,226 @@
+"""
+Standalone mock FBR/IRIS gateway.
+
+An ASGI app that speaks the DI API over real HTTP, so the real FBRService
+(connection pool, adaptive timeouts, retries, circuit breaker, rate
+limiter) can be exercised end to end without network access or IP
+whitelisting:
+
+    python -m app.services.mock_fbr_gateway --port 8900 --median-ms 150 --p99-ms 1500
+    # or: uvicorn app.services.mock_fbr_gateway:app --port 8900  (MOCK_FBR_* env vars)
+
+Point the API at it with USE_MOCK_FBR=false and
+FBR_SANDBOX_URL=http://127.0.0.1:8900/di_data/v1/di/postinvoicedata_sb
+(and FBR_SANDBOX_INVOICE_DETAIL_URL=.../validateinvoicedata_sb).
+
+Each request waits a latency drawn from the profile, then may be answered
+with an injected fault (timeout, 429, 5xx) at the profile's rates.
+Otherwise the answer follows the invoice's scenarioId (SCENARIO_BEHAVIORS
+in mock_fbr_service) and defaults to a valid IRIS response. A request
+without a bearer token gets 401 with IRIS error 0401.
+
+Admin endpoints: GET /__mock/stats, PUT /__mock/profile, POST /__mock/reset.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
+
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.services.mock_fbr_service import (
+    SCENARIO_BEHAVIORS,
+    MockBehavior,
+    iris_error_response,
+    mock_gateway_response,
+)
+
+# z-score of the 99th percentile of a standard normal
+_Z99 = 2.3263
+
+_OPERATIONS = {
+    "postinvoicedata",
+    "postinvoicedata_sb",
+    "validateinvoicedata",
+    "validateinvoicedata_sb",
+}
+
+
+class GatewayProfile(BaseSettings):
+    """Latency distribution and fault injection rates (env prefix MOCK_FBR_)."""
+
+    model_config = SettingsConfigDict(env_prefix="MOCK_FBR_", extra="ignore")
+
+    latency: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    latency_median_ms: float = Field(default=150.0, ge=0)
+    latency_p99_ms: float = Field(
+        default=1200.0, ge=0, description="lognormal tail; uniform draws from [0, 2 x median]"
+    )
+    timeout_rate: float = Field(default=0.0, ge=0, le=1, description="Requests left hanging")
+    timeout_hang_seconds: float = Field(default=120.0, ge=0, description="How long a hung request hangs")
+    rate_limit_rate: float = Field(default=0.0, ge=0, le=1, description="Requests answered 429")
+    retry_after_seconds: int = Field(default=1, ge=0)
+    server_error_rate: float = Field(default=0.0, ge=0, le=1, description="Requests answered 500/502/503")
+    seed: int | None = None
+
+
+class MockGateway:
+    """Request handling and counters behind the ASGI app."""
+
+    def __init__(
+        self,
+        profile: GatewayProfile | None = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.sleep = sleep
+        self.configure(profile or GatewayProfile())
+
+    def configure(self, profile: GatewayProfile) -> None:
+        """Switch to a new profile and reset the counters."""
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.outcomes: Counter[str] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def latency_seconds(self) -> float:
+        """Draw one response latency from the profile."""
+        profile = self.profile
+        if profile.latency == "fixed" or profile.latency_median_ms <= 0:
+            ms = profile.latency_median_ms
+        elif profile.latency == "uniform":
+            ms = self.rng.uniform(0, 2 * profile.latency_median_ms)
+        else:
+            mu = math.log(profile.latency_median_ms)
+            tail = max(profile.latency_p99_ms, profile.latency_median_ms)
+            ms = self.rng.lognormvariate(mu, (math.log(tail) - mu) / _Z99)
+        return ms / 1000
+
+    def _fault(self) -> MockBehavior | None:
+        """Injected fault for this request, if any."""
+        draw = self.rng.random()
+        for behavior, rate in (
+            (MockBehavior.TIMEOUT, self.profile.timeout_rate),
+            (MockBehavior.RATE_LIMITED, self.profile.rate_limit_rate),
+            (MockBehavior.SERVER_ERROR, self.profile.server_error_rate),
+        ):
+            if draw < rate:
+                return behavior
+            draw -= rate
+        return None
+
+    async def handle(self, authorization: str | None, body: bytes) -> Response:
+        """Answer one DI API request."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.sleep(self.latency_seconds())
+            behavior, response = self._answer(authorization, body)
+            if behavior == MockBehavior.TIMEOUT:
+                # Hold the request past any sane client timeout
+                await self.sleep(self.profile.timeout_hang_seconds)
+                response = JSONResponse(status_code=504, content={"error": "Gateway Timeout"})
+            self.outcomes[behavior.value] += 1
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def _answer(self, authorization: str | None, body: bytes) -> tuple[MockBehavior, Response]:
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            behavior = MockBehavior.AUTH_ERROR
+            status_code, content = mock_gateway_response(behavior, "", 0)
+            return behavior, JSONResponse(status_code=status_code, content=content)
+
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return MockBehavior.VALIDATION_ERROR, JSONResponse(
+                status_code=400, content=iris_error_response("0001", "Invalid JSON")
+            )
+        if not isinstance(payload, dict):
+            payload = {}
+
+        behavior = self._fault() or SCENARIO_BEHAVIORS.get(payload.get("scenarioId"), MockBehavior.SUCCESS)
+        status_code, content = mock_gateway_response(
+            behavior,
+            str(payload.get("sellerNTNCNIC") or ""),
+            len(payload.get("items") or []),
+        )
+        headers = {}
+        if behavior == MockBehavior.RATE_LIMITED:
+            headers["Retry-After"] = str(self.profile.retry_after_seconds)
+        return behavior, JSONResponse(status_code=status_code, content=content, headers=headers)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters since the last reset."""
+        return {
+            "requests": sum(self.outcomes.values()),
+            "outcomes": dict(self.outcomes),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "profile": self.profile.model_dump(),
+        }
+
+
+def create_app(
+    profile: GatewayProfile | None = None,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> FastAPI:
+    """Build the mock gateway ASGI app."""
+    gateway = MockGateway(profile, sleep=sleep)
+    mock_app = FastAPI(title="Mock FBR Gateway", docs_url=None, redoc_url=None)
+    mock_app.state.gateway = gateway
+
+    @mock_app.post("/di_data/v1/di/{operation}")
+    async def di_api(operation: str, request: Request) -> Response:
+        if operation not in _OPERATIONS:
+            return JSONResponse(status_code=404, content={"error": f"Unknown operation: {operation}"})
+        return await gateway.handle(request.headers.get("Authorization"), await request.body())
+
+    @mock_app.get("/__mock/stats")
+    async def stats() -> dict[str, Any]:
+        return gateway.stats()
+
+    @mock_app.put("/__mock/profile")
+    async def configure(profile: GatewayProfile) -> dict[str, Any]:
+        gateway.configure(profile)
+        return gateway.stats()
+
+    @mock_app.post("/__mock/reset")
+    async def reset() -> dict[str, Any]:
+        gateway.configure(gateway.profile)
+        return gateway.stats()
+
+    return mock_app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock FBR/IRIS gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--median-ms", type=float, dest="latency_median_ms")
+    parser.add_argument("--p99-ms", type=float, dest="latency_p99_ms")
+    parser.add_argument("--timeout-rate", type=float)
+    parser.add_argument("--rate-limit-rate", type=float)
+    parser.add_argument("--server-error-rate", type=float)
+    parser.add_argument("--seed", type=int)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    overrides = {key: value for key, value in args.items() if value is not None}
+    uvicorn.run(create_app(GatewayProfile(**overrides)), host=host, port=port, log_level="warning")
@@ -12,30 +12,181 @@ Industry Best Practice:
 - Predictable responses
 """
 
+import enum
+import time
 import uuid
-from datetime import datetime
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
 from typing import Any
 
+import orjson
 import structlog
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import async_session_maker
 from app.models.invoice import Invoice
 from app.models.submission_attempt import SubmissionAttempt, SubmissionOutcome
+from app.services.fbr_service import SUBMISSION_OUTCOME_UNKNOWN, SUBMISSION_REJECTED
 
 logger = structlog.get_logger()
 
 
+class MockBehavior(str, enum.Enum):
+    """How the mock gateway answers a submission."""
+
+    SUCCESS = "success"
+    VALIDATION_ERROR = "validation_error"
+    AUTH_ERROR = "auth_error"
+    TIMEOUT = "timeout"
+    RATE_LIMITED = "rate_limited"
+    SERVER_ERROR = "server_error"
+
+
+# Scenario IDs that force a behavior regardless of configuration
+SCENARIO_BEHAVIORS: dict[str, MockBehavior] = {
+    "ERROR_TEST": MockBehavior.VALIDATION_ERROR,
+    "AUTH_ERROR_TEST": MockBehavior.AUTH_ERROR,
+    "TIMEOUT_TEST": MockBehavior.TIMEOUT,
+    "RATE_LIMIT_TEST": MockBehavior.RATE_LIMITED,
+    "SERVER_ERROR_TEST": MockBehavior.SERVER_ERROR,
+}
+
+_BEHAVIOR_OUTCOMES: dict[MockBehavior, SubmissionOutcome] = {
+    MockBehavior.SUCCESS: SubmissionOutcome.SUCCESS,
+    MockBehavior.VALIDATION_ERROR: SubmissionOutcome.VALIDATION_ERROR,
+    MockBehavior.AUTH_ERROR: SubmissionOutcome.VALIDATION_ERROR,
+    MockBehavior.TIMEOUT: SubmissionOutcome.TIMEOUT,
+    MockBehavior.RATE_LIMITED: SubmissionOutcome.NETWORK_ERROR,
+    MockBehavior.SERVER_ERROR: SubmissionOutcome.NETWORK_ERROR,
+}
+
+
+def _dated() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def iris_valid_response(seller_ntn: str, item_count: int) -> dict[str, Any]:
+    """IRIS "Valid" response with an FBR invoice number per item (Section 4.1.3)."""
+    invoice_number = f"{seller_ntn or '0000000'}DI{time.time_ns() // 1_000_000}{uuid.uuid4().int % 1000:03d}"
+    return {
+        "invoiceNumber": invoice_number,
+        "dated": _dated(),
+        "validationResponse": {
+            "statusCode": "00",
+            "status": "Valid",
+            "error": "",
+            "invoiceStatuses": [
+                {
+                    "itemSNo": str(n),
+                    "statusCode": "00",
+                    "status": "Valid",
+                    "invoiceNo": f"{invoice_number}-{n}",
+                    "errorCode": "",
+                    "error": "",
+                }
+                for n in range(1, item_count + 1)
+            ],
+        },
+    }
+
+
+def iris_error_response(error_code: str, error: str) -> dict[str, Any]:
+    """IRIS "Invalid" response for the whole invoice (Section 4.1.4)."""
+    return {
+        "dated": _dated(),
+        "validationResponse": {
+            "statusCode": "01",
+            "status": "Invalid",
+            "errorCode": error_code,
+            "error": error,
+            "invoiceStatuses": None,
+        },
+    }
+
+
+def mock_gateway_response(
+    behavior: MockBehavior,
+    seller_ntn: str,
+    item_count: int,
+) -> tuple[int, dict[str, Any]]:
+    """
+    HTTP status and IRIS body the gateway answers with for a behavior.
+
+    Shared by the in-process mock and the mock gateway server. TIMEOUT has
+    no answer; an empty body is returned for it.
+    """
+    if behavior == MockBehavior.SUCCESS:
+        return 200, iris_valid_response(seller_ntn, item_count)
+    if behavior == MockBehavior.VALIDATION_ERROR:
+        return 200, iris_error_response("0052", "Provide proper HS Code with invoice no. null")
+    if behavior == MockBehavior.AUTH_ERROR:
+        return 401, iris_error_response("0401", "Unauthorized: provide a valid security token")
+    if behavior == MockBehavior.RATE_LIMITED:
+        return 429, {"error": "Too Many Requests"}
+    if behavior == MockBehavior.SERVER_ERROR:
+        return 503, {"error": "Service Unavailable"}
+    return 0, {}
+
+
 class MockFBRService:
     """Mock implementation of FBR service for development/testing."""
 
-    def __init__(self):
-        """Initialize mock service."""
+    def __init__(self, record_attempts: bool = False, behavior: MockBehavior = MockBehavior.SUCCESS):
+        """
+        Initialize mock service.
+
+        Args:
+            record_attempts: Write simulated attempts to the submission ledger
+                (through short-lived sessions, like the real service).
+            behavior: How submissions are answered until reconfigured
+        """
+        self.record_attempts = record_attempts
+        self.behavior = behavior
+        self.call_history: list[dict[str, Any]] = []
+        self._call_count = 0
         logger.info("mock_fbr_service_initialized", mode="DEVELOPMENT")
 
+    @property
+    def call_count(self) -> int:
+        """Number of submissions made."""
+        return self._call_count
+
+    def configure(self, behavior: MockBehavior) -> None:
+        """Answer subsequent submissions with this behavior."""
+        self.behavior = behavior
+
+    def reset(self) -> None:
+        """Back to SUCCESS with no recorded calls."""
+        self.behavior = MockBehavior.SUCCESS
+        self.call_history.clear()
+        self._call_count = 0
+
+    def was_called(self) -> bool:
+        """Whether any submission was made."""
+        return self._call_count > 0
+
+    def get_last_call(self) -> dict[str, Any] | None:
+        """The most recent submission, or None."""
+        return self.call_history[-1] if self.call_history else None
+
+    def behavior_for(self, scenario_id: Any) -> MockBehavior:
+        """Behavior for an invoice: forced by its scenario ID, else the configured one."""
+        if isinstance(scenario_id, str) and scenario_id in SCENARIO_BEHAVIORS:
+            return SCENARIO_BEHAVIORS[scenario_id]
+        return self.behavior
+
     async def close(self):
         """Close method for compatibility (no-op for mock)."""
         pass
 
+    async def _record(self, attempt: SubmissionAttempt) -> None:
+        """Write a simulated attempt to the ledger if enabled."""
+        if not self.record_attempts:
+            return
+        async with async_session_maker() as db:
+            db.add(attempt)
+            await db.commit()
+
     def _build_payload(self, invoice: Invoice) -> dict[str, Any]:
         """
         Build FBR payload (same as real service).
@@ -79,88 +230,92 @@ class MockFBRService:
 
         return payload
 
-    async def submit_invoice(self, invoice: Invoice, db: Session) -> dict[str, Any]:
+    async def submit_invoice(
+        self,
+        invoice: Invoice,
+        db: AsyncSession | None = None,
+        ensure_claim: Callable[[], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
         """
         Mock invoice submission.
-        
-        Returns realistic FBR responses based on invoice data.
-        Simulates different scenarios for testing.
+
+        Returns what FBRService.submit_invoice would return for the same
+        gateway answer. The behavior is the configured one, unless the
+        invoice's scenario ID selects another (see SCENARIO_BEHAVIORS).
+
+        `db` is unused and only accepted for older callers; attempts are
+        recorded in their own session when `record_attempts` is set.
+        `ensure_claim` is awaited before the (single) attempt, as in
+        FBRService.submit_invoice.
         """
+        if ensure_claim is not None:
+            await ensure_claim()
+
+        started = time.monotonic()
         payload = self._build_payload(invoice)
-        
+        behavior = self.behavior_for(invoice.scenario_id)
+
+        self._call_count += 1
+        self.call_history.append(
+            {
+                "call_number": self._call_count,
+                "method": "submit_invoice",
+                "invoice_id": str(invoice.id),
+                "invoice_ref_no": invoice.invoice_ref_no,
+                "behavior": behavior.value,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
         logger.info(
             "mock_fbr_submission",
             ref_no=invoice.invoice_ref_no,
             scenario=invoice.scenario_id,
-            mode="MOCK"
+            behavior=behavior.value,
+            mode="MOCK",
         )
 
-        print(f"\n[MOCK] Simulating FBR submission for {invoice.invoice_ref_no}")
-        print(f"[MOCK] Scenario: {invoice.scenario_id}")
-        print(f"[MOCK] Payload constructed: {len(payload)} fields")
+        http_status, body = mock_gateway_response(
+            behavior, payload.get("SellerNTN") or "", len(payload["Items"])
+        )
 
-        # Create submission attempt record
         attempt_id = uuid.uuid4()
         attempt = SubmissionAttempt(
             id=attempt_id,
             invoice_id=invoice.id,
             attempt_number=1,
             endpoint="MOCK_FBR_ENDPOINT",
-            outcome=SubmissionOutcome.SUCCESS,
+            outcome=_BEHAVIOR_OUTCOMES[behavior],
             diagnostic_id=attempt_id.hex[:8],
-            http_status=200,
-            response_summary="Mock successful submission",
-            response_time_ms=150,  # Simulated response time
+            http_status=http_status,
+            response_summary=orjson.dumps(body).decode()[:1000] if body else "Simulated timeout",
+            response_time_ms=int((time.monotonic() - started) * 1000),
         )
-        db.add(attempt)
-        await db.commit()
-
-        # Simulate different responses based on scenario
-        # This allows testing various FBR response scenarios
-        
-        # Success response (most common)
-        mock_response = {
-            "Code": 100,
-            "Message": "Invoice submitted successfully",
-            "InvoiceNumber": invoice.invoice_ref_no,
-            "USIN": invoice.invoice_ref_no,
-            "FBRInvoiceNumber": f"FBR-{uuid.uuid4().hex[:12].upper()}",
-            "Timestamp": datetime.utcnow().isoformat(),
-            "Status": "Accepted",
-        }
+        await self._record(attempt)
 
-        # Simulate validation errors for specific test scenarios
-        if invoice.scenario_id == "ERROR_TEST":
-            mock_response = {
-                "Code": 400,
-                "Message": "Validation Error",
-                "Errors": [
-                    {"Field": "BuyerNTN", "Error": "Invalid NTN format"}
-                ]
-            }
-        elif invoice.scenario_id == "TIMEOUT_TEST":
-            # Simulate timeout scenario
-            attempt.outcome = SubmissionOutcome.TIMEOUT
-            attempt.response_summary = "Simulated timeout"
-            await db.commit()
-            return {"error": "Timeout", "detail": "Simulated timeout for testing"}
+        if behavior == MockBehavior.TIMEOUT:
+            return {"error": SUBMISSION_OUTCOME_UNKNOWN, "detail": "Simulated timeout for testing"}
+        if http_status != 200:
+            return {"error": f"HTTP {http_status}", **body}
+        if behavior == MockBehavior.VALIDATION_ERROR:
+            return {"error": SUBMISSION_REJECTED, **body}
 
-        logger.info(
-            "mock_fbr_response",
-            ref_no=invoice.invoice_ref_no,
-            code=mock_response.get("Code"),
-            status=mock_response.get("Status")
-        )
-
-        return mock_response
+        logger.info("mock_fbr_response", ref_no=invoice.invoice_ref_no, invoice_number=body["invoiceNumber"])
+        return body
 
-    async def validate_invoice(self, invoice: Invoice, db: Session) -> dict[str, Any]:
+    async def validate_invoice(
+        self,
+        invoice: Invoice,
+        payload: bytes | None = None,
+        db: AsyncSession | None = None,
+    ) -> dict[str, Any]:
         """
         Mock invoice validation.
         
-        Simulates FBR validation endpoint response.
+        Simulates FBR validation endpoint response. `payload` (a frozen
+        body, as passed during reconciliation) is accepted for parity with
+        FBRService and ignored.
         """
-        payload = self._build_payload(invoice)
         
         logger.info(
             "mock_fbr_validation",
@@ -168,11 +323,9 @@ class MockFBRService:
             mode="MOCK"
         )
 
-        print(f"\n[MOCK] Simulating FBR validation for {invoice.invoice_ref_no}")
-
         # Mock validation response
         mock_response = {
-            "dated": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            "dated": _dated(),
             "validationResponse": {
                 "statusCode": "00",
                 "status": "Valid",
@@ -0,0 +1,176 @@
+"""
+Token-bucket rate limiting for outbound FBR calls.
+
+A global bucket caps total traffic to the gateway and per-tenant buckets keep
+one busy tenant from starving the others. Callers wait asynchronously for a
+token instead of failing.
+
+Buckets use reservation semantics: taking a token always succeeds but may
+drive the balance negative, and the caller sleeps until its reserved token
+has been refilled. This keeps callers in FIFO order and lets the bucket state
+be updated with a single atomic operation, which is what makes the
+Postgres coordinator safe across uvicorn workers and nodes.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import Settings, get_settings
+from app.database import async_session_maker
+from app.models.rate_limit_bucket import RateLimitBucket
+
+logger = structlog.get_logger()
+
+GLOBAL_BUCKET = "global"
+
+
+class MemoryCoordinator:
+    """Bucket state held in this process (single worker or tests)."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def _refilled(self, key: str, rate: float, capacity: float) -> float:
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - updated) * rate)
+
+    async def reserve(self, key: str, rate: float, capacity: float) -> float:
+        """Take one token and return the balance after taking it."""
+        tokens = self._refilled(key, rate, capacity) - 1
+        self._buckets[key] = (tokens, self._clock())
+        return tokens
+
+    async def peek(self, key: str, rate: float, capacity: float) -> float:
+        """Return the current balance without taking a token."""
+        return self._refilled(key, rate, capacity)
+
+
+class PostgresCoordinator:
+    """
+    Bucket state shared through the fbr_rate_buckets table.
+
+    Each reservation is one INSERT ... ON CONFLICT DO UPDATE ... RETURNING,
+    so the refill and take happen atomically under the row lock, using the
+    database clock so that all workers agree on elapsed time.
+    """
+
+    async def reserve(self, key: str, rate: float, capacity: float) -> float:
+        """Take one token and return the balance after taking it."""
+        table = RateLimitBucket.__table__
+        elapsed = func.extract("epoch", func.clock_timestamp() - table.c.updated_at)
+        stmt = (
+            insert(table)
+            .values(key=key, tokens=capacity - 1, updated_at=func.clock_timestamp())
+            .on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={
+                    "tokens": func.least(capacity, table.c.tokens + elapsed * rate) - 1,
+                    "updated_at": func.clock_timestamp(),
+                },
+            )
+            .returning(table.c.tokens)
+        )
+        async with async_session_maker() as db:
+            result = await db.execute(stmt)
+            tokens = result.scalar_one()
+            await db.commit()
+        return float(tokens)
+
+    async def peek(self, key: str, rate: float, capacity: float) -> float:
+        """Return the current balance without taking a token."""
+        table = RateLimitBucket.__table__
+        elapsed = func.extract("epoch", func.clock_timestamp() - table.c.updated_at)
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(func.least(capacity, table.c.tokens + elapsed * rate)).where(
+                    table.c.key == key
+                )
+            )
+            tokens = result.scalar_one_or_none()
+        return capacity if tokens is None else float(tokens)
+
+
+class FBRRateLimiter:
+    """Global plus per-tenant token buckets in front of FBR calls."""
+
+    def __init__(
+        self,
+        coordinator: MemoryCoordinator | PostgresCoordinator | None = None,
+        settings: Settings | None = None,
+    ):
+        self.settings = settings or get_settings()
+        if coordinator is None:
+            if self.settings.fbr_rate_limit_backend == "postgres":
+                coordinator = PostgresCoordinator()
+            else:
+                coordinator = MemoryCoordinator()
+        self.coordinator = coordinator
+
+    def _buckets(self, tenant_id: str | None) -> list[tuple[str, float, float]]:
+        s = self.settings
+        buckets = [(GLOBAL_BUCKET, s.fbr_global_rate_per_second, float(s.fbr_global_burst))]
+        if tenant_id:
+            buckets.append(
+                (f"tenant:{tenant_id}", s.fbr_tenant_rate_per_second, float(s.fbr_tenant_burst))
+            )
+        return buckets
+
+    async def acquire(self, tenant_id: str | None = None) -> float:
+        """
+        Wait until a call to FBR is allowed.
+
+        Args:
+            tenant_id: Tenant making the call (None for global-only)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.settings.fbr_rate_limit_enabled:
+            return 0.0
+
+        wait = 0.0
+        for key, rate, capacity in self._buckets(tenant_id):
+            tokens = await self.coordinator.reserve(key, rate, capacity)
+            if tokens < 0:
+                wait = max(wait, -tokens / rate)
+
+        if wait > 0:
+            logger.info("fbr_rate_limited", tenant_id=tenant_id, wait_seconds=round(wait, 3))
+            await asyncio.sleep(wait)
+
+        return wait
+
+    async def wait_time(self, tenant_id: str | None = None) -> float:
+        """
+        Seconds until a call would be allowed, without taking a token.
+
+        Queue schedulers use this to hold off claiming work while the
+        gateway budget is exhausted.
+        """
+        if not self.settings.fbr_rate_limit_enabled:
+            return 0.0
+
+        wait = 0.0
+        for key, rate, capacity in self._buckets(tenant_id):
+            tokens = await self.coordinator.peek(key, rate, capacity)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+        return wait
+
+
+_rate_limiter: FBRRateLimiter | None = None
+
+
+def get_rate_limiter() -> FBRRateLimiter:
+    """Get the process-wide FBR rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = FBRRateLimiter()
+    return _rate_limiter
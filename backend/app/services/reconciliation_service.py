@@ -0,0 +1,580 @@
+"""
+Reconciliation of UNKNOWN invoices.
+
+An invoice is UNKNOWN when an attempt may have reached FBR without an answer
+(a read timeout or dropped connection), or when its submission job was given
+up mid-flight. The sweeper resolves them in bulk, one chunk at a time:
+
+1. Claim a chunk of UNKNOWN invoices with FOR UPDATE SKIP LOCKED, skipping
+   any with an attempt inside the cool-down window, and write one
+   write-ahead reconciliation attempt per invoice in the same short
+   transaction. The new attempt also keeps concurrent sweepers off the
+   invoice for the cool-down. Invoices already probed
+   RECONCILIATION_MAX_ATTEMPTS times move to NEEDS_REVIEW instead.
+2. Send each invoice's frozen payload to the FBR validation endpoint under a
+   semaphore. No database connection is held while calls are in flight.
+3. Apply the verdicts with one set-based UPDATE per resulting status and
+   close the attempts in one executemany UPDATE.
+
+IRIS has no lookup by our invoiceRefNo, so the validation endpoint is the
+probe. It only validates the payload, so a valid answer is not proof that
+the invoice is on record; the FBR invoice number in it may be an echo. Only
+a lookup is evidence of SUBMITTED: today that is our own ledger, where an
+attempt FBR accepted (e.g. one whose job was abandoned afterwards) resolves
+the invoice without probing. A definitive rejection means the original post
+could not have been accepted either (FAILED). A valid answer cannot change
+on a later probe of the same frozen payload, so it moves the invoice to
+NEEDS_REVIEW at once; anything else (errors, timeouts) leaves it UNKNOWN
+until a later sweep or the attempt cap. NEEDS_REVIEW invoices are never
+probed again and are logged for follow-up.
+
+Crash recovery runs ahead of each sweep (and once at startup). A process
+that dies mid-submission leaves its write-ahead attempt UNKNOWN and the
+invoice DRAFT or QUEUED with nobody working on it. Recovery finds those
+invoices through the (outcome, attempted_at) index and hands them on.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import orjson
+import structlog
+from sqlalchemy import bindparam, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.submission_attempt import SubmissionAttempt, SubmissionOutcome
+from app.models.submission_job import SubmissionJob, SubmissionJobStatus
+from app.services.attempt_ledger import load_payloads
+from app.services.fbr_service import FBRService
+from app.services.status_events import StatusEvent, record_transitions
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+_attempts = SubmissionAttempt.__table__
+
+# Attempt outcome recorded for each reconciliation verdict
+_VERDICT_OUTCOMES: dict[InvoiceStatus | None, SubmissionOutcome] = {
+    InvoiceStatus.SUBMITTED: SubmissionOutcome.SUCCESS,
+    InvoiceStatus.FAILED: SubmissionOutcome.VALIDATION_ERROR,
+    InvoiceStatus.NEEDS_REVIEW: SubmissionOutcome.UNKNOWN,
+    None: SubmissionOutcome.UNKNOWN,
+}
+
+# Cumulative sweep counts of this process, for metrics
+_totals = {"claimed": 0, "submitted": 0, "failed": 0, "needs_review": 0, "unresolved": 0}
+
+
+# Outcomes after which FBR may or may not have the invoice
+_AMBIGUOUS_OUTCOMES = (SubmissionOutcome.UNKNOWN, SubmissionOutcome.TIMEOUT)
+
+
+def _cooldown_cutoff(cooldown_seconds: int | None) -> datetime:
+    if cooldown_seconds is None:
+        cooldown_seconds = settings.reconciliation_cooldown_seconds
+    return datetime.now(timezone.utc) - timedelta(seconds=cooldown_seconds)
+
+
+def reconciliation_endpoint() -> str:
+    """Endpoint recorded on reconciliation attempts."""
+    return settings.fbr_sandbox_invoice_detail_url or "MOCK_FBR_VALIDATION_ENDPOINT"
+
+
+def snapshot() -> dict[str, int]:
+    """Reconciliation counts of this process since it started, for metrics."""
+    return dict(_totals)
+
+
+def classify_reconciliation(response: dict[str, Any], lookup: bool = False) -> InvoiceStatus | None:
+    """
+    Decide what a probe response says about an UNKNOWN invoice.
+
+    Args:
+        response: Response from FBRService.validate_invoice, or from a lookup
+        lookup: Whether the response comes from a lookup of the invoice on
+            record. A validation answer only says the payload is valid, so it
+            never resolves SUBMITTED.
+
+    Returns:
+        SUBMITTED if a lookup finds the invoice on record, FAILED if FBR
+        rejects the payload, or None if the response is inconclusive
+    """
+    validation = response.get("validationResponse")
+    if not isinstance(validation, dict):
+        # Transport errors, circuit open, unparseable bodies
+        return None
+
+    items = validation.get("invoiceStatuses") or []
+    rejected = validation.get("statusCode") == "01" or any(
+        item.get("statusCode") == "01" for item in items if isinstance(item, dict)
+    )
+    if rejected:
+        return InvoiceStatus.FAILED
+
+    if validation.get("statusCode") != "00":
+        return None
+
+    invoice_number = (
+        response.get("invoiceNumber")
+        or validation.get("InvoiceNumber")
+        or next((item.get("invoiceNo") for item in items if isinstance(item, dict) and item.get("invoiceNo")), None)
+    )
+    return InvoiceStatus.SUBMITTED if lookup and invoice_number else None
+
+
+async def claim_unknown_invoices(
+    db: AsyncSession,
+    limit: int,
+    attempted_before: datetime,
+    max_attempts: int | None = None,
+) -> tuple[dict[UUID, tuple[UUID, str | None]], list[UUID]]:
+    """
+    Lock a chunk of UNKNOWN invoices and open a reconciliation attempt for each.
+
+    Invoices that have used up their reconciliation attempts are moved to
+    NEEDS_REVIEW in the same transaction instead of being probed again.
+    Commits before returning, so the row locks are held only for the claim.
+
+    Args:
+        db: Database session
+        limit: Maximum invoices to claim
+        attempted_before: Skip invoices with any attempt after this time
+        max_attempts: Probes per invoice (default: RECONCILIATION_MAX_ATTEMPTS)
+
+    Returns:
+        Tuple of (mapping of invoice id to (reconciliation attempt id, frozen
+        payload SHA-256 or None), ids of invoices moved to NEEDS_REVIEW)
+    """
+    if max_attempts is None:
+        max_attempts = settings.reconciliation_max_attempts
+    recent_attempt = (
+        select(SubmissionAttempt.id)
+        .where(
+            SubmissionAttempt.invoice_id == Invoice.id,
+            SubmissionAttempt.attempted_at > attempted_before,
+        )
+        .exists()
+    )
+    result = await db.execute(
+        select(Invoice.id, Invoice.tenant_id)
+        .where(Invoice.status == InvoiceStatus.UNKNOWN, ~recent_attempt)
+        .order_by(Invoice.updated_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=Invoice)
+    )
+    tenants: dict[UUID, UUID] = dict(result.all())
+    if not tenants:
+        await db.commit()
+        return {}, []
+
+    endpoint = reconciliation_endpoint()
+    result = await db.execute(
+        select(SubmissionAttempt.invoice_id, func.count(SubmissionAttempt.id))
+        .where(
+            SubmissionAttempt.invoice_id.in_(tenants),
+            SubmissionAttempt.endpoint == endpoint,
+        )
+        .group_by(SubmissionAttempt.invoice_id)
+    )
+    exhausted = [invoice_id for invoice_id, probes in result if probes >= max_attempts]
+    if exhausted:
+        await db.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(exhausted))
+            .values(status=InvoiceStatus.NEEDS_REVIEW)
+        )
+        await record_transitions(
+            db,
+            (StatusEvent(i, tenants[i], InvoiceStatus.NEEDS_REVIEW) for i in exhausted),
+        )
+    invoice_ids = [invoice_id for invoice_id in tenants if invoice_id not in exhausted]
+    if not invoice_ids:
+        await db.commit()
+        return {}, exhausted
+
+    result = await db.execute(
+        select(SubmissionAttempt.invoice_id, func.max(SubmissionAttempt.attempt_number))
+        .where(SubmissionAttempt.invoice_id.in_(invoice_ids))
+        .group_by(SubmissionAttempt.invoice_id)
+    )
+    last_numbers: dict[UUID, int] = dict(result.all())
+
+    # Latest frozen body per invoice (DISTINCT ON)
+    result = await db.execute(
+        select(SubmissionAttempt.invoice_id, SubmissionAttempt.payload_sha256)
+        .where(
+            SubmissionAttempt.invoice_id.in_(invoice_ids),
+            SubmissionAttempt.payload_sha256.is_not(None),
+        )
+        .distinct(SubmissionAttempt.invoice_id)
+        .order_by(SubmissionAttempt.invoice_id, SubmissionAttempt.attempted_at.desc())
+    )
+    snapshots: dict[UUID, str] = dict(result.all())
+
+    claims: dict[UUID, tuple[UUID, str | None]] = {}
+    rows = []
+    for invoice_id in invoice_ids:
+        attempt_id = uuid.uuid4()
+        claims[invoice_id] = (attempt_id, snapshots.get(invoice_id))
+        rows.append(
+            {
+                "id": attempt_id,
+                "invoice_id": invoice_id,
+                "attempt_number": last_numbers.get(invoice_id, 0) + 1,
+                "endpoint": endpoint,
+                "outcome": SubmissionOutcome.UNKNOWN,
+                "diagnostic_id": attempt_id.hex[:8],
+                "response_summary": "",
+                "payload_sha256": snapshots.get(invoice_id),
+            }
+        )
+    await db.execute(insert(SubmissionAttempt), rows)
+    await db.commit()
+
+    return claims, exhausted
+
+
+async def reconcile_chunk(
+    fbr_service: FBRService,
+    *,
+    chunk_size: int | None = None,
+    cooldown_seconds: int | None = None,
+    attempted_before: datetime | None = None,
+    max_attempts: int | None = None,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, int]:
+    """
+    Claim, probe and resolve one chunk of UNKNOWN invoices.
+
+    Args:
+        fbr_service: FBR service (real or mock)
+        chunk_size: Invoices per chunk (default: RECONCILIATION_CHUNK_SIZE)
+        cooldown_seconds: Attempt cool-down (default: RECONCILIATION_COOLDOWN_SECONDS)
+        attempted_before: Explicit cut-off for recent attempts (overrides cooldown_seconds)
+        max_attempts: Probes per invoice (default: RECONCILIATION_MAX_ATTEMPTS)
+        session_factory: Session factory (default: the application's)
+
+    Returns:
+        Counts of claimed, submitted, failed, needs_review and unresolved invoices
+    """
+    session_factory = session_factory or async_session_maker
+    chunk_size = chunk_size or settings.reconciliation_chunk_size
+    attempted_before = attempted_before or _cooldown_cutoff(cooldown_seconds)
+
+    # 1. Claim and load everything the probes need, then release the connection
+    async with session_factory() as db:
+        claims, exhausted = await claim_unknown_invoices(
+            db, chunk_size, attempted_before, max_attempts
+        )
+        if not claims:
+            return _chunk_counts({}, {}, exhausted)
+
+        # Ledger lookup: an attempt FBR accepted puts the invoice on record
+        result = await db.execute(
+            select(SubmissionAttempt.invoice_id, SubmissionAttempt.response_summary)
+            .where(
+                SubmissionAttempt.invoice_id.in_(claims),
+                SubmissionAttempt.outcome == SubmissionOutcome.SUCCESS,
+            )
+            .distinct(SubmissionAttempt.invoice_id)
+            .order_by(SubmissionAttempt.invoice_id, SubmissionAttempt.attempted_at.desc())
+        )
+        on_record: dict[UUID, str | None] = dict(result.all())
+
+        result = await db.execute(
+            select(Invoice)
+            .where(Invoice.id.in_(claims), Invoice.id.not_in(on_record))
+            .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+        )
+        invoices = list(result.scalars().all())
+        bodies = await load_payloads(db, (sha for _, sha in claims.values() if sha))
+
+    # 2. Probe FBR concurrently
+    semaphore = asyncio.Semaphore(settings.reconciliation_concurrency)
+
+    async def _probe(invoice: Invoice) -> tuple[UUID, dict[str, Any], int]:
+        payload = bodies.get(claims[invoice.id][1] or "")
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                response = await fbr_service.validate_invoice(invoice, payload)
+            except Exception as e:
+                response = {"error": str(e)}
+            return invoice.id, response, int((time.monotonic() - started) * 1000)
+
+    probed = await asyncio.gather(*(_probe(invoice) for invoice in invoices))
+
+    # 3. Apply verdicts set-based
+    by_status: dict[InvoiceStatus, list[UUID]] = {}
+    attempt_rows = []
+    verdicts = [
+        (invoice_id, {"source": "ledger", "response": summary}, 0, InvoiceStatus.SUBMITTED)
+        for invoice_id, summary in on_record.items()
+    ] + [
+        (invoice_id, response, elapsed_ms, classify_reconciliation(response))
+        for invoice_id, response, elapsed_ms in probed
+    ]
+    for invoice_id, response, elapsed_ms, verdict in verdicts:
+        if verdict is None and isinstance(response.get("validationResponse"), dict):
+            # FBR answered but cannot say whether the invoice is on record;
+            # the same payload would get the same answer on every later probe
+            verdict = InvoiceStatus.NEEDS_REVIEW
+        if verdict is not None:
+            by_status.setdefault(verdict, []).append(invoice_id)
+        attempt_rows.append(
+            {
+                "attempt_id": claims[invoice_id][0],
+                "outcome": _VERDICT_OUTCOMES[verdict],
+                "elapsed_ms": elapsed_ms,
+                "summary": orjson.dumps(response, default=str).decode()[:1000],
+            }
+        )
+
+    async with session_factory() as db:
+        for status, ids in by_status.items():
+            values: dict[str, Any] = {"status": status}
+            if status == InvoiceStatus.SUBMITTED:
+                values["submitted_at"] = datetime.now(timezone.utc)
+            result = await db.execute(
+                update(Invoice)
+                .where(Invoice.id.in_(ids), Invoice.status == InvoiceStatus.UNKNOWN)
+                .values(**values)
+                .returning(Invoice.id, Invoice.tenant_id)
+            )
+            await record_transitions(
+                db,
+                (StatusEvent(i, tenant_id, status) for i, tenant_id in result),
+            )
+        if attempt_rows:
+            await db.execute(
+                update(_attempts)
+                .where(_attempts.c.id == bindparam("attempt_id"))
+                .values(
+                    outcome=bindparam("outcome"),
+                    response_time_ms=bindparam("elapsed_ms"),
+                    response_summary=bindparam("summary"),
+                ),
+                attempt_rows,
+            )
+        await db.commit()
+
+    return _chunk_counts(claims, by_status, exhausted)
+
+
+def _chunk_counts(
+    claims: dict[UUID, Any],
+    by_status: dict[InvoiceStatus, list[UUID]],
+    exhausted: list[UUID],
+) -> dict[str, int]:
+    """Count a chunk's verdicts, add them to the process totals and log reviews."""
+    needs_review = by_status.get(InvoiceStatus.NEEDS_REVIEW, []) + exhausted
+    if needs_review:
+        logger.warning(
+            "reconciliation_needs_review",
+            count=len(needs_review),
+            attempts_exhausted=len(exhausted),
+            invoice_ids=[str(i) for i in needs_review],
+        )
+
+    counts = {
+        "claimed": len(claims) + len(exhausted),
+        "submitted": len(by_status.get(InvoiceStatus.SUBMITTED, [])),
+        "failed": len(by_status.get(InvoiceStatus.FAILED, [])),
+        "needs_review": len(needs_review),
+    }
+    counts["unresolved"] = (
+        counts["claimed"] - counts["submitted"] - counts["failed"] - counts["needs_review"]
+    )
+    for key, value in counts.items():
+        _totals[key] += value
+    return counts
+
+
+async def reconcile_unknown(
+    fbr_service: FBRService,
+    *,
+    chunk_size: int | None = None,
+    cooldown_seconds: int | None = None,
+    max_chunks: int | None = None,
+    max_attempts: int | None = None,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, int]:
+    """
+    Sweep UNKNOWN invoices chunk by chunk until none are eligible.
+
+    Args:
+        fbr_service: FBR service (real or mock)
+        chunk_size: Invoices per chunk (default: RECONCILIATION_CHUNK_SIZE)
+        cooldown_seconds: Attempt cool-down (default: RECONCILIATION_COOLDOWN_SECONDS)
+        max_chunks: Stop after this many chunks (default: no limit)
+        max_attempts: Probes per invoice (default: RECONCILIATION_MAX_ATTEMPTS)
+        session_factory: Session factory (default: the application's)
+
+    Returns:
+        Counts of claimed, submitted, failed, needs_review and unresolved invoices
+    """
+    chunk_size = chunk_size or settings.reconciliation_chunk_size
+    # Fixed for the whole sweep: invoices probed by this sweep are never
+    # eligible again within it, even with a zero cool-down.
+    attempted_before = _cooldown_cutoff(cooldown_seconds)
+    totals = {"claimed": 0, "submitted": 0, "failed": 0, "needs_review": 0, "unresolved": 0}
+    chunks = 0
+
+    while max_chunks is None or chunks < max_chunks:
+        counts = await reconcile_chunk(
+            fbr_service,
+            chunk_size=chunk_size,
+            attempted_before=attempted_before,
+            max_attempts=max_attempts,
+            session_factory=session_factory,
+        )
+        chunks += 1
+        for key, value in counts.items():
+            totals[key] += value
+        if counts["claimed"] < chunk_size:
+            break
+
+    if totals["claimed"]:
+        logger.info("reconciliation_sweep_finished", chunks=chunks, **totals)
+    return totals
+
+
+async def recover_orphaned_submissions(
+    db: AsyncSession,
+    *,
+    grace_seconds: int | None = None,
+    lookback_hours: int | None = None,
+) -> dict[str, int]:
+    """
+    Hand on submissions abandoned by a process that died mid-flight.
+
+    An invoice is orphaned when it is still DRAFT or QUEUED, has no
+    unfinished submission job (those are recovered through job leases), and
+    nothing has touched it for the grace period. It is found either through
+    an ambiguous attempt (UNKNOWN or TIMEOUT, using the (outcome,
+    attempted_at) index) or, for batch claims that died before sending,
+    because it is QUEUED. Each orphan is then:
+
+    - SUBMITTED if one of its attempts succeeded (the status update was lost)
+    - UNKNOWN, for the reconciler, if an attempt may have reached FBR
+    - otherwise re-queued as a submission job (nothing reached FBR)
+
+    Invoices are locked with FOR UPDATE SKIP LOCKED, so several processes
+    starting together (e.g. a rolling deploy) do not recover the same ones.
+
+    Args:
+        db: Database session
+        grace_seconds: Minimum idle time (default: RECOVERY_GRACE_SECONDS)
+        lookback_hours: How far back to look for attempts (default: RECOVERY_LOOKBACK_HOURS)
+
+    Returns:
+        Counts of invoices moved to submitted, unknown and requeued
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.recovery_grace_seconds
+    if lookback_hours is None:
+        lookback_hours = settings.recovery_lookback_hours
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=grace_seconds)
+    since = now - timedelta(hours=lookback_hours)
+
+    orphaned_attempts = select(SubmissionAttempt.invoice_id).where(
+        SubmissionAttempt.outcome.in_(_AMBIGUOUS_OUTCOMES),
+        SubmissionAttempt.attempted_at >= since,
+        SubmissionAttempt.attempted_at < cutoff,
+    )
+    recent_attempt = (
+        select(SubmissionAttempt.id)
+        .where(
+            SubmissionAttempt.invoice_id == Invoice.id,
+            SubmissionAttempt.attempted_at >= cutoff,
+        )
+        .exists()
+    )
+    live_job = (
+        select(SubmissionJob.id)
+        .where(
+            SubmissionJob.invoice_id == Invoice.id,
+            SubmissionJob.status.in_([SubmissionJobStatus.QUEUED, SubmissionJobStatus.RUNNING]),
+        )
+        .exists()
+    )
+    result = await db.execute(
+        select(Invoice.id, Invoice.tenant_id)
+        .where(
+            or_(
+                Invoice.status.in_([InvoiceStatus.DRAFT, InvoiceStatus.QUEUED])
+                & Invoice.id.in_(orphaned_attempts),
+                (Invoice.status == InvoiceStatus.QUEUED) & (Invoice.updated_at < cutoff),
+            ),
+            ~recent_attempt,
+            ~live_job,
+        )
+        .with_for_update(skip_locked=True, of=Invoice)
+    )
+    orphans: dict[UUID, UUID] = dict(result.all())
+    if not orphans:
+        await db.commit()
+        return {"submitted": 0, "unknown": 0, "requeued": 0}
+
+    result = await db.execute(
+        select(
+            SubmissionAttempt.invoice_id,
+            func.bool_or(SubmissionAttempt.outcome == SubmissionOutcome.SUCCESS),
+            func.bool_or(SubmissionAttempt.outcome.in_(_AMBIGUOUS_OUTCOMES)),
+        )
+        .where(SubmissionAttempt.invoice_id.in_(orphans))
+        .group_by(SubmissionAttempt.invoice_id)
+    )
+    submitted_ids, unknown_ids = [], []
+    for invoice_id, accepted, ambiguous in result:
+        if accepted:
+            submitted_ids.append(invoice_id)
+        elif ambiguous:
+            unknown_ids.append(invoice_id)
+    resolved = set(submitted_ids) | set(unknown_ids)
+
+    # Anything left never reached FBR as far as we know: DRAFTs were only
+    # found through ambiguous attempts, so these are all QUEUED.
+    requeue_ids = [invoice_id for invoice_id in orphans if invoice_id not in resolved]
+
+    in_flight_statuses = [InvoiceStatus.DRAFT, InvoiceStatus.QUEUED]
+    if submitted_ids:
+        await db.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(submitted_ids), Invoice.status.in_(in_flight_statuses))
+            .values(status=InvoiceStatus.SUBMITTED, submitted_at=now)
+        )
+    if unknown_ids:
+        await db.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(unknown_ids), Invoice.status.in_(in_flight_statuses))
+            .values(status=InvoiceStatus.UNKNOWN)
+        )
+    await record_transitions(
+        db,
+        [StatusEvent(i, orphans[i], InvoiceStatus.SUBMITTED) for i in submitted_ids]
+        + [StatusEvent(i, orphans[i], InvoiceStatus.UNKNOWN) for i in unknown_ids],
+    )
+    if requeue_ids:
+        db.add_all(
+            SubmissionJob(tenant_id=orphans[invoice_id], invoice_id=invoice_id)
+            for invoice_id in requeue_ids
+        )
+    await db.commit()
+
+    counts = {
+        "submitted": len(submitted_ids),
+        "unknown": len(unknown_ids),
+        "requeued": len(requeue_ids),
+    }
+    logger.warning("orphaned_submissions_recovered", **counts)
+    return counts
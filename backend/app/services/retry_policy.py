@@ -0,0 +1,196 @@
+"""
+Retry policy for FBR calls.
+
+Decides whether a failed call is retried and how long to wait first:
+
+- Retryable responses (429/502/503/504 by default), timeouts and connection errors
+- Exponential backoff with full jitter, so that workers which failed together
+  do not retry together
+- The server's Retry-After header, when present, as a lower bound
+- A cap on total elapsed time across all attempts
+- A per-tenant retry budget: retries are funded by a fraction of the
+  tenant's first attempts (plus a small steady allowance), so a partial
+  outage cannot multiply the load on the gateway
+"""
+
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+import structlog
+
+from app.config import Settings, get_settings
+
+logger = structlog.get_logger()
+
+
+def parse_retry_after(response: httpx.Response, now: datetime | None = None) -> float | None:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Returns None if the header is absent or malformed.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class RetryBudget:
+    """
+    Per-tenant retry allowance.
+
+    Every first attempt deposits `fbr_retry_budget_ratio` tokens and the
+    balance also refills at `fbr_retry_budget_min_per_second`; each retry
+    spends one token. Balances are capped at `fbr_retry_budget_burst`.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.settings = settings or get_settings()
+        self._clock = clock
+        self._balances: dict[str, tuple[float, float]] = {}
+
+    def _balance(self, tenant_id: str) -> float:
+        s = self.settings
+        now = self._clock()
+        tokens, updated = self._balances.get(tenant_id, (float(s.fbr_retry_budget_burst), now))
+        return min(
+            float(s.fbr_retry_budget_burst),
+            tokens + (now - updated) * s.fbr_retry_budget_min_per_second,
+        )
+
+    def deposit(self, tenant_id: str) -> None:
+        """Credit the budget for a first attempt."""
+        tokens = min(
+            float(self.settings.fbr_retry_budget_burst),
+            self._balance(tenant_id) + self.settings.fbr_retry_budget_ratio,
+        )
+        self._balances[tenant_id] = (tokens, self._clock())
+
+    def try_spend(self, tenant_id: str) -> bool:
+        """Take one retry from the budget if available."""
+        tokens = self._balance(tenant_id)
+        if tokens < 1:
+            self._balances[tenant_id] = (tokens, self._clock())
+            return False
+        self._balances[tenant_id] = (tokens - 1, self._clock())
+        return True
+
+
+class RetryPolicy:
+    """Configurable retry decisions shared by submission and validation."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        budget: RetryBudget | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.settings = settings or get_settings()
+        self.budget = budget or RetryBudget(self.settings, clock=clock)
+        self._clock = clock
+        self._rng = rng
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Whether an HTTP status is worth retrying."""
+        return status_code in self.settings.fbr_retry_statuses
+
+    def is_retryable_exception(self, exc: Exception) -> bool:
+        """Timeouts and failed connections are retried; other errors are not."""
+        return isinstance(exc, (httpx.TimeoutException, httpx.ConnectError))
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter exponential backoff for the nth retry (1-based)."""
+        s = self.settings
+        ceiling = min(s.fbr_retry_max_delay_seconds, s.fbr_retry_delay_seconds * 2 ** (retry_number - 1))
+        return self._rng() * ceiling
+
+    def begin(self, tenant_id: str | None = None) -> "RetryState":
+        """Start tracking retries for one logical call."""
+        if tenant_id:
+            self.budget.deposit(tenant_id)
+        return RetryState(self, tenant_id, started_at=self._clock())
+
+
+class RetryState:
+    """Retry bookkeeping for a single logical call (all of its attempts)."""
+
+    def __init__(self, policy: RetryPolicy, tenant_id: str | None, started_at: float):
+        self.policy = policy
+        self.tenant_id = tenant_id
+        self.started_at = started_at
+        self.attempts = 0
+
+    def next_delay(
+        self,
+        response: httpx.Response | None = None,
+        exc: Exception | None = None,
+    ) -> float | None:
+        """
+        Record a failed attempt and decide on a retry.
+
+        Args:
+            response: Response of the failed attempt, if one was received
+            exc: Exception raised by the failed attempt, if any
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        policy = self.policy
+        s = policy.settings
+        self.attempts += 1
+
+        if response is not None:
+            retryable = policy.is_retryable_status(response.status_code)
+        else:
+            retryable = exc is not None and policy.is_retryable_exception(exc)
+        if not retryable or self.attempts >= s.fbr_max_retries:
+            return None
+
+        delay = policy.backoff(self.attempts)
+        if response is not None:
+            retry_after = parse_retry_after(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        elapsed = policy._clock() - self.started_at
+        if elapsed + delay > s.fbr_retry_max_elapsed_seconds:
+            logger.info("fbr_retry_deadline_exceeded", tenant_id=self.tenant_id, elapsed=round(elapsed, 3))
+            return None
+
+        if self.tenant_id and not policy.budget.try_spend(self.tenant_id):
+            logger.warning("fbr_retry_budget_exhausted", tenant_id=self.tenant_id)
+            return None
+
+        return delay
+
+
+_retry_policy: RetryPolicy | None = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the process-wide FBR retry policy."""
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy()
+    return _retry_policy
@@ -0,0 +1,276 @@
+"""
+Invoice status transition events.
+
+The submission path announces every status change it commits (queued,
+submitted, failed, unknown) so clients can follow a batch or a whole tenant
+over one Server-Sent Events connection instead of polling each invoice.
+
+- record_transitions() runs inside the writer's transaction. It issues a
+  Postgres NOTIFY on the `invoice_status` channel, which is delivered only
+  if the transaction commits, and stashes the events on the session. They
+  are published to this process's bus after the commit.
+- StatusEventListener keeps one dedicated connection per API process
+  LISTENing on the channel. It republishes events committed by other
+  processes (submission workers, reconcilers, other API nodes) and skips
+  this process's own.
+- StatusEventBus fans events out to subscriptions with bounded queues. A
+  subscriber that falls behind is cut off and reconnects rather than
+  buffering without limit.
+
+Besides the SSE stream, the long-poll status endpoint parks on a
+single-invoice subscription until the invoice changes.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Iterable
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import asyncpg
+import orjson
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import Settings, get_settings
+from app.models.invoice import InvoiceStatus
+
+logger = structlog.get_logger()
+
+CHANNEL = "invoice_status"
+
+# Identifies this process's notifications so the listener can skip them
+ORIGIN = uuid.uuid4().hex
+
+# Events per NOTIFY payload (Postgres caps a payload at 8000 bytes)
+_EVENTS_PER_NOTIFY = 50
+
+_PENDING_KEY = "pending_status_events"
+
+
+@dataclass(frozen=True, slots=True)
+class StatusEvent:
+    """One committed invoice status transition."""
+
+    invoice_id: uuid.UUID
+    tenant_id: uuid.UUID
+    status: InvoiceStatus
+    batch_id: uuid.UUID | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready representation sent to clients."""
+        return {
+            "invoice_id": str(self.invoice_id),
+            "status": self.status.value,
+            "batch_id": str(self.batch_id) if self.batch_id else None,
+        }
+
+
+def _encode(events: list[StatusEvent]) -> str:
+    return orjson.dumps(
+        {
+            "o": ORIGIN,
+            "e": [
+                [str(e.invoice_id), str(e.tenant_id), e.status.value, str(e.batch_id) if e.batch_id else None]
+                for e in events
+            ],
+        }
+    ).decode()
+
+
+def _decode(payload: str) -> tuple[str, list[StatusEvent]]:
+    data = orjson.loads(payload)
+    return data["o"], [
+        StatusEvent(
+            invoice_id=uuid.UUID(invoice_id),
+            tenant_id=uuid.UUID(tenant_id),
+            status=InvoiceStatus(status),
+            batch_id=uuid.UUID(batch_id) if batch_id else None,
+        )
+        for invoice_id, tenant_id, status, batch_id in data["e"]
+    ]
+
+
+class Subscription:
+    """A client's view of the event stream: one tenant, optionally one batch or invoice."""
+
+    def __init__(
+        self,
+        tenant_id: uuid.UUID,
+        batch_id: uuid.UUID | None,
+        max_queue: int,
+        invoice_id: uuid.UUID | None = None,
+    ):
+        self.tenant_id = tenant_id
+        self.batch_id = batch_id
+        self.invoice_id = invoice_id
+        self.queue: asyncio.Queue[StatusEvent | None] = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+        # Invoices seen in this batch; their later transitions (a deferred
+        # job finishing, an UNKNOWN being reconciled) carry no batch id
+        self._invoice_ids: set[uuid.UUID] = set()
+
+    def matches(self, event: StatusEvent) -> bool:
+        """Whether an event belongs to this subscription."""
+        if event.tenant_id != self.tenant_id:
+            return False
+        if self.invoice_id is not None:
+            return event.invoice_id == self.invoice_id
+        if self.batch_id is None:
+            return True
+        if event.batch_id == self.batch_id:
+            self._invoice_ids.add(event.invoice_id)
+            return True
+        return event.invoice_id in self._invoice_ids
+
+    def offer(self, event: StatusEvent) -> None:
+        """Queue an event, cutting the subscriber off if it has fallen behind."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Make room for the sentinel that ends the stream
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class StatusEventBus:
+    """In-process fan-out of status events to subscriptions."""
+
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        self._subscriptions: set[Subscription] = set()
+        self.published = 0
+
+    def publish(self, events: Iterable[StatusEvent]) -> None:
+        """Deliver events to every matching subscription."""
+        for status_event in events:
+            self.published += 1
+            for subscription in self._subscriptions:
+                if subscription.matches(status_event):
+                    subscription.offer(status_event)
+
+    @contextmanager
+    def subscribe(
+        self,
+        tenant_id: uuid.UUID,
+        batch_id: uuid.UUID | None = None,
+        invoice_id: uuid.UUID | None = None,
+    ) -> Iterator[Subscription]:
+        """Subscribe to a tenant's (or one batch's or invoice's) events for the duration of the block."""
+        subscription = Subscription(
+            tenant_id, batch_id, self.settings.status_stream_queue_size, invoice_id=invoice_id
+        )
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Subscriber count for metrics."""
+        return {"subscribers": len(self._subscriptions), "published": self.published}
+
+
+_status_event_bus: StatusEventBus | None = None
+
+
+def get_status_event_bus() -> StatusEventBus:
+    """Get the process-wide status event bus."""
+    global _status_event_bus
+    if _status_event_bus is None:
+        _status_event_bus = StatusEventBus()
+    return _status_event_bus
+
+
+async def record_transitions(db: AsyncSession, events: Iterable[StatusEvent]) -> None:
+    """
+    Announce status transitions made in the current transaction.
+
+    Must be called before the transaction commits. Nothing is delivered if it
+    rolls back.
+
+    Args:
+        db: Session whose transaction makes the transitions
+        events: The transitions
+    """
+    events = list(events)
+    if not events:
+        return
+    payloads = [
+        _encode(events[i : i + _EVENTS_PER_NOTIFY]) for i in range(0, len(events), _EVENTS_PER_NOTIFY)
+    ]
+    await db.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": CHANNEL, "payloads": payloads},
+    )
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        get_status_event_bus().publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class StatusEventListener:
+    """LISTENs for other processes' status events and republishes them locally."""
+
+    def __init__(self, bus: StatusEventBus | None = None, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        self.bus = bus or get_status_event_bus()
+        self.stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop listening."""
+        self.stopping.set()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            origin, events = _decode(payload)
+        except Exception:
+            logger.warning("status_event_undecodable", payload=payload[:200])
+            return
+        if origin != ORIGIN:
+            self.bus.publish(events)
+
+    async def run(self) -> None:
+        """Listen until stopped, reconnecting after connection loss."""
+        dsn = str(self.settings.database_url).replace("+asyncpg", "")
+        while not self.stopping.is_set():
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception:
+                logger.exception("status_listener_connect_failed")
+            else:
+                connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                logger.info("status_listener_started", channel=CHANNEL)
+                try:
+                    stop_waiter = asyncio.create_task(self.stopping.wait())
+                    lost_waiter = asyncio.create_task(lost.wait())
+                    await asyncio.wait({stop_waiter, lost_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                    stop_waiter.cancel()
+                    lost_waiter.cancel()
+                finally:
+                    if not connection.is_closed():
+                        await connection.close()
+                if self.stopping.is_set():
+                    break
+                logger.warning("status_listener_connection_lost")
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self.stopping.wait(), timeout=self.settings.status_listener_retry_seconds)
+        logger.info("status_listener_stopped")
@@ -0,0 +1,639 @@
+"""
+Submission job service - asynchronous invoice submission to FBR.
+
+Instead of holding the HTTP request open for the whole FBR retry loop,
+an invoice can be moved to QUEUED and handed to a background worker.
+Clients poll the job, whose history is read from the submission_attempts
+ledger.
+"""
+
+import asyncio
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import structlog
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import (
+    Invoice,
+    InvoiceStatus,
+    SubmissionAttempt,
+    SubmissionJob,
+    SubmissionJobStatus,
+)
+from app.schemas.invoice import InvoiceStatusEnum
+from app.schemas.submission import (
+    SubmissionAttemptResponse,
+    SubmissionJobResponse,
+    SubmissionJobStatusEnum,
+)
+from app.services import invoice_service
+from app.services.attempt_ledger import attempts_since, load_payload
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.fbr_service import FBRService
+from app.services.invoice_service import InvoiceNotDraftError, InvoiceNotFoundError
+from app.services.status_events import StatusEvent, record_transitions
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+# =============================================================================
+# Exceptions
+# =============================================================================
+
+
+class SubmissionJobNotFoundError(Exception):
+    """Raised when a submission job is not found."""
+
+    def __init__(self, job_id: UUID):
+        self.job_id = job_id
+        super().__init__(f"Submission job not found: {job_id}")
+
+
+class LeaseLostError(Exception):
+    """Raised when a running job's lease is no longer held by its runner."""
+
+    def __init__(self, job_id: UUID, owner: str):
+        self.job_id = job_id
+        self.owner = owner
+        super().__init__(f"Lease on submission job {job_id} is no longer held by {owner}")
+
+
+class SubmissionAttemptNotFoundError(Exception):
+    """Raised when a submission attempt (or its frozen payload) is not found."""
+
+    def __init__(self, attempt_id: UUID):
+        self.attempt_id = attempt_id
+        super().__init__(f"Submission attempt not found: {attempt_id}")
+
+
+# =============================================================================
+# Job Lifecycle
+# =============================================================================
+
+
+async def enqueue_submission(
+    db: AsyncSession,
+    tenant_id: UUID,
+    invoice_id: UUID,
+) -> SubmissionJob:
+    """
+    Queue a draft invoice for background submission.
+
+    The invoice moves to QUEUED (which blocks its ref like SUBMITTED/UNKNOWN)
+    with a conditional UPDATE, so of two concurrent calls for the same draft
+    only one gets a job. The job row is committed before returning so that a
+    worker can pick it up immediately.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        invoice_id: Invoice UUID
+
+    Returns:
+        The queued SubmissionJob
+
+    Raises:
+        InvoiceNotFoundError: If invoice not found
+        InvoiceNotDraftError: If invoice is not in draft status
+    """
+    # Claim DRAFT -> QUEUED atomically, as the batch path does
+    result = await db.execute(
+        update(Invoice)
+        .where(
+            and_(
+                Invoice.id == invoice_id,
+                Invoice.tenant_id == tenant_id,
+                Invoice.status == InvoiceStatus.DRAFT,
+            )
+        )
+        .values(status=InvoiceStatus.QUEUED)
+        .returning(Invoice.id)
+    )
+    if result.scalar_one_or_none() is None:
+        invoice = await invoice_service.get_invoice_by_id(
+            db, tenant_id, invoice_id, with_items=False
+        )
+        if not invoice:
+            raise InvoiceNotFoundError(invoice_id)
+        raise InvoiceNotDraftError(invoice_id, invoice.status)
+
+    job = SubmissionJob(tenant_id=tenant_id, invoice_id=invoice_id)
+    db.add(job)
+    await record_transitions(db, [StatusEvent(invoice_id, tenant_id, InvoiceStatus.QUEUED)])
+    await db.commit()
+
+    logger.info("submission_job_queued", job_id=str(job.id), invoice_id=str(invoice_id))
+
+    return job
+
+
+async def run_submission_job(
+    db: AsyncSession,
+    job: SubmissionJob,
+    fbr_service: FBRService,
+) -> SubmissionJob:
+    """
+    Execute a claimed submission job.
+
+    Submits the job's QUEUED invoice through the same path as synchronous
+    submission and records the job outcome. A job reclaimed after its lease
+    expired is not sent again if an earlier claim left an unresolved
+    attempt: the invoice moves to UNKNOWN for the reconciler instead.
+
+    The lease is checked before every FBR attempt and before the outcome is
+    written; once another claim holds it, this run stops and leaves the job
+    and invoice to that claim.
+
+    Args:
+        db: Database session
+        job: Job to run (already marked RUNNING by the caller)
+        fbr_service: FBR service (real or mock)
+
+    Returns:
+        The finished SubmissionJob
+    """
+    result = await db.execute(
+        select(Invoice)
+        .where(Invoice.id == job.invoice_id)
+        .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+    )
+    invoice = result.scalar_one_or_none()
+
+    if invoice is None or invoice.status != InvoiceStatus.QUEUED:
+        job.status = SubmissionJobStatus.FAILED
+        job.error = "Invoice is no longer queued for submission"
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        return job
+
+    # Rolling back expires loaded objects, so keep what the crash handler needs
+    invoice_id, tenant_id = invoice.id, invoice.tenant_id
+    started_at = job.started_at or job.created_at
+
+    if job.claim_count > 1:
+        # Reclaimed after a lease expired: the earlier claim may already have
+        # sent the invoice, so never POST again over an unresolved attempt
+        accepted, unresolved, _ = await attempts_since(db, invoice_id, started_at)
+        if accepted or unresolved:
+            final_status = InvoiceStatus.SUBMITTED if accepted else InvoiceStatus.UNKNOWN
+            await invoice_service.settle_queued_invoice(db, invoice_id, tenant_id, final_status)
+            job.status = (
+                SubmissionJobStatus.SUCCEEDED if accepted else SubmissionJobStatus.FAILED
+            )
+            job.error = None if accepted else "An earlier claim may have reached FBR; outcome unknown"
+            job.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+            logger.warning(
+                "submission_job_reclaim_not_resent",
+                job_id=str(job.id),
+                invoice_status=final_status.value,
+            )
+            return job
+
+    try:
+        response = await invoice_service.send_to_fbr(
+            db, invoice, fbr_service, ensure_claim=lease_guard(job.id, job.lease_owner)
+        )
+    except LeaseLostError as e:
+        # The reclaiming worker sees this run's attempts and settles the invoice
+        await db.rollback()
+        logger.warning("submission_job_lease_lost", job_id=str(e.job_id), owner=e.owner)
+        return job
+    except CircuitOpenError as e:
+        # Nothing was sent; hand the job back to the queue untouched.
+        await db.rollback()
+        return await defer_job(db, job, str(e))
+    except Exception as e:
+        logger.exception("submission_job_crashed", job_id=str(job.id))
+        await db.rollback()
+
+        # Once an attempt row is open the POST may have reached FBR, so the
+        # invoice goes to the reconciler instead of failing outright
+        accepted, _, attempted = await attempts_since(db, invoice_id, started_at)
+        if accepted:
+            final_status = InvoiceStatus.SUBMITTED
+        elif attempted:
+            final_status = InvoiceStatus.UNKNOWN
+        else:
+            final_status = InvoiceStatus.FAILED
+        await invoice_service.settle_queued_invoice(db, invoice_id, tenant_id, final_status)
+
+        await db.refresh(job)
+        job.status = (
+            SubmissionJobStatus.SUCCEEDED
+            if final_status == InvoiceStatus.SUBMITTED
+            else SubmissionJobStatus.FAILED
+        )
+        job.error = str(e)
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        return job
+
+    if invoice.status == InvoiceStatus.SUBMITTED:
+        job.status = SubmissionJobStatus.SUCCEEDED
+    else:
+        job.status = SubmissionJobStatus.FAILED
+        job.error = str(response.get("detail") or response.get("body") or response.get("error"))
+    job.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+
+    logger.info("submission_job_finished", job_id=str(job.id), status=job.status.value)
+
+    return job
+
+
+async def defer_job(db: AsyncSession, job: SubmissionJob, reason: str) -> SubmissionJob:
+    """
+    Return a claimed job to the queue without counting the claim.
+
+    Used when the FBR circuit is open: the invoice stays QUEUED and the job
+    is picked up again once the gateway recovers.
+    """
+    await db.refresh(job)
+    job.status = SubmissionJobStatus.QUEUED
+    job.lease_owner = None
+    job.lease_expires_at = None
+    job.claim_count = max(job.claim_count - 1, 0)
+    job.error = reason
+    await db.commit()
+
+    logger.info("submission_job_deferred", job_id=str(job.id), reason=reason)
+
+    return job
+
+
+async def process_submission_job(job_id: UUID, fbr_service: FBRService) -> None:
+    """
+    Background task entry point for an in-process submission job.
+
+    Runs after the 202 response has been sent, so it uses its own session.
+    The job is claimed with a lease like any worker claim, so it is
+    reclaimed by the worker fleet if this process dies mid-submission;
+    while it runs, the lease is extended on the worker heartbeat interval.
+    """
+    owner = f"web:{process_identity()}"
+    async with async_session_maker() as db:
+        job = await claim_job(db, job_id, owner=owner)
+        if job is None:
+            return
+
+        heartbeat = asyncio.create_task(_heartbeat_loop(owner, job_id))
+        try:
+            await run_submission_job(db, job, fbr_service)
+        finally:
+            heartbeat.cancel()
+
+
+async def _heartbeat_loop(owner: str, job_id: UUID) -> None:
+    """Periodically extend the lease on one in-process job."""
+    while True:
+        await asyncio.sleep(settings.submission_heartbeat_seconds)
+        try:
+            async with async_session_maker() as db:
+                await heartbeat_jobs(db, owner, [job_id])
+        except Exception:
+            logger.exception("submission_job_heartbeat_error", job_id=str(job_id))
+
+
+# =============================================================================
+# Worker Leases
+# =============================================================================
+
+
+def process_identity() -> str:
+    """Identify this process in lease_owner."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claimable():
+    """Jobs that are queued, or running under a lease that has expired."""
+    return and_(
+        SubmissionJob.claim_count < settings.submission_max_claims,
+        or_(
+            SubmissionJob.status == SubmissionJobStatus.QUEUED,
+            and_(
+                SubmissionJob.status == SubmissionJobStatus.RUNNING,
+                SubmissionJob.lease_expires_at < func.now(),
+            ),
+        ),
+    )
+
+
+def _lease_values(owner: str) -> dict:
+    """Column values for taking or extending a lease (database clock)."""
+    return {
+        "status": SubmissionJobStatus.RUNNING,
+        "lease_owner": owner,
+        "lease_expires_at": func.now() + timedelta(seconds=settings.submission_lease_seconds),
+        "heartbeat_at": func.now(),
+        "started_at": func.coalesce(SubmissionJob.started_at, func.now()),
+        "claim_count": SubmissionJob.claim_count + 1,
+    }
+
+
+async def claim_jobs(
+    db: AsyncSession,
+    owner: str,
+    limit: int,
+) -> list[SubmissionJob]:
+    """
+    Claim up to `limit` jobs for a worker.
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never
+    claim the same job, then takes a lease on the claimed rows in the
+    same statement. Jobs whose lease expired (crashed worker) are claimable
+    again until they reach `submission_max_claims`.
+
+    Args:
+        db: Database session
+        owner: Worker identifier stored in lease_owner
+        limit: Maximum number of jobs to claim
+
+    Returns:
+        Claimed jobs, oldest first
+    """
+    candidates = (
+        select(SubmissionJob.id)
+        .where(_claimable())
+        .order_by(SubmissionJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.scalars(
+        update(SubmissionJob)
+        .where(SubmissionJob.id.in_(candidates))
+        .values(**_lease_values(owner))
+        .returning(SubmissionJob)
+        .execution_options(populate_existing=True)
+    )
+    jobs = sorted(result.all(), key=lambda job: job.created_at)
+    await db.commit()
+
+    return jobs
+
+
+async def claim_job(
+    db: AsyncSession,
+    job_id: UUID,
+    owner: str,
+) -> SubmissionJob | None:
+    """
+    Claim a specific job (in-process dispatch).
+
+    Returns None if the job is already held by someone else or finished.
+    """
+    candidate = (
+        select(SubmissionJob.id)
+        .where(and_(SubmissionJob.id == job_id, _claimable()))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.scalars(
+        update(SubmissionJob)
+        .where(SubmissionJob.id == candidate)
+        .values(**_lease_values(owner))
+        .returning(SubmissionJob)
+        .execution_options(populate_existing=True)
+    )
+    job = result.one_or_none()
+    await db.commit()
+
+    return job
+
+
+async def heartbeat_jobs(
+    db: AsyncSession,
+    owner: str,
+    job_ids: list[UUID],
+) -> None:
+    """Extend the leases a worker holds on its in-flight jobs."""
+    if not job_ids:
+        return
+
+    await db.execute(
+        update(SubmissionJob)
+        .where(
+            and_(
+                SubmissionJob.id.in_(job_ids),
+                SubmissionJob.lease_owner == owner,
+                SubmissionJob.status == SubmissionJobStatus.RUNNING,
+            )
+        )
+        .values(
+            lease_expires_at=func.now() + timedelta(seconds=settings.submission_lease_seconds),
+            heartbeat_at=func.now(),
+        )
+    )
+    await db.commit()
+
+
+def lease_guard(job_id: UUID, owner: str) -> Callable[[], Awaitable[None]]:
+    """
+    Build a check that `owner` still holds an unexpired lease on a job.
+
+    The check reads the job in its own short session, so it can run while
+    the caller's connection is released around FBR calls.
+
+    Raises (when awaited):
+        LeaseLostError: If the job was reclaimed, finished or its lease expired
+    """
+
+    async def ensure_claim() -> None:
+        async with async_session_maker() as db:
+            held = await db.scalar(
+                select(SubmissionJob.id).where(
+                    and_(
+                        SubmissionJob.id == job_id,
+                        SubmissionJob.lease_owner == owner,
+                        SubmissionJob.status == SubmissionJobStatus.RUNNING,
+                        SubmissionJob.lease_expires_at > func.now(),
+                    )
+                )
+            )
+        if held is None:
+            raise LeaseLostError(job_id, owner)
+
+    return ensure_claim
+
+
+async def abandon_exhausted_jobs(db: AsyncSession) -> int:
+    """
+    Give up on jobs whose lease expired after their last allowed claim.
+
+    Each of those claims may have reached FBR, so the invoice outcome is
+    unknown: it moves to UNKNOWN (ref stays blocked) rather than being
+    submitted yet again.
+
+    Returns:
+        Number of jobs abandoned
+    """
+    result = await db.execute(
+        update(SubmissionJob)
+        .where(
+            and_(
+                SubmissionJob.status == SubmissionJobStatus.RUNNING,
+                SubmissionJob.lease_expires_at < func.now(),
+                SubmissionJob.claim_count >= settings.submission_max_claims,
+            )
+        )
+        .values(
+            status=SubmissionJobStatus.FAILED,
+            error="Lease expired after the maximum number of claims; outcome unknown",
+            finished_at=func.now(),
+        )
+        .returning(SubmissionJob.invoice_id)
+    )
+    invoice_ids = list(result.scalars().all())
+
+    if invoice_ids:
+        result = await db.execute(
+            update(Invoice)
+            .where(and_(Invoice.id.in_(invoice_ids), Invoice.status == InvoiceStatus.QUEUED))
+            .values(status=InvoiceStatus.UNKNOWN)
+            .returning(Invoice.id, Invoice.tenant_id)
+        )
+        await record_transitions(
+            db,
+            (StatusEvent(i, tenant_id, InvoiceStatus.UNKNOWN) for i, tenant_id in result),
+        )
+        logger.warning("submission_jobs_abandoned", count=len(invoice_ids))
+
+    await db.commit()
+
+    return len(invoice_ids)
+
+
+# =============================================================================
+# Query Functions
+# =============================================================================
+
+
+async def get_submission_job(
+    db: AsyncSession,
+    tenant_id: UUID,
+    job_id: UUID,
+) -> tuple[SubmissionJob, InvoiceStatus, list[SubmissionAttempt]]:
+    """
+    Get a submission job with its invoice status and ledger attempts.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID for isolation
+        job_id: Job UUID
+
+    Returns:
+        Tuple of (job, current invoice status, attempts made since the job was queued)
+
+    Raises:
+        SubmissionJobNotFoundError: If job not found for tenant
+    """
+    result = await db.execute(
+        select(SubmissionJob, Invoice.status)
+        .join(Invoice, Invoice.id == SubmissionJob.invoice_id)
+        .where(and_(SubmissionJob.id == job_id, SubmissionJob.tenant_id == tenant_id))
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        raise SubmissionJobNotFoundError(job_id)
+
+    job, invoice_status = row
+
+    attempts_result = await db.execute(
+        select(SubmissionAttempt)
+        .where(
+            and_(
+                SubmissionAttempt.invoice_id == job.invoice_id,
+                SubmissionAttempt.attempted_at >= job.created_at,
+            )
+        )
+        .order_by(SubmissionAttempt.attempt_number)
+    )
+    attempts = list(attempts_result.scalars().all())
+
+    return job, invoice_status, attempts
+
+
+def build_job_response(
+    job: SubmissionJob,
+    invoice_status: InvoiceStatus,
+    attempts: list[SubmissionAttempt] | None = None,
+) -> SubmissionJobResponse:
+    """
+    Build SubmissionJobResponse from a job and its ledger attempts.
+
+    Args:
+        job: SubmissionJob model instance
+        invoice_status: Current status of the job's invoice
+        attempts: Ledger attempts made for this job
+
+    Returns:
+        SubmissionJobResponse schema
+    """
+    return SubmissionJobResponse(
+        job_id=job.id,
+        invoice_id=job.invoice_id,
+        status=SubmissionJobStatusEnum(job.status.value),
+        invoice_status=InvoiceStatusEnum(invoice_status.value),
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        attempts=[
+            SubmissionAttemptResponse(
+                id=attempt.id,
+                attempt_number=attempt.attempt_number,
+                attempted_at=attempt.attempted_at,
+                http_status=attempt.http_status,
+                outcome=attempt.outcome.value,
+                diagnostic_id=attempt.diagnostic_id,
+                response_time_ms=attempt.response_time_ms,
+                payload_sha256=attempt.payload_sha256,
+            )
+            for attempt in attempts or []
+        ],
+    )
+
+
+async def get_attempt_payload(
+    db: AsyncSession,
+    tenant_id: UUID,
+    attempt_id: UUID,
+) -> tuple[str, bytes]:
+    """
+    Get the exact request body an attempt sent to FBR (support export).
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        attempt_id: SubmissionAttempt UUID
+
+    Returns:
+        Tuple of (SHA-256, body bytes)
+
+    Raises:
+        SubmissionAttemptNotFoundError: If the attempt is not found for the
+            tenant or predates payload snapshots
+    """
+    result = await db.execute(
+        select(SubmissionAttempt.payload_sha256)
+        .join(Invoice, Invoice.id == SubmissionAttempt.invoice_id)
+        .where(and_(SubmissionAttempt.id == attempt_id, Invoice.tenant_id == tenant_id))
+    )
+    sha256 = result.scalar_one_or_none()
+    body = await load_payload(db, sha256) if sha256 else None
+
+    if body is None:
+        raise SubmissionAttemptNotFoundError(attempt_id)
+
+    return sha256, body
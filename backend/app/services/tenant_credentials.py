@@ -0,0 +1,144 @@
+"""
+Per-tenant FBR credentials.
+
+Each tenant authenticates to FBR with its own bearer token, stored encrypted
+in tenants.fbr_token. Submissions share the pooled FBR client and inject the
+tenant's Authorization header per request. Tenants without a token fall back
+to the global FBR_SANDBOX_TOKEN.
+
+Decrypted tokens are cached in memory, keyed by tenant, with a TTL and LRU
+eviction. Each entry remembers the stored value it was decrypted from, so a
+rotated token (a different stored value on the loaded tenant) is picked up on
+the next call in every process. Rotating through this module also drops the
+local entry immediately.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Settings, get_settings
+from app.models.tenant import Tenant
+from app.utils.security import decrypt_secret, encrypt_secret
+
+logger = structlog.get_logger()
+
+
+class TenantTokenError(Exception):
+    """Raised when a tenant's stored FBR token cannot be decrypted."""
+
+    def __init__(self, tenant_id: uuid.UUID):
+        self.tenant_id = tenant_id
+        super().__init__(f"FBR token for tenant {tenant_id} cannot be decrypted")
+
+
+class TenantTokenCache:
+    """LRU cache of decrypted tenant FBR tokens with a TTL."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        decrypt: Callable[[str], str] = decrypt_secret,
+    ):
+        self.settings = settings or get_settings()
+        self._clock = clock
+        self._decrypt = decrypt
+        # tenant id -> (stored value, decrypted token, expires at)
+        self._entries: OrderedDict[uuid.UUID, tuple[str, str, float]] = OrderedDict()
+
+    def token_for(self, tenant: Tenant | None) -> str:
+        """
+        Bearer token to send for a tenant.
+
+        Args:
+            tenant: Loaded tenant (None uses the global token)
+
+        Raises:
+            TenantTokenError: If the stored token cannot be decrypted
+        """
+        stored = tenant.fbr_token if tenant is not None else None
+        if not stored:
+            return self.settings.fbr_auth_token
+
+        now = self._clock()
+        entry = self._entries.get(tenant.id)
+        if entry is not None:
+            source, token, expires_at = entry
+            if source == stored and expires_at > now:
+                self._entries.move_to_end(tenant.id)
+                return token
+
+        try:
+            token = self._decrypt(stored)
+        except ValueError as e:
+            self._entries.pop(tenant.id, None)
+            logger.error("tenant_fbr_token_undecryptable", tenant_id=str(tenant.id))
+            raise TenantTokenError(tenant.id) from e
+
+        self._entries[tenant.id] = (stored, token, now + self.settings.fbr_token_cache_ttl_seconds)
+        self._entries.move_to_end(tenant.id)
+        while len(self._entries) > self.settings.fbr_token_cache_size:
+            self._entries.popitem(last=False)
+        return token
+
+    def auth_headers(self, tenant: Tenant | None) -> dict[str, str]:
+        """Authorization header for a request on behalf of a tenant."""
+        return {"Authorization": f"Bearer {self.token_for(tenant)}"}
+
+    def invalidate(self, tenant_id: uuid.UUID) -> None:
+        """Drop a tenant's cached token (e.g. after rotation)."""
+        self._entries.pop(tenant_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Cache size for metrics (never the tokens themselves)."""
+        return {
+            "cached_tenants": len(self._entries),
+            "max_size": self.settings.fbr_token_cache_size,
+            "ttl_seconds": self.settings.fbr_token_cache_ttl_seconds,
+        }
+
+
+_tenant_token_cache: TenantTokenCache | None = None
+
+
+def get_tenant_token_cache() -> TenantTokenCache:
+    """Get the process-wide tenant token cache."""
+    global _tenant_token_cache
+    if _tenant_token_cache is None:
+        _tenant_token_cache = TenantTokenCache()
+    return _tenant_token_cache
+
+
+async def rotate_fbr_token(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    token: str | None,
+) -> None:
+    """
+    Store a tenant's new FBR token (encrypted) and invalidate the cached one.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        token: New plaintext token, or None to fall back to the global token
+    """
+    await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(fbr_token=encrypt_secret(token) if token else None)
+    )
+    await db.commit()
+    get_tenant_token_cache().invalidate(tenant_id)
+
+    logger.info("tenant_fbr_token_rotated", tenant_id=str(tenant_id), cleared=token is None)
@@ -0,0 +1,76 @@
+"""
+Cache of FBR validation results by payload hash.
+
+Validating an unchanged draft sends the same bytes, so its result is reused
+instead of calling FBR again: month-end batches are typically validated,
+fixed and re-validated several times before submission. Only conclusive
+answers (a validationResponse, valid or not) are cached; errors and
+timeouts are always retried. Entries expire after a TTL (FBR reference data
+can change) and the least recently used entry is evicted at capacity.
+
+Reconciliation never uses this cache: it needs FBR's current answer.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.config import Settings, get_settings
+
+
+class ValidationCache:
+    """LRU cache with a TTL, keyed by the SHA-256 of the validated payload."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.settings = settings or get_settings()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, payload_sha256: str) -> dict[str, Any] | None:
+        """Cached FBR response for a payload, or None."""
+        entry = self._entries.get(payload_sha256)
+        if entry is None or entry[1] <= self._clock():
+            if entry is not None:
+                del self._entries[payload_sha256]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(payload_sha256)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, payload_sha256: str, response: dict[str, Any]) -> None:
+        """Remember a conclusive FBR response for a payload."""
+        if not isinstance(response.get("validationResponse"), dict):
+            return
+        expires_at = self._clock() + self.settings.fbr_validation_cache_ttl_seconds
+        self._entries[payload_sha256] = (response, expires_at)
+        self._entries.move_to_end(payload_sha256)
+        while len(self._entries) > self.settings.fbr_validation_cache_size:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Cache size and hit counts for metrics."""
+        return {
+            "entries": len(self._entries),
+            "max_size": self.settings.fbr_validation_cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_validation_cache: ValidationCache | None = None
+
+
+def get_validation_cache() -> ValidationCache:
+    """Get the process-wide validation result cache."""
+    global _validation_cache
+    if _validation_cache is None:
+        _validation_cache = ValidationCache()
+    return _validation_cache
@@ -1,12 +1,16 @@
 """
-Security utilities for password hashing and JWT token handling.
+Security utilities for password hashing, JWT token handling and secrets at rest.
 
-Uses bcrypt for password hashing and python-jose for JWT operations.
+Uses bcrypt for password hashing, python-jose for JWT operations and
+Fernet (cryptography) for encrypting stored credentials such as tenant FBR tokens.
 """
 
+import base64
+import hashlib
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
+from cryptography.fernet import Fernet, InvalidToken
 from jose import JWTError, jwt
 
 from app.config import get_settings
@@ -110,3 +114,62 @@ def decode_access_token(token: str) -> dict | None:
         return payload
     except JWTError:
         return None
+
+
+# =============================================================================
+# Secrets at rest
+# =============================================================================
+
+# Prefix marking a Fernet-encrypted value; unprefixed values are legacy plaintext
+ENCRYPTED_PREFIX = "fernet:"
+
+_fernet: Fernet | None = None
+
+
+def _get_fernet() -> Fernet:
+    """Fernet from SECRET_ENCRYPTION_KEY, or a key derived from SECRET_KEY."""
+    global _fernet
+    if _fernet is None:
+        key = settings.secret_encryption_key or base64.urlsafe_b64encode(
+            hashlib.sha256(settings.secret_key.encode("utf-8")).digest()
+        ).decode("ascii")
+        _fernet = Fernet(key)
+    return _fernet
+
+
+def encrypt_secret(plaintext: str) -> str:
+    """
+    Encrypt a secret for storage.
+
+    Args:
+        plaintext: Secret value
+
+    Returns:
+        Prefixed Fernet token safe to store in a text column
+    """
+    token = _get_fernet().encrypt(plaintext.encode("utf-8")).decode("ascii")
+    return f"{ENCRYPTED_PREFIX}{token}"
+
+
+def decrypt_secret(stored: str) -> str:
+    """
+    Decrypt a stored secret.
+
+    Values without the encryption prefix are returned unchanged, so secrets
+    saved in plaintext before encryption was introduced keep working.
+
+    Args:
+        stored: Value as stored in the database
+
+    Returns:
+        The plaintext secret
+
+    Raises:
+        ValueError: If the value cannot be decrypted with the current key
+    """
+    if not stored.startswith(ENCRYPTED_PREFIX):
+        return stored
+    try:
+        return _get_fernet().decrypt(stored[len(ENCRYPTED_PREFIX):].encode("ascii")).decode("utf-8")
+    except InvalidToken as e:
+        raise ValueError("Stored secret cannot be decrypted with the current key") from e
@@ -0,0 +1,122 @@
+"""
+UNKNOWN invoice reconciler.
+
+Periodically sweeps invoices whose FBR outcome is unknown and resolves them
+to SUBMITTED or FAILED (see app.services.reconciliation_service). Each
+sweep first recovers submissions orphaned by a process that died
+mid-flight, so nothing stays stuck after a crash or rolling deploy, and
+purges expired Idempotency-Key records. Sweeps
+claim invoices with FOR UPDATE SKIP LOCKED, so any number of reconcilers
+(embedded in API processes or standalone) can run side by side. While the
+FBR circuit breaker is open the reconciler waits for the gateway to recover.
+
+Usage:
+    python -m app.workers.reconciler
+    python -m app.workers.reconciler --once
+"""
+
+import argparse
+import asyncio
+import signal
+from contextlib import suppress
+
+import structlog
+
+from app.config import get_settings
+from app.database import async_session_maker, engine
+from app.services import idempotency_service, reconciliation_service
+from app.services.circuit_breaker import get_circuit_breaker
+from app.services.fbr_client import fbr_clients
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+async def recover_orphans() -> dict[str, int]:
+    """Run one crash-recovery pass (best effort; errors are logged)."""
+    try:
+        async with async_session_maker() as db:
+            return await reconciliation_service.recover_orphaned_submissions(db)
+    except Exception:
+        logger.exception("orphan_recovery_failed")
+        return {"submitted": 0, "unknown": 0, "requeued": 0}
+
+
+async def purge_idempotency_keys() -> int:
+    """Delete expired Idempotency-Key records (best effort; errors are logged)."""
+    try:
+        async with async_session_maker() as db:
+            return await idempotency_service.purge_expired(db)
+    except Exception:
+        logger.exception("idempotency_purge_failed")
+        return 0
+
+
+class Reconciler:
+    """Runs reconciliation sweeps until stopped."""
+
+    def __init__(self, interval_seconds: float | None = None):
+        self.interval_seconds = interval_seconds or settings.reconciliation_interval_seconds
+        # Without a validation endpoint only crash recovery runs
+        self.can_probe = settings.use_mock_fbr or bool(settings.fbr_sandbox_invoice_detail_url)
+        self.stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop after the current chunk."""
+        logger.info("reconciler_stopping")
+        self.stopping.set()
+
+    async def sweep(self) -> dict[str, int]:
+        """Recover orphaned submissions, then sweep all eligible UNKNOWN invoices."""
+        await recover_orphans()
+        await purge_idempotency_keys()
+        breaker = get_circuit_breaker()
+        if not self.can_probe or not breaker.allows_traffic():
+            return {"claimed": 0, "submitted": 0, "failed": 0, "needs_review": 0, "unresolved": 0}
+        return await reconciliation_service.reconcile_unknown(fbr_clients.get_service())
+
+    async def run(self) -> None:
+        """Main sweep loop."""
+        if not self.can_probe:
+            logger.warning("reconciler_probes_disabled", reason="FBR validation URL not configured")
+
+        logger.info("reconciler_started", interval_seconds=self.interval_seconds)
+        while not self.stopping.is_set():
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("reconciler_sweep_error")
+            await self._sleep(self.interval_seconds)
+        logger.info("reconciler_stopped")
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early if the reconciler is stopped."""
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self.stopping.wait(), timeout=seconds)
+
+
+async def main(once: bool = False) -> None:
+    """Run the reconciler until SIGINT/SIGTERM (or for a single sweep)."""
+    reconciler = Reconciler()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, reconciler.stop)
+
+    await fbr_clients.start()
+    try:
+        if once:
+            totals = await reconciler.sweep()
+            logger.info("reconciler_sweep", **totals)
+        else:
+            await reconciler.run()
+    finally:
+        await fbr_clients.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IRIS UNKNOWN invoice reconciler")
+    parser.add_argument("--once", action="store_true", help="Run a single sweep and exit")
+    args = parser.parse_args()
+    asyncio.run(main(once=args.once))
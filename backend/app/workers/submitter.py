@@ -0,0 +1,160 @@
+"""
+Out-of-process submission worker.
+
+Claims queued submission jobs from Postgres with FOR UPDATE SKIP LOCKED
+leases and submits them to FBR, so submission throughput scales across
+processes and nodes independently of the web tier. Leases are extended by
+a heartbeat; jobs held by a crashed worker are reclaimed once their lease
+expires. While the FBR circuit breaker is open the worker stops claiming
+and resumes when the gateway recovers.
+
+Usage:
+    python -m app.workers.submitter
+    python -m app.workers.submitter --concurrency 20
+"""
+
+import argparse
+import asyncio
+import signal
+import uuid
+from contextlib import suppress
+from uuid import UUID
+
+import structlog
+
+from app.config import get_settings
+from app.database import async_session_maker, engine
+from app.models import SubmissionJob
+from app.services import submission_service
+from app.services.circuit_breaker import CircuitState, get_circuit_breaker
+from app.services.fbr_client import fbr_clients
+from app.services.rate_limiter import get_rate_limiter
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class SubmissionWorker:
+    """Claims and runs submission jobs until stopped."""
+
+    def __init__(self, concurrency: int | None = None):
+        self.worker_id = f"{submission_service.process_identity()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency or settings.submission_worker_concurrency
+        self.in_flight: dict[UUID, asyncio.Task] = {}
+        self.stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; in-flight jobs are allowed to finish."""
+        logger.info("submission_worker_stopping", worker_id=self.worker_id)
+        self.stopping.set()
+
+    async def run(self) -> None:
+        """Main claim loop."""
+        logger.info(
+            "submission_worker_started",
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+        )
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+        try:
+            while not self.stopping.is_set():
+                claimed = await self._claim()
+                if not claimed:
+                    await self._sleep(settings.submission_worker_poll_seconds)
+        finally:
+            if self.in_flight:
+                await asyncio.gather(*self.in_flight.values(), return_exceptions=True)
+            heartbeat.cancel()
+
+        logger.info("submission_worker_stopped", worker_id=self.worker_id)
+
+    async def _claim(self) -> int:
+        """Claim as many jobs as there are free slots and start them."""
+        free_slots = self.concurrency - len(self.in_flight)
+        if free_slots <= 0:
+            await self._sleep(settings.submission_worker_poll_seconds)
+            return 0
+
+        # While the FBR circuit is open, jobs would only be deferred again;
+        # once it is half-open, claim a single job to act as the probe.
+        breaker = get_circuit_breaker()
+        if not breaker.allows_traffic():
+            await self._sleep(max(breaker.retry_after(), settings.submission_worker_poll_seconds))
+            return 0
+        if breaker.state == CircuitState.HALF_OPEN:
+            free_slots = 1
+
+        # Don't claim work the gateway budget cannot absorb yet
+        wait = await get_rate_limiter().wait_time()
+        if wait > 0:
+            await self._sleep(wait)
+            return 0
+
+        async with async_session_maker() as db:
+            await submission_service.abandon_exhausted_jobs(db)
+            jobs = await submission_service.claim_jobs(db, self.worker_id, free_slots)
+
+        for job in jobs:
+            self.in_flight[job.id] = asyncio.create_task(self._run_job(job.id))
+
+        return len(jobs)
+
+    async def _run_job(self, job_id: UUID) -> None:
+        """Run one claimed job in its own session."""
+        try:
+            async with async_session_maker() as db:
+                job = await db.get(SubmissionJob, job_id)
+                if job is None or job.lease_owner != self.worker_id:
+                    return
+                await submission_service.run_submission_job(db, job, fbr_clients.get_service())
+        except Exception:
+            # The lease will expire and another worker will reclaim the job.
+            logger.exception("submission_worker_job_error", job_id=str(job_id))
+        finally:
+            self.in_flight.pop(job_id, None)
+
+    async def _heartbeat_loop(self) -> None:
+        """Periodically extend leases on in-flight jobs."""
+        while True:
+            await asyncio.sleep(settings.submission_heartbeat_seconds)
+            try:
+                async with async_session_maker() as db:
+                    await submission_service.heartbeat_jobs(
+                        db, self.worker_id, list(self.in_flight)
+                    )
+            except Exception:
+                logger.exception("submission_worker_heartbeat_error", worker_id=self.worker_id)
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early if the worker is stopped."""
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self.stopping.wait(), timeout=seconds)
+
+
+async def main(concurrency: int | None = None) -> None:
+    """Run a submission worker until SIGINT/SIGTERM."""
+    worker = SubmissionWorker(concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    await fbr_clients.start()
+    try:
+        await worker.run()
+    finally:
+        await fbr_clients.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IRIS FBR submission worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum jobs in flight (default: SUBMISSION_WORKER_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(concurrency=args.concurrency))
@@ -0,0 +1,109 @@
+"""
+Fixtures for the micro-benchmarks.
+
+Invoices are transient ORM objects (never added to a session), so the
+benchmarks include SQLAlchemy attribute access but need no database.
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models import (
+    BuyerRegistrationType,
+    Invoice,
+    InvoiceItem,
+    InvoiceStatus,
+    InvoiceType,
+    Tenant,
+)
+
+ITEM_COUNTS = [1, 100, 1000]
+
+
+def build_invoice(item_count: int) -> Invoice:
+    """A submitted-looking invoice with `item_count` line items."""
+    now = datetime(2026, 2, 8, 9, 30, tzinfo=timezone.utc)
+    tenant = Tenant(
+        id=uuid.uuid4(),
+        seller_ntn="1234567890123",
+        business_name="Benchmark Seller Ltd",
+        province="Punjab",
+        address="Lahore",
+    )
+    return Invoice(
+        id=uuid.uuid4(),
+        tenant_id=tenant.id,
+        tenant=tenant,
+        invoice_ref_no="INV-000123",
+        invoice_type=InvoiceType.SALE,
+        invoice_date=date(2026, 2, 8),
+        buyer_ntn_cnic="9999999999999",
+        buyer_business_name="Benchmark Buyer",
+        buyer_province="Sindh",
+        buyer_address="Karachi",
+        buyer_registration_type=BuyerRegistrationType.REGISTERED,
+        scenario_id="SN001",
+        status=InvoiceStatus.SUBMITTED,
+        created_at=now,
+        updated_at=now,
+        submitted_at=now,
+        items=[
+            InvoiceItem(
+                id=uuid.uuid4(),
+                hs_code="0101.2100",
+                product_description=f"Benchmark Product {n}",
+                rate="18%",
+                uom="Numbers, pieces, units",
+                quantity=Decimal("3.0000"),
+                total_values=Decimal("1180.00"),
+                value_sales_excluding_st=Decimal("1000.00"),
+                fixed_notified_value=Decimal("0.00"),
+                sales_tax_applicable=Decimal("180.00"),
+                sales_tax_withheld=Decimal("0.00"),
+                extra_tax="",
+                further_tax=Decimal("0.00"),
+                sro_schedule_no="",
+                fed_payable=Decimal("0.00"),
+                discount=Decimal("0.00"),
+                sale_type="Goods at standard rate (default)",
+                sro_item_serial_no="",
+            )
+            for n in range(item_count)
+        ],
+    )
+
+
+def invoice_create_payload(item_count: int) -> dict:
+    """Raw JSON body of a create request with `item_count` line items."""
+    return {
+        "invoice_ref_no": "INV-000123",
+        "invoice_date": "2026-02-08",
+        "invoice_type": "Sale Invoice",
+        "buyer_business_name": "Benchmark Buyer",
+        "buyer_ntn_cnic": "9999999999999",
+        "buyer_province": "Sindh",
+        "buyer_address": "Karachi",
+        "buyer_registration_type": "Registered",
+        "items": [
+            {
+                "hs_code": "0101.2100",
+                "product_description": f"Benchmark Product {n}",
+                "quantity": 3.0,
+                "uom": "Numbers, pieces, units",
+                "rate": "18%",
+                "total_values": "1180.00",
+                "value_sales_excluding_st": 1000.0,
+                "sales_tax_applicable": "180.00",
+            }
+            for n in range(item_count)
+        ],
+    }
+
+
+@pytest.fixture(scope="module", params=ITEM_COUNTS, ids=lambda n: f"{n}_items")
+def invoice(request) -> Invoice:
+    """One invoice per size in ITEM_COUNTS."""
+    return build_invoice(request.param)
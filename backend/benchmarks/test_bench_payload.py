@@ -0,0 +1,23 @@
+"""Benchmarks for building the FBR request body."""
+
+import pytest
+
+from app.services.fbr_service import FBRService
+from app.services.mock_fbr_service import MockFBRService
+
+
+@pytest.fixture(scope="module")
+def fbr_service() -> FBRService:
+    return FBRService()
+
+
+def test_fbr_build_payload(benchmark, fbr_service, invoice):
+    """Real client: serialized IRIS JSON bytes."""
+    body = benchmark(fbr_service._build_payload, invoice)
+    assert body.startswith(b"{")
+
+
+def test_mock_build_payload(benchmark, invoice):
+    """Mock client: payload dict."""
+    payload = benchmark(MockFBRService()._build_payload, invoice)
+    assert len(payload["Items"]) == len(invoice.items)
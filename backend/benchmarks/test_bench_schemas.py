@@ -0,0 +1,25 @@
+"""Benchmarks for request validation and response conversion."""
+
+import pytest
+
+from app.routers.invoices import _invoice_to_response, _invoice_to_summary
+from app.schemas.invoice import InvoiceCreate
+from conftest import ITEM_COUNTS, invoice_create_payload
+
+
+def test_invoice_to_response(benchmark, invoice):
+    response = benchmark(_invoice_to_response, invoice)
+    assert response.item_count == len(invoice.items)
+
+
+def test_invoice_to_summary(benchmark, invoice):
+    summary = benchmark(_invoice_to_summary, invoice)
+    assert summary.item_count == len(invoice.items)
+
+
+@pytest.mark.parametrize("item_count", ITEM_COUNTS, ids=lambda n: f"{n}_items")
+def test_invoice_create_validation(benchmark, item_count):
+    """Pydantic validation of a create body, including Decimal coercion per amount."""
+    payload = invoice_create_payload(item_count)
+    invoice = benchmark(InvoiceCreate.model_validate, payload)
+    assert len(invoice.items) == item_count
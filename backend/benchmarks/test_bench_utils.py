@@ -0,0 +1,29 @@
+"""Benchmarks for small helpers on every request path."""
+
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.common import coerce_decimal
+from app.utils.invoice_ref import suggest_next_ref_no
+from app.utils.security import create_access_token, decode_access_token
+
+
+@pytest.mark.parametrize("value", ["1180.00", 1180, 1180.5, Decimal("1180.00")], ids=lambda v: type(v).__name__)
+def test_coerce_decimal(benchmark, value):
+    assert benchmark(coerce_decimal, value) == Decimal(str(value))
+
+
+@pytest.mark.parametrize("ref_no", ["1005", "INV-2026-000999", "INV-A"])
+def test_suggest_next_ref_no(benchmark, ref_no):
+    benchmark(suggest_next_ref_no, ref_no)
+
+
+def test_decode_access_token(benchmark):
+    token, _ = create_access_token(
+        "00000000-0000-0000-0000-000000000001",
+        "00000000-0000-0000-0000-000000000002",
+        "bench@example.com",
+    )
+    payload = benchmark(decode_access_token, token)
+    assert payload["email"] == "bench@example.com"
@@ -0,0 +1,24 @@
+"""
+End-to-end load test for the create -> submit pipeline.
+
+Seeds load-test tenants and users, drives Poisson arrivals of login,
+create, list and submit requests against a running API, and writes a JSON
+report (throughput, p50/p95/p99 per operation, DB pool usage, FBR latency)
+that can be compared across commits.
+
+It can also replay the timing shape of real traffic: `export` reads an
+anonymized trace from submission_attempts, and `replay` plays it back at a
+speed-up against the API and a mock gateway fitted to the trace.
+
+Usage:
+    python -m scripts.loadtest seed --tenants 5 --users 4
+    python -m scripts.loadtest run --rate create=20 --rate submit=15 --rate list=5 \\
+        --duration 60 --start-gateway 8900 --output results/run.json
+    python -m scripts.loadtest export --since 2026-09-25 --until 2026-10-01 --output traces/month-end.json
+    python -m scripts.loadtest replay traces/month-end.json --speed 10 --start-gateway 8900
+    python -m scripts.loadtest compare results/before.json results/after.json
+    python -m scripts.loadtest cleanup
+
+Run the API against the mock gateway (see README, "Mock FBR Gateway") so
+submissions never leave the machine.
+"""
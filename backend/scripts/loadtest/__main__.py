@@ -0,0 +1,210 @@
+"""Command line entry point; see the package docstring for usage."""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parents[2]))
+
+from scripts.loadtest import seed as seeding
+from scripts.loadtest.replay import ReplayRunner, export_trace, gateway_profile
+from scripts.loadtest.report import compare
+from scripts.loadtest.runner import OPERATIONS, LoadProfile, LoadRunner
+
+
+def _rate(value: str) -> tuple[str, float]:
+    operation, _, rate = value.partition("=")
+    if operation not in OPERATIONS:
+        raise argparse.ArgumentTypeError(f"operation must be one of {', '.join(OPERATIONS)}")
+    try:
+        return operation, float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rate: {value}")
+
+
+@asynccontextmanager
+async def _gateway(port: int | None, profile: dict[str, Any]) -> AsyncIterator[str | None]:
+    """Serve the mock gateway in-process on `port` (if given) and yield its URL."""
+    if port is None:
+        yield None
+        return
+
+    import uvicorn
+
+    from app.services.mock_fbr_gateway import GatewayProfile, create_app
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(GatewayProfile(**profile)),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+def _profile(args: argparse.Namespace) -> LoadProfile:
+    profile = LoadProfile(
+        max_in_flight=args.max_in_flight,
+        submit_mode=args.submit_mode,
+        seed=args.seed,
+    )
+    if getattr(args, "rate", None):
+        profile.rates = dict(args.rate)
+    return profile
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    credentials = [
+        (seeding.user_email(t, u), seeding.PASSWORD)
+        for t in range(args.tenants)
+        for u in range(args.users)
+    ]
+    profile = _profile(args)
+    profile.duration_seconds = args.duration
+    profile.items_per_invoice = args.items
+
+    async with _gateway(args.start_gateway, {}) as started_url:
+        runner = LoadRunner(args.base_url, credentials, profile, gateway_url=started_url or args.gateway_url)
+        return await runner.run()
+
+
+async def _replay(args: argparse.Namespace) -> dict:
+    trace = json.loads(args.trace.read_text())
+    tenants = args.tenants or trace["meta"]["tenants"]
+    credentials = [(seeding.user_email(t, 0), seeding.PASSWORD) for t in range(tenants)]
+
+    async with _gateway(args.start_gateway, gateway_profile(trace)) as started_url:
+        runner = ReplayRunner(
+            args.base_url,
+            credentials,
+            trace,
+            args.speed,
+            _profile(args),
+            gateway_url=started_url or args.gateway_url,
+            configure_gateway=started_url is None and not args.keep_gateway_profile,
+        )
+        return await runner.run()
+
+
+def _write_report(report: dict, output: Path | None) -> None:
+    text = json.dumps(report, indent=2)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(text)
+        print(f"Report written to {output}")
+    else:
+        print(text)
+
+
+def _timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _speed(value: str) -> float:
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+def _add_traffic_arguments(command: argparse.ArgumentParser) -> None:
+    command.add_argument("--base-url", default="http://127.0.0.1:8000")
+    command.add_argument("--max-in-flight", type=int, default=200)
+    command.add_argument("--submit-mode", choices=["sync", "async"], default="sync")
+    command.add_argument("--seed", type=int)
+    command.add_argument("--gateway-url", help="Mock gateway to collect stats from")
+    command.add_argument(
+        "--start-gateway", type=int, metavar="PORT", help="Serve the mock gateway in-process on PORT"
+    )
+    command.add_argument("--output", type=Path, help="Report path (default: stdout)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.loadtest", description="Invoice API load test")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="Create load-test tenants and users")
+    seed_cmd.add_argument("--tenants", type=int, default=5)
+    seed_cmd.add_argument("--users", type=int, default=4, help="Users per tenant")
+
+    run_cmd = commands.add_parser("run", help="Drive traffic and write a JSON report")
+    _add_traffic_arguments(run_cmd)
+    run_cmd.add_argument("--tenants", type=int, default=5)
+    run_cmd.add_argument("--users", type=int, default=4, help="Users per tenant")
+    run_cmd.add_argument(
+        "--rate", type=_rate, action="append", metavar="OP=RPS", help=f"Arrival rate, OP in {OPERATIONS}"
+    )
+    run_cmd.add_argument("--duration", type=float, default=60.0, help="Seconds")
+    run_cmd.add_argument("--items", type=int, default=3, help="Line items per invoice")
+
+    export_cmd = commands.add_parser("export", help="Export an anonymized trace from submission_attempts")
+    export_cmd.add_argument("--since", type=_timestamp, required=True, help="ISO timestamp (UTC if naive)")
+    export_cmd.add_argument("--until", type=_timestamp, required=True, help="ISO timestamp (UTC if naive)")
+    export_cmd.add_argument("--output", type=Path, required=True)
+
+    replay_cmd = commands.add_parser("replay", help="Replay an exported trace and write a JSON report")
+    replay_cmd.add_argument("trace", type=Path)
+    replay_cmd.add_argument("--speed", type=_speed, default=1.0, help="Time compression, e.g. 1 to 20")
+    replay_cmd.add_argument("--tenants", type=int, help="Load-test tenants to map onto (default: as in trace)")
+    replay_cmd.add_argument(
+        "--keep-gateway-profile",
+        action="store_true",
+        help="Leave the --gateway-url gateway's profile as is instead of fitting it to the trace",
+    )
+    _add_traffic_arguments(replay_cmd)
+
+    compare_cmd = commands.add_parser("compare", help="Compare two reports; exit 1 on regression")
+    compare_cmd.add_argument("before", type=Path)
+    compare_cmd.add_argument("after", type=Path)
+    compare_cmd.add_argument("--threshold", type=float, default=10.0, help="Percent")
+
+    commands.add_parser("cleanup", help="Delete load-test tenants and their data")
+
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        credentials = asyncio.run(seeding.seed(args.tenants, args.users))
+        print(f"{len(credentials)} load-test users ready (password: {seeding.PASSWORD})")
+    elif args.command == "run":
+        _write_report(asyncio.run(_run(args)), args.output)
+    elif args.command == "export":
+        trace = asyncio.run(export_trace(args.since, args.until))
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(trace))
+        meta = trace["meta"]
+        print(
+            f"{meta['invoices']} invoices, {meta['attempts']} attempts from {meta['tenants']} tenants "
+            f"written to {args.output}; seed with --tenants {meta['tenants']}"
+        )
+    elif args.command == "replay":
+        _write_report(asyncio.run(_replay(args)), args.output)
+    elif args.command == "compare":
+        before = json.loads(args.before.read_text())
+        after = json.loads(args.after.read_text())
+        lines, regressed = compare(before, after, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    elif args.command == "cleanup":
+        print(f"Deleted {asyncio.run(seeding.cleanup())} load-test tenants")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
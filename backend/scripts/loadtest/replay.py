@@ -0,0 +1,193 @@
+"""
+Replay of production traffic shape from the submission_attempts ledger.
+
+export_trace() reads one window of the ledger and keeps only its timing
+shape. Each invoice's first attempt becomes an arrival; for each invoice
+the trace keeps its tenant, item count and every attempt's latency,
+outcome and HTTP status. Tenants are renumbered in order of first
+appearance. Invoice ids, reference numbers, NTNs, payloads and absolute
+timestamps are dropped.
+
+ReplayRunner recreates each arrival against an API at the trace's own
+offsets, divided by the speed-up. Every arrival creates a draft with the
+same number of items, for a seeded load-test tenant, and submits it. The
+mock gateway is configured from the trace (gateway_profile): it gets the
+latency median and p99, and the timeout, 429 and 5xx rates. Arrivals that
+were rejected in production are sent with the ERROR_TEST scenario, so
+they are rejected again.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+from sqlalchemy import func, select
+
+from app.database import async_session_maker
+from app.models import Invoice, InvoiceItem, SubmissionAttempt, SubmissionOutcome
+from scripts.loadtest.report import percentile
+from scripts.loadtest.runner import LoadProfile, LoadRunner
+
+_NO_RESPONSE = {SubmissionOutcome.TIMEOUT.value, SubmissionOutcome.UNKNOWN.value}
+_REJECTED = {SubmissionOutcome.VALIDATION_ERROR.value, SubmissionOutcome.AUTH_ERROR.value}
+
+
+async def export_trace(since: datetime, until: datetime) -> dict[str, Any]:
+    """
+    Export the anonymized timing shape of submissions in [since, until).
+
+    Returns:
+        {"meta": {...}, "events": [{"t", "tenant", "items", "attempts"}]},
+        with events ordered by arrival and `t` in seconds from the first one
+    """
+    item_count = (
+        select(func.count())
+        .where(InvoiceItem.invoice_id == SubmissionAttempt.invoice_id)
+        .correlate(SubmissionAttempt)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            SubmissionAttempt.invoice_id,
+            SubmissionAttempt.attempted_at,
+            SubmissionAttempt.outcome,
+            SubmissionAttempt.http_status,
+            SubmissionAttempt.response_time_ms,
+            Invoice.tenant_id,
+            item_count.label("items"),
+        )
+        .join(Invoice, Invoice.id == SubmissionAttempt.invoice_id)
+        .where(SubmissionAttempt.attempted_at >= since, SubmissionAttempt.attempted_at < until)
+        .order_by(SubmissionAttempt.attempted_at)
+        .execution_options(yield_per=5000)
+    )
+
+    tenants: dict[Any, int] = {}
+    events: dict[Any, dict[str, Any]] = {}
+    first_at: datetime | None = None
+    async with async_session_maker() as db:
+        async for row in await db.stream(stmt):
+            if first_at is None:
+                first_at = row.attempted_at
+            event = events.get(row.invoice_id)
+            if event is None:
+                event = events[row.invoice_id] = {
+                    "t": round((row.attempted_at - first_at).total_seconds(), 3),
+                    "tenant": tenants.setdefault(row.tenant_id, len(tenants)),
+                    "items": row.items,
+                    "attempts": [],
+                }
+            event["attempts"].append(
+                {
+                    "latency_ms": row.response_time_ms,
+                    "outcome": row.outcome.value,
+                    "http_status": row.http_status,
+                }
+            )
+
+    ordered = list(events.values())
+    return {
+        "meta": {
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "window_seconds": (until - since).total_seconds(),
+            "duration_seconds": ordered[-1]["t"] if ordered else 0.0,
+            "invoices": len(ordered),
+            "attempts": sum(len(e["attempts"]) for e in ordered),
+            "tenants": len(tenants),
+        },
+        "events": ordered,
+    }
+
+
+def gateway_profile(trace: dict[str, Any]) -> dict[str, Any]:
+    """Mock gateway profile (GatewayProfile fields) matching the trace's FBR behaviour."""
+    attempts = [attempt for event in trace["events"] for attempt in event["attempts"]]
+    if not attempts:
+        return {}
+    latencies = sorted(
+        a["latency_ms"]
+        for a in attempts
+        if a["latency_ms"] is not None and a["outcome"] not in _NO_RESPONSE
+    )
+    total = len(attempts)
+    profile: dict[str, Any] = {
+        "latency": "lognormal",
+        "timeout_rate": round(sum(a["outcome"] in _NO_RESPONSE for a in attempts) / total, 4),
+        "rate_limit_rate": round(sum(a["http_status"] == 429 for a in attempts) / total, 4),
+        "server_error_rate": round(sum((a["http_status"] or 0) >= 500 for a in attempts) / total, 4),
+    }
+    if latencies:
+        profile["latency_median_ms"] = percentile(latencies, 50)
+        profile["latency_p99_ms"] = percentile(latencies, 99)
+    return profile
+
+
+class ReplayRunner(LoadRunner):
+    """Replays a trace's arrivals instead of generating Poisson traffic."""
+
+    def __init__(
+        self,
+        base_url: str,
+        credentials: list[tuple[str, str]],
+        trace: dict[str, Any],
+        speed: float,
+        profile: LoadProfile,
+        gateway_url: str | None = None,
+        configure_gateway: bool = True,
+    ):
+        super().__init__(base_url, credentials, profile, gateway_url=gateway_url)
+        self.trace = trace
+        self.speed = speed
+        self.configure_gateway = configure_gateway
+        self._lag_ms: list[float] = []
+
+    def _duration(self) -> float:
+        return self.trace["meta"]["duration_seconds"] / self.speed
+
+    async def _replay(self, client: httpx.AsyncClient, event: dict[str, Any]) -> None:
+        email, password = self.credentials[event["tenant"] % len(self.credentials)]
+        if email not in self._headers:
+            await self._login(client, email, password)
+            if email not in self._headers:
+                return
+        scenario_id = "ERROR_TEST" if event["attempts"][0]["outcome"] in _REJECTED else "SN000"
+        invoice_id = await self._create_draft(client, email, max(1, event["items"]), scenario_id)
+        if invoice_id is not None:
+            await self._submit_draft(client, email, invoice_id)
+
+    async def _drive(self, client: httpx.AsyncClient, end: float) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for event in self.trace["events"]:
+            due = start + event["t"] / self.speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._lag_ms.append(max(0.0, loop.time() - due) * 1000)
+            if len(self._tasks) >= self.profile.max_in_flight:
+                self.recorder.dropped["replay"] += 1
+                continue
+            task = asyncio.create_task(self._replay(client, event))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def run(self) -> dict[str, Any]:
+        """Replay the trace and return the report."""
+        fitted = gateway_profile(self.trace)
+        if self.gateway_url and self.configure_gateway:
+            async with httpx.AsyncClient() as client:
+                response = await client.put(f"{self.gateway_url}/__mock/profile", json=fitted)
+                response.raise_for_status()
+
+        report = await super().run()
+        lags = sorted(self._lag_ms)
+        report["meta"]["trace"] = self.trace["meta"]
+        report["replay"] = {
+            "speed": self.speed,
+            "events": len(self.trace["events"]),
+            "gateway_profile": fitted,
+            "dispatch_lag_p99_ms": round(percentile(lags, 99) or 0.0, 1),
+            "dispatch_lag_max_ms": round(lags[-1], 1) if lags else 0.0,
+        }
+        return report
@@ -0,0 +1,116 @@
+"""Load-test statistics, JSON report and cross-run comparison."""
+
+import math
+import subprocess
+from collections import Counter
+from typing import Any
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Latencies and status codes per operation."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, Counter[str]] = {}
+        self.dropped: Counter[str] = Counter()
+        self.skipped: Counter[str] = Counter()
+
+    def record(self, operation: str, elapsed_ms: float, status: int | None, ok: bool) -> None:
+        """Record one completed request (status None for transport errors)."""
+        self.latencies.setdefault(operation, []).append(elapsed_ms)
+        counter = self.statuses.setdefault(operation, Counter())
+        counter[str(status) if status is not None else "error"] += 1
+        counter["ok" if ok else "failed"] += 1
+
+    def summarize(self, duration_seconds: float) -> dict[str, Any]:
+        """Per-operation throughput and latency percentiles."""
+        endpoints = {}
+        for operation, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            statuses = self.statuses[operation]
+            endpoints[operation] = {
+                "count": len(ordered),
+                "ok": statuses["ok"],
+                "errors": statuses["failed"],
+                "dropped": self.dropped[operation],
+                "skipped": self.skipped[operation],
+                "throughput_rps": round(statuses["ok"] / duration_seconds, 2),
+                "mean_ms": round(sum(ordered) / len(ordered), 1),
+                "p50_ms": round(percentile(ordered, 50), 1),
+                "p95_ms": round(percentile(ordered, 95), 1),
+                "p99_ms": round(percentile(ordered, 99), 1),
+                "max_ms": round(ordered[-1], 1),
+                "status_codes": {k: v for k, v in statuses.items() if k not in ("ok", "failed")},
+            }
+        return endpoints
+
+
+def summarize_pool(samples: list[dict[str, int]]) -> dict[str, Any]:
+    """Peak and mean connection pool usage over the run."""
+    if not samples:
+        return {"samples": 0}
+    checked_out = [s["checked_out"] for s in samples]
+    return {
+        "samples": len(samples),
+        "size": samples[-1]["size"],
+        "checked_out_max": max(checked_out),
+        "checked_out_mean": round(sum(checked_out) / len(checked_out), 2),
+        "overflow_max": max(s["overflow"] for s in samples),
+    }
+
+
+def git_commit() -> str | None:
+    """Current commit, so reports can be compared across commits."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before: dict[str, Any], after: dict[str, Any], threshold_pct: float) -> tuple[list[str], bool]:
+    """
+    Compare two reports operation by operation.
+
+    Returns:
+        Table lines, and whether any throughput drop or p95/p99 rise
+        exceeds threshold_pct
+    """
+    lines = [
+        f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}",
+        f"{'operation':<10} {'metric':<15} {'before':>10} {'after':>10} {'change':>9}",
+    ]
+    regressed = False
+    for operation in sorted(set(before["endpoints"]) | set(after["endpoints"])):
+        old = before["endpoints"].get(operation)
+        new = after["endpoints"].get(operation)
+        if not old or not new:
+            lines.append(f"{operation:<10} only in {'after' if new else 'before'}")
+            continue
+        for metric, higher_is_better in (
+            ("throughput_rps", True),
+            ("p50_ms", False),
+            ("p95_ms", False),
+            ("p99_ms", False),
+        ):
+            a, b = old[metric], new[metric]
+            change = (b - a) / a * 100 if a else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if metric != "p50_ms" and worse > threshold_pct:
+                regressed = True
+                flag = "  REGRESSION"
+            lines.append(f"{operation:<10} {metric:<15} {a:>10} {b:>10} {change:>+8.1f}%{flag}")
+    return lines, regressed
@@ -0,0 +1,250 @@
+"""Open-loop traffic generator for the invoice API."""
+
+import asyncio
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from scripts.loadtest.report import Recorder, git_commit, summarize_pool
+
+OPERATIONS = ("login", "create", "list", "submit")
+
+
+@dataclass
+class LoadProfile:
+    """Arrival rates (requests per second per operation) and run shape."""
+
+    rates: dict[str, float] = field(default_factory=lambda: {"create": 10.0, "submit": 8.0, "list": 2.0})
+    duration_seconds: float = 60.0
+    max_in_flight: int = 200
+    items_per_invoice: int = 3
+    submit_mode: str = "sync"
+    page_size: int = 20
+    sample_interval_seconds: float = 1.0
+    seed: int | None = None
+
+
+def draft_payload(ref_no: str, items: int, scenario_id: str = "SN000") -> dict[str, Any]:
+    """A valid draft invoice with `items` line items."""
+    return {
+        "invoice_ref_no": ref_no,
+        "scenario_id": scenario_id,
+        "invoice_date": datetime.now(timezone.utc).date().isoformat(),
+        "invoice_type": "Sale Invoice",
+        "buyer_business_name": "Load Test Buyer",
+        "buyer_ntn_cnic": "9999999999999",
+        "buyer_province": "Punjab",
+        "buyer_address": "1 Load Test Road, Lahore",
+        "buyer_registration_type": "Registered",
+        "items": [
+            {
+                "hs_code": "0000.0000",
+                "product_description": f"Load test item {n}",
+                "quantity": 2.0,
+                "uom": "PCS",
+                "rate": "10%",
+                "total_values": 220.0,
+                "value_sales_excluding_st": 200.0,
+                "sales_tax_applicable": 20.0,
+            }
+            for n in range(items)
+        ],
+    }
+
+
+class LoadRunner:
+    """Drives Poisson arrivals of each operation against a running API."""
+
+    def __init__(
+        self,
+        base_url: str,
+        credentials: list[tuple[str, str]],
+        profile: LoadProfile,
+        gateway_url: str | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api = f"{self.base_url}/api/v1"
+        self.credentials = credentials
+        self.profile = profile
+        self.gateway_url = gateway_url.rstrip("/") if gateway_url else None
+        self.rng = random.Random(profile.seed)
+        self.recorder = Recorder()
+        self.run_id = uuid.uuid4().hex[:6].upper()
+        self._headers: dict[str, dict[str, str]] = {}
+        self._drafts: dict[str, deque[str]] = {email: deque() for email, _ in credentials}
+        self._tasks: set[asyncio.Task] = set()
+        self._pool_samples: list[dict[str, int]] = []
+        self._counter = 0
+
+    async def _timed(self, client: httpx.AsyncClient, operation: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(operation, (time.perf_counter() - started) * 1000, None, False)
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.recorder.record(operation, elapsed_ms, response.status_code, response.is_success)
+        return response
+
+    async def _login(self, client: httpx.AsyncClient, email: str, password: str) -> None:
+        response = await self._timed(
+            client, "login", "POST", f"{self.api}/auth/login", json={"email": email, "password": password}
+        )
+        if response is not None and response.is_success:
+            self._headers[email] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def _create_draft(
+        self, client: httpx.AsyncClient, email: str, items: int, scenario_id: str = "SN000"
+    ) -> str | None:
+        self._counter += 1
+        ref_no = f"LT-{self.run_id}-{self._counter:07d}"
+        response = await self._timed(
+            client,
+            "create",
+            "POST",
+            f"{self.api}/invoices",
+            json=draft_payload(ref_no, items, scenario_id),
+            headers=self._headers[email],
+        )
+        if response is not None and response.status_code == 201:
+            return response.json()["id"]
+        return None
+
+    async def _submit_draft(self, client: httpx.AsyncClient, email: str, invoice_id: str) -> None:
+        await self._timed(
+            client,
+            "submit",
+            "POST",
+            f"{self.api}/invoices/{invoice_id}/submit",
+            params={"mode": self.profile.submit_mode},
+            headers=self._headers[email],
+        )
+
+    async def _create(self, client: httpx.AsyncClient, email: str) -> None:
+        invoice_id = await self._create_draft(client, email, self.profile.items_per_invoice)
+        if invoice_id is not None:
+            self._drafts[email].append(invoice_id)
+
+    async def _list(self, client: httpx.AsyncClient, email: str) -> None:
+        await self._timed(
+            client,
+            "list",
+            "GET",
+            f"{self.api}/invoices",
+            params={"page": self.rng.randint(1, 3), "page_size": self.profile.page_size},
+            headers=self._headers[email],
+        )
+
+    async def _submit(self, client: httpx.AsyncClient, email: str) -> None:
+        if not self._drafts[email]:
+            self.recorder.skipped["submit"] += 1
+            return
+        await self._submit_draft(client, email, self._drafts[email].popleft())
+
+    async def _dispatch(self, client: httpx.AsyncClient, operation: str) -> None:
+        email, password = self.rng.choice(self.credentials)
+        if operation == "login" or email not in self._headers:
+            await self._login(client, email, password)
+            if operation == "login" or email not in self._headers:
+                return
+        await getattr(self, f"_{operation}")(client, email)
+
+    async def _arrivals(self, client: httpx.AsyncClient, operation: str, rate: float, end: float) -> None:
+        """Open-loop Poisson arrivals: requests are not held back by slow responses."""
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while True:
+            next_at += self.rng.expovariate(rate)
+            if next_at >= end:
+                return
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+            if len(self._tasks) >= self.profile.max_in_flight:
+                self.recorder.dropped[operation] += 1
+                continue
+            task = asyncio.create_task(self._dispatch(client, operation))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _metrics(self, client: httpx.AsyncClient) -> dict[str, Any] | None:
+        try:
+            response = await client.get(f"{self.api}/health/metrics")
+            return response.json() if response.is_success else None
+        except httpx.HTTPError:
+            return None
+
+    async def _sample(self, client: httpx.AsyncClient, end: float) -> None:
+        loop = asyncio.get_running_loop()
+        while loop.time() < end:
+            metrics = await self._metrics(client)
+            if metrics and "db_pool" in metrics:
+                self._pool_samples.append(metrics["db_pool"])
+            await asyncio.sleep(self.profile.sample_interval_seconds)
+
+    def _duration(self) -> float:
+        return self.profile.duration_seconds
+
+    async def _drive(self, client: httpx.AsyncClient, end: float) -> None:
+        """Generate traffic until `end` (event loop time)."""
+        await asyncio.gather(
+            *(
+                self._arrivals(client, operation, rate, end)
+                for operation, rate in self.profile.rates.items()
+                if rate > 0
+            )
+        )
+
+    async def run(self) -> dict[str, Any]:
+        """Run the load test and return the report."""
+        limits = httpx.Limits(max_connections=self.profile.max_in_flight + 10)
+        started_at = datetime.now(timezone.utc)
+        async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(120.0)) as client:
+            # Warm up: one login per user, not part of the measured window
+            for email, password in self.credentials:
+                await self._login(client, email, password)
+            self.recorder = Recorder()
+            if self.gateway_url:
+                await client.post(f"{self.gateway_url}/__mock/reset")
+
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            end = start + self._duration()
+            await asyncio.gather(self._sample(client, end), self._drive(client, end))
+            if self._tasks:
+                await asyncio.wait(set(self._tasks))
+            elapsed = loop.time() - start
+
+            metrics = await self._metrics(client) or {}
+            gateway = None
+            if self.gateway_url:
+                gateway = (await client.get(f"{self.gateway_url}/__mock/stats")).json()
+
+        endpoints = self.recorder.summarize(elapsed)
+        total = sum(e["count"] for e in endpoints.values())
+        return {
+            "meta": {
+                "commit": git_commit(),
+                "started_at": started_at.isoformat(),
+                "base_url": self.base_url,
+                "users": len(self.credentials),
+                "profile": asdict(self.profile),
+            },
+            "summary": {
+                "duration_seconds": round(elapsed, 2),
+                "requests": total,
+                "throughput_rps": round(total / elapsed, 2),
+                "errors": sum(e["errors"] for e in endpoints.values()),
+                "dropped": sum(self.recorder.dropped.values()),
+            },
+            "endpoints": endpoints,
+            "db_pool": summarize_pool(self._pool_samples),
+            "fbr_latency": metrics.get("fbr_latency"),
+            "fbr_circuit": metrics.get("fbr_circuit"),
+            "gateway": gateway,
+        }
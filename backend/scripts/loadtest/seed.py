@@ -0,0 +1,67 @@
+"""Load-test tenants and users."""
+
+from sqlalchemy import delete, select
+
+from app.database import async_session_maker
+from app.models import Tenant, User
+from app.utils.security import hash_password
+
+TENANT_PREFIX = "Load Test Tenant"
+PASSWORD = "loadtest-password"
+
+
+def user_email(tenant_index: int, user_index: int) -> str:
+    return f"loadtest-{tenant_index}-{user_index}@example.com"
+
+
+async def seed(tenants: int, users_per_tenant: int) -> list[tuple[str, str]]:
+    """
+    Create missing load-test tenants and users (idempotent).
+
+    Returns:
+        (email, password) of every load-test user
+    """
+    password_hash = hash_password(PASSWORD)
+    credentials = []
+    async with async_session_maker() as db:
+        for t in range(tenants):
+            seller_ntn = f"99{t:011d}"
+            tenant = (
+                await db.execute(select(Tenant).where(Tenant.seller_ntn == seller_ntn))
+            ).scalar_one_or_none()
+            if tenant is None:
+                tenant = Tenant(
+                    seller_ntn=seller_ntn,
+                    business_name=f"{TENANT_PREFIX} {t}",
+                    province="Punjab",
+                    address="Load Test Street, Lahore",
+                    fbr_token=None,
+                )
+                db.add(tenant)
+                await db.flush()
+
+            existing = set(
+                (await db.scalars(select(User.email).where(User.tenant_id == tenant.id))).all()
+            )
+            for u in range(users_per_tenant):
+                email = user_email(t, u)
+                if email not in existing:
+                    db.add(
+                        User(
+                            tenant_id=tenant.id,
+                            email=email,
+                            password_hash=password_hash,
+                            full_name=f"Load Test User {t}-{u}",
+                        )
+                    )
+                credentials.append((email, PASSWORD))
+        await db.commit()
+    return credentials
+
+
+async def cleanup() -> int:
+    """Delete load-test tenants; users, invoices and attempts cascade."""
+    async with async_session_maker() as db:
+        result = await db.execute(delete(Tenant).where(Tenant.business_name.like(f"{TENANT_PREFIX} %")))
+        await db.commit()
+    return result.rowcount
@@ -1,6 +1,7 @@
 """Test configuration and fixtures."""
 
-from collections.abc import AsyncGenerator
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
 import pytest
 import pytest_asyncio
@@ -58,3 +59,66 @@ async def client_with_mock_fbr(
     
     # Clean up override
     app.dependency_overrides.clear()
+
+
+# Test credentials (from scripts/seed_user.py)
+TEST_EMAIL = "test@example.com"
+TEST_PASSWORD = "password123"
+
+
+async def login_headers(client: AsyncClient) -> dict[str, str]:
+    """Log in as the seeded test user and return auth headers."""
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def draft_invoice_payload(**overrides) -> dict:
+    """Return a valid draft invoice payload with a unique reference."""
+    payload = {
+        "invoice_ref_no": f"INV-TEST-{uuid.uuid4().hex[:8].upper()}",
+        "invoice_date": "2026-02-08",
+        "invoice_type": "Sale Invoice",
+        "buyer_business_name": "Test Buyer",
+        "buyer_ntn_cnic": "9999999999999",
+        "buyer_province": "Punjab",
+        "buyer_address": "123 Test St",
+        "buyer_registration_type": "Registered",
+        "items": [
+            {
+                "hs_code": "0000.0000",
+                "product_description": "Test Widget",
+                "quantity": 2.0,
+                "uom": "PCS",
+                "rate": "10%",
+                "total_values": 220.0,
+                "value_sales_excluding_st": 200.0,
+                "sales_tax_applicable": 20.0,
+            }
+        ],
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture
+def create_draft() -> Callable[[AsyncClient, dict[str, str]], Awaitable[str]]:
+    """
+    Factory that creates a draft invoice through the API and returns its id.
+
+    Example:
+        async def test_something(client, create_draft):
+            headers = await login_headers(client)
+            invoice_id = await create_draft(client, headers)
+    """
+
+    async def _create(client: AsyncClient, headers: dict[str, str], **overrides) -> str:
+        response = await client.post(
+            "/api/v1/invoices", json=draft_invoice_payload(**overrides), headers=headers
+        )
+        assert response.status_code == 201, f"Create failed: {response.text}"
+        return response.json()["id"]
+
+    return _create
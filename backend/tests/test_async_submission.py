@@ -0,0 +1,54 @@
+"""Tests for asynchronous (202 Accepted) invoice submission."""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from conftest import login_headers
+
+
+@pytest.mark.asyncio
+async def test_async_submit_returns_job_handle(client_with_mock_fbr, create_draft):
+    """mode=async should queue the invoice and return 202 with a pollable job."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+
+    submit_response = await client.post(
+        f"/api/v1/invoices/{invoice_id}/submit?mode=async", headers=headers
+    )
+    assert submit_response.status_code == 202, submit_response.text
+    job = submit_response.json()
+    assert job["invoice_id"] == invoice_id
+    assert job["status"] == "queued"
+    assert submit_response.headers["Location"] == f"/api/v1/submissions/{job['job_id']}"
+
+    # The in-process background task has run by the time the ASGI call returns
+    status_response = await client.get(f"/api/v1/submissions/{job['job_id']}", headers=headers)
+    assert status_response.status_code == 200
+    result = status_response.json()
+    assert result["status"] in ["succeeded", "failed"]
+    assert result["invoice_status"] in ["submitted", "failed"]
+
+
+@pytest.mark.asyncio
+async def test_async_submit_blocks_second_submission(client_with_mock_fbr, create_draft):
+    """A queued invoice is no longer a draft and cannot be submitted again."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+
+    first = await client.post(f"/api/v1/invoices/{invoice_id}/submit?mode=async", headers=headers)
+    assert first.status_code == 202
+
+    second = await client.post(f"/api/v1/invoices/{invoice_id}/submit", headers=headers)
+    assert second.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_submission_job(client: AsyncClient):
+    """Unknown job ids return 404."""
+    headers = await login_headers(client)
+    response = await client.get(f"/api/v1/submissions/{uuid.uuid4()}", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,122 @@
+"""Tests for the submission attempt ledger writer."""
+
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice, SubmissionAttempt, SubmissionOutcome
+from app.services.attempt_ledger import AttemptLedger
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import SUBMISSION_OUTCOME_UNKNOWN, FBRService
+from app.services.rate_limiter import FBRRateLimiter
+from conftest import login_headers
+
+
+def _ledger(**overrides) -> AttemptLedger:
+    settings = get_settings().model_copy(update=overrides)
+    return AttemptLedger(settings=settings)
+
+
+async def _load(attempt_id: UUID) -> SubmissionAttempt:
+    async with async_session_maker() as db:
+        return await db.get(SubmissionAttempt, attempt_id)
+
+
+@pytest.mark.asyncio
+async def test_write_ahead_row_is_durable_before_close(client, create_draft):
+    """open() commits an UNKNOWN row that other sessions can see immediately."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    ledger = _ledger(attempt_ledger_flush_mode="immediate")
+
+    attempt_id, attempted_at = await ledger.open(invoice_id, 1, "https://fbr.example")
+
+    row = await _load(attempt_id)
+    assert row.outcome == SubmissionOutcome.UNKNOWN
+    assert row.attempted_at == attempted_at
+    assert row.diagnostic_id == attempt_id.hex[:8]
+
+    await ledger.close(
+        attempt_id,
+        SubmissionOutcome.SUCCESS,
+        http_status=200,
+        response_time_ms=120,
+        response_summary='{"Code": 100}',
+    )
+
+    row = await _load(attempt_id)
+    assert row.outcome == SubmissionOutcome.SUCCESS
+    assert row.http_status == 200
+    assert row.response_time_ms == 120
+    assert row.response_summary == '{"Code": 100}'
+
+
+@pytest.mark.asyncio
+async def test_batched_mode_defers_response_summary(client, create_draft):
+    """In batched mode the outcome is written at once and the summary on flush."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    ledger = _ledger(
+        attempt_ledger_flush_mode="batched",
+        attempt_ledger_flush_interval_seconds=60.0,
+    )
+
+    attempt_id, _ = await ledger.open(invoice_id, 1, "https://fbr.example")
+    await ledger.close(attempt_id, SubmissionOutcome.TIMEOUT, response_summary="ReadTimeout")
+
+    row = await _load(attempt_id)
+    assert row.outcome == SubmissionOutcome.TIMEOUT
+    assert row.response_summary == ""
+
+    assert await ledger.flush() == 1
+    row = await _load(attempt_id)
+    assert row.response_summary == "ReadTimeout"
+
+    await ledger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unreadable_success_body_stays_unknown(client, create_draft):
+    """A 200 whose body is not JSON is recorded once, as UNKNOWN, and not resent."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    async with async_session_maker() as db:
+        invoice = (
+            await db.execute(
+                select(Invoice)
+                .where(Invoice.id == invoice_id)
+                .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+            )
+        ).scalar_one()
+
+    calls = 0
+
+    def gateway(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, content=b'{"invoiceNumber": "FBR-1",}')
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False}
+    )
+    service = FBRService(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(gateway)),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+        ledger=_ledger(attempt_ledger_flush_mode="immediate"),
+    )
+    response = await service.submit_invoice(invoice)
+    await service.client.aclose()
+
+    assert response["error"] == SUBMISSION_OUTCOME_UNKNOWN
+    assert calls == 1
+    async with async_session_maker() as db:
+        attempts = (
+            await db.scalars(select(SubmissionAttempt).where(SubmissionAttempt.invoice_id == invoice_id))
+        ).all()
+    assert [(a.outcome, a.http_status) for a in attempts] == [(SubmissionOutcome.UNKNOWN, 200)]
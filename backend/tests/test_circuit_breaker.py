@@ -0,0 +1,108 @@
+"""Tests for the FBR circuit breaker."""
+
+import pytest
+
+from app.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **overrides) -> CircuitBreaker:
+    settings = get_settings().model_copy(
+        update={
+            "fbr_breaker_enabled": True,
+            "fbr_breaker_window_seconds": 60.0,
+            "fbr_breaker_failure_rate": 0.5,
+            "fbr_breaker_min_calls": 4,
+            "fbr_breaker_open_seconds": 30.0,
+            **overrides,
+        }
+    )
+    return CircuitBreaker(settings=settings, clock=clock)
+
+
+def test_opens_when_failure_rate_crosses_threshold():
+    """The circuit stays closed below min_calls and opens at the failure rate."""
+    breaker = _breaker(FakeClock())
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(30.0)
+
+
+def test_old_failures_leave_the_window():
+    """Failures older than the window don't count towards the rate."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 61.0
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()["window_calls"] == 4
+
+
+def test_half_open_allows_one_probe_then_closes():
+    """After the cool-down a single probe is allowed; success closes the circuit."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    assert not breaker.allows_traffic()
+
+    clock.now = 30.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    """A failing half-open probe re-opens the circuit for another cool-down."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 30.0
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_after() == pytest.approx(30.0)
+
+
+def test_disabled_breaker_never_rejects():
+    """With the breaker disabled every call is allowed."""
+    breaker = _breaker(FakeClock(), fbr_breaker_enabled=False)
+    for _ in range(10):
+        breaker.record_failure()
+
+    breaker.before_call()
+    assert breaker.allows_traffic()
@@ -0,0 +1,75 @@
+"""Tests that FBR submissions do not hold pooled database connections."""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker, engine
+from app.models import Invoice, SubmissionAttempt, SubmissionOutcome
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import FBRService
+from app.services.rate_limiter import FBRRateLimiter
+from conftest import login_headers
+
+# More concurrent submissions than the default pool (5 + 10 overflow) can serve
+IN_FLIGHT = 20
+
+
+@pytest.mark.asyncio
+async def test_pool_stays_free_while_submissions_are_in_flight(client, create_draft):
+    """Blocked FBR calls leave every pooled connection available."""
+    headers = await login_headers(client)
+    invoice_ids = [await create_draft(client, headers) for _ in range(IN_FLIGHT)]
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Invoice)
+            .where(Invoice.id.in_(invoice_ids))
+            .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+        )
+        invoices = list(result.scalars().all())
+
+    entered = 0
+    all_in_flight = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_gateway(request: httpx.Request) -> httpx.Response:
+        nonlocal entered
+        entered += 1
+        if entered == len(invoices):
+            all_in_flight.set()
+        await release.wait()
+        return httpx.Response(200, json={"Code": 100})
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False}
+    )
+    service = FBRService(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(slow_gateway)),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+    )
+
+    tasks = [asyncio.create_task(service.submit_invoice(invoice)) for invoice in invoices]
+    try:
+        await asyncio.wait_for(all_in_flight.wait(), timeout=10)
+
+        assert engine.pool.checkedout() == 0
+        async with async_session_maker() as db:
+            assert (await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=2)).scalar() == 1
+    finally:
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        await service.client.aclose()
+
+    assert all("error" not in response for response in responses)
+
+    async with async_session_maker() as db:
+        outcomes = await db.scalars(
+            select(SubmissionAttempt.outcome).where(SubmissionAttempt.invoice_id.in_(invoice_ids))
+        )
+        assert set(outcomes.all()) == {SubmissionOutcome.SUCCESS}
@@ -0,0 +1,191 @@
+"""Tests for FBR record/replay cassettes."""
+
+from uuid import UUID
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice, SubmissionAttempt, SubmissionOutcome
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_cassette import CassetteMissError, RecordingTransport, ReplayTransport
+from app.services.fbr_service import SUBMISSION_OUTCOME_UNKNOWN, FBRService
+from app.services.mock_fbr_gateway import GatewayProfile, create_app
+from app.services.rate_limiter import FBRRateLimiter
+from app.services.retry_policy import RetryPolicy
+from app.services.tenant_credentials import TenantTokenCache
+from conftest import login_headers
+
+URL = "https://gw.fbr.gov.pk/di_data/v1/di/postinvoicedata_sb"
+# IRIS sometimes answers with trailing commas; the cassette must keep them
+QUIRKY_BODY = b'{"validationResponse": {"statusCode": "00", "status": "Valid",},}'
+
+
+class SleepRecorder:
+    def __init__(self) -> None:
+        self.calls: list[float] = []
+
+    async def __call__(self, seconds: float) -> None:
+        self.calls.append(seconds)
+
+
+def _entry(request: dict, elapsed_ms: float, **outcome) -> dict:
+    return {
+        "method": "POST",
+        "path": "/di_data/v1/di/postinvoicedata_sb",
+        "request_body": orjson.dumps(request).decode(),
+        "elapsed_ms": elapsed_ms,
+        **outcome,
+    }
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    """Recorded bodies replay byte-for-byte; credentials are not recorded."""
+    cassette = tmp_path / "fbr.jsonl"
+    gateway = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=QUIRKY_BODY, headers={"Content-Type": "application/json"})
+    )
+    async with httpx.AsyncClient(transport=RecordingTransport(cassette, transport=gateway)) as client:
+        recorded = await client.post(
+            URL,
+            json={"invoiceDate": "2026-02-08", "invoiceRefNo": ""},
+            headers={"Authorization": "Bearer secret-token"},
+        )
+    assert recorded.content == QUIRKY_BODY
+    assert b"secret-token" not in cassette.read_bytes()
+
+    sleep = SleepRecorder()
+    replay = ReplayTransport(cassette, ignore_fields=["invoiceDate"], sleep=sleep)
+    async with httpx.AsyncClient(transport=replay) as client:
+        # Same request on a later day, keys in a different order
+        replayed = await client.post(URL, json={"invoiceRefNo": "", "invoiceDate": "2026-10-16"})
+    assert replayed.status_code == 200
+    assert replayed.content == QUIRKY_BODY
+    assert replayed.headers["Content-Type"] == "application/json"
+    assert len(sleep.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_latency_timeouts_and_misses(tmp_path):
+    """Recorded latencies are slept (scaled), long ones time out, errors re-raise."""
+    cassette = tmp_path / "fbr.jsonl"
+    cassette.write_bytes(
+        b"\n".join(
+            orjson.dumps(entry)
+            for entry in (
+                _entry({"n": 1}, 420.0, status=200, headers={}, body="{}"),
+                _entry({"n": 1}, 380.0, status=500, headers={}, body="oops"),
+                _entry({"n": 2}, 12000.0, status=200, headers={}, body="{}"),
+                _entry({"n": 3}, 30000.0, error="ReadTimeout", message="timed out"),
+            )
+        )
+    )
+    sleep = SleepRecorder()
+    replay = ReplayTransport(cassette, latency_scale=0.5, sleep=sleep)
+    async with httpx.AsyncClient(transport=replay, timeout=httpx.Timeout(30.0, read=5.0)) as client:
+        # Identical requests get their recordings in order, then the last repeats
+        statuses = [(await client.post(URL, json={"n": 1})).status_code for _ in range(3)]
+        assert statuses == [200, 500, 500]
+        assert sleep.calls == [0.21, 0.19, 0.19]
+
+        with pytest.raises(httpx.ReadTimeout):
+            await client.post(URL, json={"n": 2})
+        assert sleep.calls[-1] == 5.0
+
+        replay.latency_scale = 0.0
+        with pytest.raises(httpx.ReadTimeout):
+            await client.post(URL, json={"n": 3})
+
+        with pytest.raises(CassetteMissError):
+            await client.post(URL, json={"n": 4})
+    assert replay.misses == [("POST", "/di_data/v1/di/postinvoicedata_sb")]
+
+
+@pytest.mark.asyncio
+async def test_fbr_service_replays_offline(client, create_draft, tmp_path):
+    """A submission recorded through the gateway replays with the same result and latency."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    async with async_session_maker() as db:
+        invoice = (
+            await db.execute(
+                select(Invoice)
+                .where(Invoice.id == invoice_id)
+                .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+            )
+        ).scalar_one()
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False, "fbr_auth_token": "test-token"}
+    )
+
+    def service(transport: httpx.AsyncBaseTransport) -> FBRService:
+        return FBRService(
+            client=httpx.AsyncClient(transport=transport),
+            rate_limiter=FBRRateLimiter(settings=settings),
+            breaker=CircuitBreaker(settings=settings),
+            retry_policy=RetryPolicy(settings, rng=lambda: 0.0),
+            tokens=TenantTokenCache(settings=settings),
+        )
+
+    cassette = tmp_path / "fbr.jsonl"
+    gateway = httpx.ASGITransport(app=create_app(GatewayProfile(latency="fixed", latency_median_ms=0)))
+    recorded = await service(RecordingTransport(cassette, transport=gateway)).submit_invoice(invoice)
+
+    sleep = SleepRecorder()
+    replay = ReplayTransport(cassette, ignore_fields=["invoiceDate"], sleep=sleep)
+    replayed = await service(replay).submit_invoice(invoice)
+
+    assert "error" not in recorded
+    assert replayed == recorded
+    assert replayed["validationResponse"]["statusCode"] == "00"
+    recorded_ms = orjson.loads(cassette.read_bytes().splitlines()[0])["elapsed_ms"]
+    assert sleep.calls == [recorded_ms / 1000]
+    assert not replay.misses
+
+
+@pytest.mark.asyncio
+async def test_cassette_miss_is_not_sent(client, create_draft, tmp_path):
+    """A request missing from the cassette fails as a connection error, not an unknown outcome."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    async with async_session_maker() as db:
+        invoice = (
+            await db.execute(
+                select(Invoice)
+                .where(Invoice.id == invoice_id)
+                .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+            )
+        ).scalar_one()
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False, "fbr_auth_token": "test-token"}
+    )
+    cassette = tmp_path / "empty.jsonl"
+    cassette.write_bytes(b"")
+    replay = ReplayTransport(cassette, sleep=SleepRecorder())
+    service = FBRService(
+        client=httpx.AsyncClient(transport=replay),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+        retry_policy=RetryPolicy(settings, rng=lambda: 0.0),
+        tokens=TenantTokenCache(settings=settings),
+    )
+    response = await service.submit_invoice(invoice)
+
+    assert replay.misses
+    assert response["error"] != SUBMISSION_OUTCOME_UNKNOWN
+    async with async_session_maker() as db:
+        outcomes = set(
+            (
+                await db.scalars(
+                    select(SubmissionAttempt.outcome).where(SubmissionAttempt.invoice_id == invoice_id)
+                )
+            ).all()
+        )
+    assert outcomes == {SubmissionOutcome.NETWORK_ERROR}
@@ -0,0 +1,45 @@
+"""Tests for the process-wide FBR client registry."""
+
+import pytest
+
+from app.config import get_settings
+from app.services.fbr_client import FBRClientRegistry, build_fbr_client
+from app.services.fbr_service import FBRService
+
+
+@pytest.mark.asyncio
+async def test_build_fbr_client_uses_settings() -> None:
+    """Client timeouts come from Settings."""
+    settings = get_settings()
+    client = build_fbr_client(settings)
+
+    assert client.timeout.connect == settings.fbr_connect_timeout_seconds
+    assert client.timeout.read == float(settings.fbr_timeout_seconds)
+    assert client.timeout.pool == settings.fbr_pool_timeout_seconds
+    assert client.headers["Authorization"] == f"Bearer {settings.fbr_auth_token}"
+
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_registry_returns_shared_service() -> None:
+    """The registry hands out one service instance per process."""
+    registry = FBRClientRegistry()
+
+    first = registry.get_service()
+    second = registry.get_service()
+    assert first is second
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_service_does_not_close_shared_client() -> None:
+    """Closing a service built on the shared client leaves the pool open."""
+    registry = FBRClientRegistry()
+    service = FBRService(client=registry.client)
+
+    await service.close()
+    assert not registry.client.is_closed
+
+    await registry.aclose()
@@ -0,0 +1,89 @@
+"""Tests for the FBR payload serializer."""
+
+import json
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.invoice import BuyerRegistrationType, InvoiceType
+from app.services.fbr_payload import ITEM_FIELDS, serialize_payload
+
+
+def _item(**overrides) -> SimpleNamespace:
+    item = SimpleNamespace(
+        hs_code="0101.2100",
+        product_description="Test Product",
+        rate="18%",
+        uom="Numbers, pieces, units",
+        quantity=Decimal("3.0000"),
+        total_values=Decimal("1180.00"),
+        value_sales_excluding_st=Decimal("1000.00"),
+        fixed_notified_value=Decimal("0.00"),
+        sales_tax_applicable=Decimal("180.00"),
+        sales_tax_withheld=Decimal("0.00"),
+        extra_tax="",
+        further_tax=Decimal("0.00"),
+        sro_schedule_no=None,
+        fed_payable=Decimal("0.00"),
+        discount=Decimal("0.00"),
+        sale_type=None,
+        sro_item_serial_no=None,
+    )
+    for key, value in overrides.items():
+        setattr(item, key, value)
+    return item
+
+
+def _invoice(items) -> SimpleNamespace:
+    return SimpleNamespace(
+        invoice_type=InvoiceType.SALE,
+        invoice_date=date(2026, 2, 8),
+        tenant=SimpleNamespace(
+            seller_ntn="123-4567",
+            business_name="Seller Ltd",
+            province="Punjab",
+            address="Lahore",
+        ),
+        buyer_ntn_cnic="99999-9999999-9",
+        buyer_business_name="Test Buyer",
+        buyer_province="Sindh",
+        buyer_address="Karachi",
+        buyer_registration_type=BuyerRegistrationType.REGISTERED,
+        invoice_ref_no="INV-001",
+        scenario_id="SN001",
+        items=items,
+    )
+
+
+def test_payload_matches_iris_structure():
+    """Keys and defaults follow the IRIS spec."""
+    payload = json.loads(serialize_payload(_invoice([_item()])))
+
+    assert payload["sellerNTNCNIC"] == "1234567"
+    assert payload["buyerNTNCNIC"] == "9999999999999"
+    assert payload["invoiceRefNo"] == ""
+    assert payload["invoiceDate"] == "2026-02-08"
+    item = payload["items"][0]
+    assert list(item) == [key for key, _ in ITEM_FIELDS]
+    assert item["extraTax"] == 0
+    assert item["saleType"] == "Goods at standard rate (default)"
+    assert item["sroScheduleNo"] == ""
+
+
+def test_decimals_are_exact():
+    """Large amounts are written digit-for-digit, with no float round-off."""
+    body = serialize_payload(
+        _invoice([_item(total_values=Decimal("12345678901234567.89"), extra_tax="0.10")])
+    )
+
+    assert b'"totalValues":12345678901234567.89' in body
+    assert b'"extraTax":0.10' in body
+    assert b'"quantity":3.0000' in body
+
+
+def test_non_finite_amount_is_rejected():
+    """NaN cannot be expressed in JSON and must not be sent."""
+    with pytest.raises(TypeError):
+        serialize_payload(_invoice([_item(discount=Decimal("NaN"))]))
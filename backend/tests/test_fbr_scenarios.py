@@ -132,7 +132,7 @@ async def test_fbr_scenarios(client: AsyncClient):
             invoice_obj = result.scalars().first()
             
             if invoice_obj:
-                validation_result = await fbr_service.validate_invoice(invoice_obj, session)
+                validation_result = await fbr_service.validate_invoice(invoice_obj)
                 print(f"Validation Result: {validation_result}")
             else:
                 print("Could not fetch invoice for validation")
@@ -25,6 +25,7 @@ async def test_readiness_check(client: AsyncClient) -> None:
     data = response.json()
     assert data["ready"] is True
     assert "timestamp" in data
+    assert data["fbr_circuit"]["state"] in {"closed", "open", "half_open"}
 
 
 @pytest.mark.asyncio
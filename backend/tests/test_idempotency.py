@@ -0,0 +1,62 @@
+"""Tests for Idempotency-Key replay on invoice create and submit."""
+
+import uuid
+
+import pytest
+
+from conftest import draft_invoice_payload, login_headers
+
+
+@pytest.mark.asyncio
+async def test_create_replays_first_response(client):
+    """A retried create returns the stored invoice instead of a 409 or a second draft."""
+    headers = await login_headers(client)
+    headers["Idempotency-Key"] = str(uuid.uuid4())
+    payload = draft_invoice_payload()
+
+    first = await client.post("/api/v1/invoices", json=payload, headers=headers)
+    assert first.status_code == 201, first.text
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = await client.post("/api/v1/invoices", json=payload, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # Same key, different body
+    other = await client.post("/api/v1/invoices", json=draft_invoice_payload(), headers=headers)
+    assert other.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_submit_replay_does_not_call_fbr_again(client_with_mock_fbr, create_draft):
+    """A retried submit is answered from the stored response without a second FBR call."""
+    client, mock_service = client_with_mock_fbr
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+
+    calls = 0
+    submit = mock_service.submit_invoice
+
+    async def counting_submit(invoice, db=None):
+        nonlocal calls
+        calls += 1
+        return await submit(invoice, db)
+
+    mock_service.submit_invoice = counting_submit
+
+    headers["Idempotency-Key"] = str(uuid.uuid4())
+    first = await client.post(f"/api/v1/invoices/{invoice_id}/submit", headers=headers)
+    assert first.status_code == 200, first.text
+
+    retry = await client.post(f"/api/v1/invoices/{invoice_id}/submit", headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert calls == 1
+
+    # Without a key the retry is a real request and the invoice is no longer a draft
+    del headers["Idempotency-Key"]
+    again = await client.post(f"/api/v1/invoices/{invoice_id}/submit", headers=headers)
+    assert again.status_code == 400
+    assert calls == 1
@@ -0,0 +1,79 @@
+"""Tests for page-number and keyset (cursor) pagination of GET /invoices."""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.invoice_service import InvalidCursorError, decode_cursor, encode_cursor
+from conftest import login_headers
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque URL-safe strings that decode to (created_at, id)."""
+    invoice = SimpleNamespace(
+        created_at=datetime(2026, 10, 16, 9, 30, 15, 123456, tzinfo=timezone.utc), id=uuid.uuid4()
+    )
+    cursor = encode_cursor(invoice)
+    assert "=" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == (invoice.created_at, invoice.id)
+
+    for garbage in ("not-a-cursor", "W10", encode_cursor(invoice)[:-3]):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(garbage)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_numbered_pages(client, create_draft):
+    """Following cursors walks the same newest-first order as page numbers, without overlap."""
+    headers = await login_headers(client)
+    for _ in range(5):
+        await create_draft(client, headers)
+
+    numbered = []
+    for page in (1, 2, 3):
+        response = await client.get(
+            "/api/v1/invoices", params={"page": page, "page_size": 2, "status": "draft"}, headers=headers
+        )
+        assert response.status_code == 200
+        numbered += [item["id"] for item in response.json()["items"]]
+
+    walked = []
+    cursor = ""
+    for _ in range(3):
+        response = await client.get(
+            "/api/v1/invoices",
+            params={"cursor": cursor, "page_size": 2, "status": "draft"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert "total" not in body
+        walked += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        assert cursor is not None
+    assert walked == numbered
+    assert len(set(walked)) == 6
+
+    # A numbered page hands over to cursors seamlessly
+    first = (
+        await client.get(
+            "/api/v1/invoices", params={"page": 1, "page_size": 2, "status": "draft"}, headers=headers
+        )
+    ).json()
+    second = (
+        await client.get(
+            "/api/v1/invoices",
+            params={"cursor": first["next_cursor"], "page_size": 2, "status": "draft"},
+            headers=headers,
+        )
+    ).json()
+    assert [item["id"] for item in second["items"]] == numbered[2:4]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(client):
+    headers = await login_headers(client)
+    response = await client.get("/api/v1/invoices", params={"cursor": "bogus"}, headers=headers)
+    assert response.status_code == 400
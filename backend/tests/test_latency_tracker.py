@@ -0,0 +1,79 @@
+"""Tests for adaptive FBR timeouts."""
+
+import pytest
+
+from app.config import get_settings
+from app.services.latency_tracker import LatencyTracker
+
+URL = "https://fbr.example/postinvoicedata"
+
+
+def _tracker(**overrides) -> LatencyTracker:
+    settings = get_settings().model_copy(
+        update={
+            "fbr_timeout_seconds": 30,
+            "fbr_adaptive_timeout_enabled": True,
+            "fbr_adaptive_timeout_multiplier": 3.0,
+            "fbr_adaptive_timeout_min_seconds": 2.0,
+            "fbr_latency_window_size": 100,
+            "fbr_latency_min_samples": 10,
+            **overrides,
+        }
+    )
+    return LatencyTracker(settings=settings)
+
+
+def test_static_timeout_until_enough_samples():
+    """The configured timeout applies until the window has min_samples."""
+    tracker = _tracker()
+    for _ in range(9):
+        tracker.record(URL, 500)
+
+    assert tracker.read_timeout(URL) == 30.0
+
+
+def test_timeout_is_bounded_multiple_of_p99():
+    """With a healthy gateway the read timeout tracks p99 x multiplier."""
+    tracker = _tracker()
+    for ms in range(1, 101):
+        tracker.record(URL, ms * 10)  # 10ms .. 1000ms
+
+    stats = tracker.percentiles(URL)
+    assert stats["p95"] == 950
+    assert stats["p99"] == 990
+    assert tracker.read_timeout(URL) == pytest.approx(2.97)
+
+
+def test_timeout_is_clamped():
+    """Very fast or very slow gateways stay within [min, fbr_timeout_seconds]."""
+    fast = _tracker()
+    slow = _tracker()
+    for _ in range(20):
+        fast.record(URL, 50)
+        slow.record(URL, 25_000)
+
+    assert fast.read_timeout(URL) == 2.0
+    assert slow.read_timeout(URL) == 30.0
+
+
+def test_window_keeps_recent_samples():
+    """Old latencies roll out of the window."""
+    tracker = _tracker(fbr_latency_window_size=10)
+    for _ in range(10):
+        tracker.record(URL, 9_000)
+    for _ in range(10):
+        tracker.record(URL, 100)
+
+    assert tracker.percentiles(URL)["p99"] == 100
+    assert tracker.snapshot()["endpoints"][URL]["samples"] == 10
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_latency(client):
+    """GET /health/metrics exposes the latency snapshot."""
+    response = await client.get("/api/v1/health/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "endpoints" in data["fbr_latency"]
+    assert data["fbr_circuit"]["state"] in {"closed", "open", "half_open"}
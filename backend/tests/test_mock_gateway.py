@@ -0,0 +1,109 @@
+"""Tests for the standalone mock FBR gateway."""
+
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import SUBMISSION_REJECTED, FBRService
+from app.services.mock_fbr_gateway import GatewayProfile, MockGateway, create_app
+from app.services.rate_limiter import FBRRateLimiter
+from app.services.retry_policy import RetryPolicy
+from conftest import login_headers
+
+URL = "http://mock-fbr/di_data/v1/di/postinvoicedata_sb"
+AUTH = {"Authorization": "Bearer sandbox-token"}
+
+
+async def _no_sleep(seconds: float) -> None:
+    return None
+
+
+def _client(profile: GatewayProfile) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(profile, sleep=_no_sleep)))
+
+
+def test_latency_profiles():
+    """Lognormal draws centre on the median with the configured tail."""
+    gateway = MockGateway(GatewayProfile(latency_median_ms=100, latency_p99_ms=1000, seed=7))
+    samples = sorted(gateway.latency_seconds() * 1000 for _ in range(5000))
+    assert 85 < samples[2500] < 115
+    assert 700 < samples[4950] < 1400
+
+    fixed = MockGateway(GatewayProfile(latency="fixed", latency_median_ms=40))
+    assert fixed.latency_seconds() == 0.04
+
+
+@pytest.mark.asyncio
+async def test_gateway_speaks_iris():
+    """Scenario IDs, auth and injected faults produce IRIS-shaped answers."""
+    async with _client(GatewayProfile(latency="fixed", latency_median_ms=0)) as client:
+        valid = await client.post(URL, json={"scenarioId": "SN001", "items": [{}, {}]}, headers=AUTH)
+        assert valid.status_code == 200
+        body = valid.json()
+        assert body["validationResponse"]["statusCode"] == "00"
+        assert [s["invoiceNo"] for s in body["validationResponse"]["invoiceStatuses"]] == [
+            f"{body['invoiceNumber']}-1",
+            f"{body['invoiceNumber']}-2",
+        ]
+
+        rejected = await client.post(URL, json={"scenarioId": "ERROR_TEST", "items": []}, headers=AUTH)
+        assert rejected.json()["validationResponse"]["statusCode"] == "01"
+
+        unauthorized = await client.post(URL, json={"items": []})
+        assert unauthorized.status_code == 401
+        assert unauthorized.json()["validationResponse"]["errorCode"] == "0401"
+
+        stats = (await client.get("http://mock-fbr/__mock/stats")).json()
+        assert stats["outcomes"] == {"success": 1, "validation_error": 1, "auth_error": 1}
+
+    throttled_profile = GatewayProfile(latency="fixed", latency_median_ms=0, rate_limit_rate=1.0)
+    async with _client(throttled_profile) as client:
+        throttled = await client.post(URL, json={"items": []}, headers=AUTH)
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_real_service_end_to_end(client, create_draft):
+    """The real FBRService submits through the gateway and sees rejections as failures."""
+    headers = await login_headers(client)
+    accepted_id = UUID(await create_draft(client, headers))
+    rejected_id = UUID(await create_draft(client, headers))
+
+    async with async_session_maker() as db:
+        await db.execute(update(Invoice).where(Invoice.id == rejected_id).values(scenario_id="ERROR_TEST"))
+        await db.commit()
+        invoices = {
+            invoice.id: invoice
+            for invoice in (
+                await db.execute(
+                    select(Invoice)
+                    .where(Invoice.id.in_([accepted_id, rejected_id]))
+                    .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+                )
+            ).scalars()
+        }
+
+    settings = get_settings().model_copy(update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False})
+    gateway_app = create_app(GatewayProfile(latency="fixed", latency_median_ms=0), sleep=_no_sleep)
+    service = FBRService(
+        client=httpx.AsyncClient(transport=httpx.ASGITransport(app=gateway_app)),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+        retry_policy=RetryPolicy(settings, rng=lambda: 0.0),
+    )
+
+    accepted = await service.submit_invoice(invoices[accepted_id])
+    assert "error" not in accepted
+    assert accepted["validationResponse"]["statusCode"] == "00"
+
+    rejected = await service.submit_invoice(invoices[rejected_id])
+    assert rejected["error"] == SUBMISSION_REJECTED
+    assert gateway_app.state.gateway.stats()["requests"] == 2
@@ -0,0 +1,111 @@
+"""Tests for frozen submission payloads."""
+
+import hashlib
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice, SubmissionAttempt
+from app.services.attempt_ledger import AttemptLedger, load_payload
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import FBRService
+from app.services.rate_limiter import FBRRateLimiter
+from app.services.retry_policy import RetryPolicy
+from conftest import login_headers
+
+
+@pytest.mark.asyncio
+async def test_store_and_load_round_trip():
+    """Bodies are stored once per hash and come back byte-for-byte."""
+    ledger = AttemptLedger()
+    body = b'{"items":[{"totalValues":1180.00}]}'
+
+    sha256 = await ledger.store_payload(body)
+    assert sha256 == hashlib.sha256(body).hexdigest()
+    assert await ledger.store_payload(body) == sha256
+
+    async with async_session_maker() as db:
+        assert await load_payload(db, sha256) == body
+        assert await load_payload(db, "0" * 64) is None
+
+
+@pytest.mark.asyncio
+async def test_retries_send_the_frozen_body(client, create_draft):
+    """Every attempt sends identical bytes and references the same snapshot."""
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Invoice)
+            .where(Invoice.id == UUID(invoice_id))
+            .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+        )
+        invoice = result.scalar_one()
+
+    sent: list[bytes] = []
+
+    def gateway(request: httpx.Request) -> httpx.Response:
+        sent.append(request.content)
+        if len(sent) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"Code": 100})
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False}
+    )
+    service = FBRService(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(gateway)),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+        retry_policy=RetryPolicy(settings=settings, rng=lambda: 0.0),
+    )
+    response = await service.submit_invoice(invoice)
+    await service.client.aclose()
+
+    assert "error" not in response
+    assert len(sent) == 2 and sent[0] == sent[1]
+
+    async with async_session_maker() as db:
+        attempts = (
+            await db.scalars(
+                select(SubmissionAttempt)
+                .where(SubmissionAttempt.invoice_id == invoice.id)
+                .order_by(SubmissionAttempt.attempt_number)
+            )
+        ).all()
+    assert {a.payload_sha256 for a in attempts} == {hashlib.sha256(sent[0]).hexdigest()}
+
+    export = await client.get(
+        f"/api/v1/submissions/attempts/{attempts[0].id}/payload", headers=headers
+    )
+    assert export.status_code == 200
+    assert export.content == sent[0]
+    assert export.headers["X-Payload-SHA256"] == attempts[0].payload_sha256
+
+
+@pytest.mark.asyncio
+async def test_shared_payload_survives_deleting_a_draft(client, create_draft):
+    """Two invoices sending identical bytes share a snapshot that neither owns."""
+    headers = await login_headers(client)
+    first, second = [UUID(await create_draft(client, headers)) for _ in range(2)]
+    ledger = AttemptLedger()
+    body = uuid4().bytes
+
+    sha256 = await ledger.store_payload(body)
+    await ledger.open(first, 1, "https://fbr.example", sha256)
+    await ledger.open(second, 1, "https://fbr.example", await ledger.store_payload(body))
+
+    response = await client.delete(f"/api/v1/invoices/{first}", headers=headers)
+    assert response.status_code == 204, response.text
+
+    async with async_session_maker() as db:
+        sent = await db.scalar(
+            select(SubmissionAttempt.payload_sha256).where(SubmissionAttempt.invoice_id == second)
+        )
+        assert await load_payload(db, sent) == body
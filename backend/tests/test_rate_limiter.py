@@ -0,0 +1,77 @@
+"""Tests for the FBR token-bucket rate limiter."""
+
+import pytest
+
+from app.config import get_settings
+from app.services.rate_limiter import FBRRateLimiter, MemoryCoordinator
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock: FakeClock, **overrides) -> FBRRateLimiter:
+    settings = get_settings().model_copy(
+        update={
+            "fbr_rate_limit_enabled": True,
+            "fbr_global_rate_per_second": 10.0,
+            "fbr_global_burst": 2,
+            "fbr_tenant_rate_per_second": 1.0,
+            "fbr_tenant_burst": 1,
+            **overrides,
+        }
+    )
+    return FBRRateLimiter(coordinator=MemoryCoordinator(clock=clock), settings=settings)
+
+
+@pytest.mark.asyncio
+async def test_burst_is_free_then_callers_wait(monkeypatch):
+    """Calls within the burst don't wait; the next one waits for a refill."""
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr("app.services.rate_limiter.asyncio.sleep", fake_sleep)
+    limiter = _limiter(FakeClock())
+
+    assert await limiter.acquire() == 0.0
+    assert await limiter.acquire() == 0.0
+    assert await limiter.acquire() == pytest.approx(0.1)
+    assert slept == [pytest.approx(0.1)]
+
+
+@pytest.mark.asyncio
+async def test_tenant_bucket_is_independent(monkeypatch):
+    """A busy tenant waits on its own bucket without blocking another tenant."""
+
+    async def fake_sleep(seconds: float) -> None:
+        pass
+
+    monkeypatch.setattr("app.services.rate_limiter.asyncio.sleep", fake_sleep)
+    limiter = _limiter(FakeClock(), fbr_global_burst=100)
+
+    assert await limiter.acquire("tenant-a") == 0.0
+    assert await limiter.acquire("tenant-a") == pytest.approx(1.0)
+    assert await limiter.acquire("tenant-b") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_wait_time_does_not_take_tokens():
+    """wait_time reports the delay without consuming the bucket."""
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    await limiter.acquire()
+    await limiter.acquire()
+    assert await limiter.wait_time() == pytest.approx(0.1)
+    assert await limiter.wait_time() == pytest.approx(0.1)
+
+    clock.now = 0.1
+    assert await limiter.wait_time() == pytest.approx(0.0)
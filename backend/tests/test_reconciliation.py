@@ -0,0 +1,286 @@
+"""Tests for reconciliation of UNKNOWN invoices."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice, InvoiceStatus, SubmissionAttempt, SubmissionJob, SubmissionOutcome
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import SUBMISSION_OUTCOME_UNKNOWN, FBRService
+from app.services.rate_limiter import FBRRateLimiter
+from app.services.reconciliation_service import (
+    classify_reconciliation,
+    reconcile_unknown,
+    recover_orphaned_submissions,
+)
+from app.services.retry_policy import RetryPolicy
+from conftest import login_headers
+
+VALID = {
+    "invoiceNumber": "7000007DI1747119701593",
+    "validationResponse": {"statusCode": "00", "status": "Valid", "error": "", "invoiceStatuses": []},
+}
+INVALID = {
+    "validationResponse": {
+        "statusCode": "01",
+        "status": "Invalid",
+        "errorCode": "0052",
+        "error": "Provide proper HS Code with invoice no. null",
+        "invoiceStatuses": None,
+    }
+}
+ITEM_INVALID = {
+    "validationResponse": {
+        "statusCode": "00",
+        "status": "Invalid",
+        "invoiceStatuses": [
+            {"itemSNo": "1", "statusCode": "00", "status": "Valid", "invoiceNo": "", "errorCode": "", "error": ""},
+            {"itemSNo": "2", "statusCode": "01", "status": "Invalid", "errorCode": "0052", "error": "HS Code"},
+        ],
+    }
+}
+
+
+def test_classify_reconciliation():
+    """Only a lookup resolves SUBMITTED, rejections FAILED, the rest stay unknown."""
+    assert classify_reconciliation(VALID, lookup=True) == InvoiceStatus.SUBMITTED
+    # The validate endpoint may echo an invoice number without having it on record
+    assert classify_reconciliation(VALID) is None
+    assert classify_reconciliation(INVALID) == InvoiceStatus.FAILED
+    assert classify_reconciliation(ITEM_INVALID) == InvoiceStatus.FAILED
+
+    valid_without_number = {"validationResponse": {"statusCode": "00", "status": "Valid"}}
+    assert classify_reconciliation(valid_without_number, lookup=True) is None
+    assert classify_reconciliation({"error": "ReadTimeout"}) is None
+    assert classify_reconciliation({"status_code": 500, "text": "oops"}) is None
+
+
+class ScriptedValidator:
+    """Stands in for FBRService.validate_invoice with canned responses per invoice."""
+
+    def __init__(self, responses: dict[UUID, dict[str, Any]]):
+        self.responses = responses
+        self.payloads: dict[UUID, bytes | None] = {}
+
+    async def validate_invoice(self, invoice: Invoice, payload: bytes | None = None) -> dict[str, Any]:
+        self.payloads[invoice.id] = payload
+        return self.responses.get(invoice.id, {"error": "ReadTimeout"})
+
+
+@pytest.mark.asyncio
+async def test_sweep_resolves_unknown_invoices(client, create_draft):
+    """A sweep moves UNKNOWN invoices set-based and records a reconciliation attempt each."""
+    headers = await login_headers(client)
+    accepted, rejected, echoed, silent = [UUID(await create_draft(client, headers)) for _ in range(4)]
+    invoice_ids = [accepted, rejected, echoed, silent]
+
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Invoice).where(Invoice.id.in_(invoice_ids)).values(status=InvoiceStatus.UNKNOWN)
+        )
+        # FBR accepted an earlier attempt, e.g. of a job that was abandoned afterwards
+        attempt_id = uuid.uuid4()
+        await db.execute(
+            insert(SubmissionAttempt).values(
+                id=attempt_id,
+                invoice_id=accepted,
+                attempt_number=1,
+                endpoint="https://gw.example/di/postinvoicedata",
+                outcome=SubmissionOutcome.SUCCESS,
+                diagnostic_id=attempt_id.hex[:8],
+                response_summary="",
+                attempted_at=datetime.now(timezone.utc) - timedelta(hours=1),
+            )
+        )
+        await db.commit()
+
+    validator = ScriptedValidator({accepted: VALID, rejected: INVALID, echoed: VALID})
+    totals = await reconcile_unknown(validator, chunk_size=2, cooldown_seconds=0)
+    assert totals["claimed"] >= 4
+    assert totals["needs_review"] >= 1
+    # The ledger already has the answer; a valid probe alone proves nothing
+    assert accepted not in validator.payloads
+    assert echoed in validator.payloads
+
+    async with async_session_maker() as db:
+        statuses = dict(
+            (await db.execute(
+                select(Invoice.id, Invoice.status).where(Invoice.id.in_(invoice_ids))
+            )).all()
+        )
+        attempts = dict(
+            (await db.execute(
+                select(SubmissionAttempt.invoice_id, SubmissionAttempt.outcome).where(
+                    SubmissionAttempt.invoice_id.in_(invoice_ids)
+                )
+            )).all()
+        )
+
+    assert statuses == {
+        accepted: InvoiceStatus.SUBMITTED,
+        rejected: InvoiceStatus.FAILED,
+        echoed: InvoiceStatus.NEEDS_REVIEW,
+        silent: InvoiceStatus.UNKNOWN,
+    }
+    assert attempts == {
+        accepted: SubmissionOutcome.SUCCESS,
+        rejected: SubmissionOutcome.VALIDATION_ERROR,
+        echoed: SubmissionOutcome.UNKNOWN,
+        silent: SubmissionOutcome.UNKNOWN,
+    }
+
+    # The inconclusive invoices now have a fresh attempt, so they wait out the cool-down
+    validator.payloads.clear()
+    await reconcile_unknown(validator, cooldown_seconds=3600)
+    assert silent not in validator.payloads
+
+
+@pytest.mark.asyncio
+async def test_inconclusive_probes_stop_at_the_attempt_cap(client, create_draft):
+    """After max_attempts inconclusive probes the invoice moves to NEEDS_REVIEW unprobed."""
+    headers = await login_headers(client)
+    invoice_id = UUID(await create_draft(client, headers))
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Invoice).where(Invoice.id == invoice_id).values(status=InvoiceStatus.UNKNOWN)
+        )
+        await db.commit()
+
+    validator = ScriptedValidator({})
+    for _ in range(2):
+        await reconcile_unknown(validator, cooldown_seconds=0, max_attempts=2)
+        assert invoice_id in validator.payloads
+        validator.payloads.clear()
+
+    totals = await reconcile_unknown(validator, cooldown_seconds=0, max_attempts=2)
+    assert invoice_id not in validator.payloads
+    assert totals["needs_review"] >= 1
+
+    async with async_session_maker() as db:
+        status = (await db.execute(select(Invoice.status).where(Invoice.id == invoice_id))).scalar_one()
+        probes = (
+            await db.scalars(select(SubmissionAttempt.id).where(SubmissionAttempt.invoice_id == invoice_id))
+        ).all()
+    assert status == InvoiceStatus.NEEDS_REVIEW
+    assert len(probes) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_leaves_outcome_unknown(client, create_draft):
+    """A timeout after the request was sent is ambiguous; a refused connection is not."""
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+
+    async with async_session_maker() as db:
+        invoice = (
+            await db.execute(
+                select(Invoice)
+                .where(Invoice.id == UUID(invoice_id))
+                .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+            )
+        ).scalar_one()
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False, "fbr_max_retries": 1}
+    )
+
+    def _service(exc: Exception) -> FBRService:
+        def gateway(request: httpx.Request) -> httpx.Response:
+            raise exc
+
+        return FBRService(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(gateway)),
+            rate_limiter=FBRRateLimiter(settings=settings),
+            breaker=CircuitBreaker(settings=settings),
+            retry_policy=RetryPolicy(settings, rng=lambda: 0.0),
+        )
+
+    timed_out = await _service(httpx.ReadTimeout("slow")).submit_invoice(invoice)
+    assert timed_out["error"] == SUBMISSION_OUTCOME_UNKNOWN
+
+    refused = await _service(httpx.ConnectError("refused")).submit_invoice(invoice)
+    assert refused["error"] == "Submission Failed"
+
+
+@pytest.mark.asyncio
+async def test_recovery_hands_on_orphaned_submissions(client, create_draft):
+    """Submissions abandoned by a dead process are resolved, reconciled or requeued."""
+    headers = await login_headers(client)
+    crashed_mid_call, lost_update, never_sent, in_flight = [
+        UUID(await create_draft(client, headers)) for _ in range(4)
+    ]
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    def _attempt(invoice_id: UUID, outcome: SubmissionOutcome, attempted_at: datetime) -> dict:
+        attempt_id = uuid.uuid4()
+        return {
+            "id": attempt_id,
+            "invoice_id": invoice_id,
+            "attempt_number": 1,
+            "endpoint": "https://gw.example/di/postinvoicedata",
+            "outcome": outcome,
+            "diagnostic_id": attempt_id.hex[:8],
+            "response_summary": "",
+            "attempted_at": attempted_at,
+        }
+
+    async with async_session_maker() as db:
+        # Sync submit: write-ahead row committed, process died, invoice still DRAFT
+        # In-flight: same, but the attempt is recent
+        # Batch claims: QUEUED with a success whose status update was lost, or nothing sent
+        await db.execute(
+            update(Invoice)
+            .where(Invoice.id.in_([lost_update, never_sent]))
+            .values(status=InvoiceStatus.QUEUED, updated_at=long_ago)
+        )
+        await db.execute(
+            insert(SubmissionAttempt),
+            [
+                _attempt(crashed_mid_call, SubmissionOutcome.UNKNOWN, long_ago),
+                _attempt(lost_update, SubmissionOutcome.SUCCESS, long_ago),
+                _attempt(in_flight, SubmissionOutcome.UNKNOWN, datetime.now(timezone.utc)),
+            ],
+        )
+        await db.commit()
+
+    async with async_session_maker() as db:
+        counts = await recover_orphaned_submissions(db, grace_seconds=60)
+    assert counts["unknown"] >= 1 and counts["submitted"] >= 1 and counts["requeued"] >= 1
+
+    async with async_session_maker() as db:
+        statuses = dict(
+            (await db.execute(
+                select(Invoice.id, Invoice.status).where(
+                    Invoice.id.in_([crashed_mid_call, lost_update, never_sent, in_flight])
+                )
+            )).all()
+        )
+        jobs = (await db.scalars(
+            select(SubmissionJob.invoice_id).where(
+                SubmissionJob.invoice_id.in_([crashed_mid_call, lost_update, never_sent, in_flight])
+            )
+        )).all()
+
+    assert statuses == {
+        crashed_mid_call: InvoiceStatus.UNKNOWN,
+        lost_update: InvoiceStatus.SUBMITTED,
+        never_sent: InvoiceStatus.QUEUED,
+        in_flight: InvoiceStatus.DRAFT,
+    }
+    assert jobs == [never_sent]
+
+    # The requeued invoice now has a live job, so a second pass leaves it alone
+    async with async_session_maker() as db:
+        await recover_orphaned_submissions(db, grace_seconds=60)
+        jobs = (await db.scalars(
+            select(SubmissionJob.invoice_id).where(SubmissionJob.invoice_id == never_sent)
+        )).all()
+    assert jobs == [never_sent]
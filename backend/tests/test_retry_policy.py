@@ -0,0 +1,99 @@
+"""Tests for the FBR retry policy."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services.retry_policy import RetryPolicy, parse_retry_after
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _policy(clock: FakeClock, rng=lambda: 1.0, **overrides) -> RetryPolicy:
+    settings = get_settings().model_copy(
+        update={
+            "fbr_max_retries": 5,
+            "fbr_retry_delay_seconds": 1,
+            "fbr_retry_max_delay_seconds": 8.0,
+            "fbr_retry_max_elapsed_seconds": 60.0,
+            "fbr_retry_statuses": [429, 502, 503, 504],
+            "fbr_retry_budget_ratio": 0.2,
+            "fbr_retry_budget_min_per_second": 0.0,
+            "fbr_retry_budget_burst": 100,
+            **overrides,
+        }
+    )
+    return RetryPolicy(settings=settings, clock=clock, rng=rng)
+
+
+def _response(status_code: int, **headers) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers)
+
+
+def test_exponential_backoff_with_full_jitter():
+    """Delays double per retry up to the cap, scaled by the jitter draw."""
+    policy = _policy(FakeClock())
+    assert [policy.backoff(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+
+    jittered = _policy(FakeClock(), rng=lambda: 0.25)
+    assert jittered.backoff(3) == 1.0
+
+
+def test_only_retryable_failures_are_retried():
+    """4xx payload errors are terminal; 503s, timeouts and connect errors retry."""
+    policy = _policy(FakeClock())
+
+    assert policy.begin("t").next_delay(response=_response(400)) is None
+    assert policy.begin("t").next_delay(response=_response(503)) == 1.0
+    assert policy.begin("t").next_delay(exc=httpx.ReadTimeout("slow")) == 1.0
+    assert policy.begin("t").next_delay(exc=httpx.ConnectError("refused")) == 1.0
+    assert policy.begin("t").next_delay(exc=httpx.RemoteProtocolError("reset")) is None
+
+
+def test_retry_after_is_a_lower_bound():
+    """Retry-After (seconds or HTTP-date) overrides a shorter backoff."""
+    policy = _policy(FakeClock())
+
+    assert policy.begin("t").next_delay(response=_response(429, **{"Retry-After": "7"})) == 7.0
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    seconds = parse_retry_after(_response(503, **{"Retry-After": format_datetime(when, usegmt=True)}))
+    assert seconds == pytest.approx(120, abs=2)
+    assert parse_retry_after(_response(503, **{"Retry-After": "soon"})) is None
+
+
+def test_gives_up_after_max_attempts_and_elapsed_time():
+    """Attempts are bounded by count and by total elapsed time."""
+    clock = FakeClock()
+    state = _policy(clock, fbr_max_retries=3).begin("t")
+    assert state.next_delay(response=_response(503)) is not None
+    assert state.next_delay(response=_response(503)) is not None
+    assert state.next_delay(response=_response(503)) is None
+
+    state = _policy(clock, fbr_retry_max_elapsed_seconds=10.0).begin("t")
+    clock.now = 9.5
+    assert state.next_delay(response=_response(503)) is None
+
+
+def test_tenant_retry_budget():
+    """Retries are funded by the tenant's first attempts, independently per tenant."""
+    policy = _policy(FakeClock(), fbr_retry_budget_burst=1, fbr_retry_budget_ratio=0.5)
+
+    assert policy.begin("busy").next_delay(response=_response(503)) is not None
+    assert policy.begin("busy").next_delay(response=_response(503)) is None
+    # Two more first attempts earn one more retry
+    policy.begin("busy")
+    assert policy.begin("busy").next_delay(response=_response(503)) is not None
+
+    assert policy.begin("quiet").next_delay(response=_response(503)) is not None
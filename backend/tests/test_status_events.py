@@ -0,0 +1,154 @@
+"""Tests for invoice status events, the event stream and the long-poll status endpoint."""
+
+import asyncio
+import uuid
+from uuid import UUID
+
+import pytest
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import InvoiceStatus
+from app.services.status_events import (
+    StatusEvent,
+    StatusEventBus,
+    _decode,
+    _encode,
+    get_status_event_bus,
+    record_transitions,
+)
+from conftest import draft_invoice_payload, login_headers
+
+
+def _drain(subscription) -> list[StatusEvent]:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_batch_subscription_follows_its_invoices():
+    """A batch stream sees its invoices' later untagged transitions, and nothing else."""
+    bus = StatusEventBus()
+    tenant, other_tenant = uuid.uuid4(), uuid.uuid4()
+    batch = uuid.uuid4()
+    deferred, unrelated = uuid.uuid4(), uuid.uuid4()
+
+    with bus.subscribe(tenant, batch) as subscription:
+        bus.publish(
+            [
+                StatusEvent(deferred, tenant, InvoiceStatus.QUEUED, batch),
+                StatusEvent(unrelated, tenant, InvoiceStatus.SUBMITTED),
+                StatusEvent(deferred, other_tenant, InvoiceStatus.FAILED, batch),
+                # The job that drained the deferred invoice knows nothing of the batch
+                StatusEvent(deferred, tenant, InvoiceStatus.SUBMITTED),
+            ]
+        )
+        events = _drain(subscription)
+
+    assert [(e.invoice_id, e.status) for e in events] == [
+        (deferred, InvoiceStatus.QUEUED),
+        (deferred, InvoiceStatus.SUBMITTED),
+    ]
+    assert bus.snapshot()["subscribers"] == 0
+
+
+def test_slow_subscriber_is_cut_off():
+    """A full queue is replaced by the end-of-stream sentinel."""
+    settings = get_settings().model_copy(update={"status_stream_queue_size": 2})
+    bus = StatusEventBus(settings=settings)
+    tenant = uuid.uuid4()
+
+    with bus.subscribe(tenant) as subscription:
+        bus.publish(StatusEvent(uuid.uuid4(), tenant, InvoiceStatus.QUEUED) for _ in range(3))
+        assert subscription.overflowed
+        assert _drain(subscription) == [None]
+
+
+def test_notify_payload_round_trip():
+    """Events survive the NOTIFY encoding."""
+    events = [
+        StatusEvent(uuid.uuid4(), uuid.uuid4(), InvoiceStatus.UNKNOWN),
+        StatusEvent(uuid.uuid4(), uuid.uuid4(), InvoiceStatus.SUBMITTED, uuid.uuid4()),
+    ]
+    origin, decoded = _decode(_encode(events))
+    assert decoded == events
+    assert len(_encode(events * 25)) < 8000
+
+
+@pytest.mark.asyncio
+async def test_batch_submit_publishes_transitions(client_with_mock_fbr):
+    """A batch submit streams QUEUED then the outcome for every invoice, tagged with the batch."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+
+    created = []
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/invoices",
+            json=draft_invoice_payload(),
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        created.append(response.json())
+    tenant_id = UUID(created[0]["tenant_id"])
+    invoice_ids = [UUID(c["id"]) for c in created]
+    batch_id = uuid.uuid4()
+
+    with get_status_event_bus().subscribe(tenant_id, batch_id) as subscription:
+        response = await client.post(
+            "/api/v1/invoices/submit-batch",
+            json={"invoice_ids": [str(i) for i in invoice_ids], "batch_id": str(batch_id)},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["batch_id"] == str(batch_id)
+        events = _drain(subscription)
+
+    for invoice_id in invoice_ids:
+        statuses = [e.status for e in events if e.invoice_id == invoice_id]
+        assert statuses[0] == InvoiceStatus.QUEUED
+        assert statuses[-1] == InvoiceStatus.SUBMITTED
+    assert all(e.batch_id == batch_id for e in events)
+
+    # Transitions rolled back are never published
+    with get_status_event_bus().subscribe(tenant_id) as subscription:
+        async with async_session_maker() as db:
+            await record_transitions(db, [StatusEvent(invoice_ids[0], tenant_id, InvoiceStatus.FAILED)])
+            await db.rollback()
+        assert _drain(subscription) == []
+
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_on_transition(client_with_mock_fbr, create_draft):
+    """A parked status poll wakes up as soon as the submit commits."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+    status_url = f"/api/v1/invoices/{invoice_id}/status"
+
+    # Known status differs: immediate answer
+    response = await client.get(status_url, params={"known": "queued", "wait": 30}, headers=headers)
+    assert response.json() == {"invoice_id": invoice_id, "status": "draft", "changed": True}
+
+    # Nothing happens: times out with the same status
+    response = await client.get(status_url, params={"known": "draft", "wait": 1}, headers=headers)
+    assert response.json()["changed"] is False
+
+    async def _submit_later():
+        await asyncio.sleep(0.2)
+        return await client.post(f"/api/v1/invoices/{invoice_id}/submit", headers=headers)
+
+    started = asyncio.get_running_loop().time()
+    polled, submitted = await asyncio.gather(
+        client.get(status_url, params={"known": "draft", "wait": 30}, headers=headers),
+        _submit_later(),
+    )
+    assert submitted.status_code == 200, submitted.text
+    # The submit claims the draft (QUEUED) before it is sent
+    assert polled.json()["changed"] is True
+    assert polled.json()["status"] in ("queued", "submitted")
+    assert asyncio.get_running_loop().time() - started < 10
+
+    response = await client.get(status_url, params={"known": "queued", "wait": 30}, headers=headers)
+    assert response.json() == {"invoice_id": invoice_id, "status": "submitted", "changed": True}
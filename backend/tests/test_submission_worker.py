@@ -0,0 +1,229 @@
+"""Tests for submission job leases (FOR UPDATE SKIP LOCKED claims)."""
+
+import asyncio
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+
+from app.database import async_session_maker
+from app.models import Invoice, InvoiceStatus, SubmissionJob, SubmissionJobStatus, User
+from app.schemas.invoice import InvoiceCreate
+from app.services import invoice_service, submission_service
+from app.services.attempt_ledger import get_attempt_ledger
+
+TEST_EMAIL = "test@example.com"
+
+
+async def _queue_jobs(count: int, enqueue: bool = True) -> list[uuid.UUID]:
+    """Create draft invoices for the seeded tenant and queue them (job ids, or invoice ids)."""
+    async with async_session_maker() as db:
+        user = (await db.execute(select(User).where(User.email == TEST_EMAIL))).scalar_one_or_none()
+        if user is None:
+            pytest.skip("Test user not found - run seed script first")
+        await db.refresh(user, ["tenant"])
+
+        job_ids = []
+        for _ in range(count):
+            data = InvoiceCreate(
+                invoice_ref_no=f"INV-LEASE-{uuid.uuid4().hex[:8].upper()}",
+                invoice_date=datetime.date(2026, 2, 8),
+                buyer_business_name="Test Buyer",
+                buyer_ntn_cnic="9999999999999",
+                buyer_province="Punjab",
+                buyer_address="123 Test St",
+                buyer_registration_type="Registered",
+                items=[
+                    {
+                        "hs_code": "0000.0000",
+                        "product_description": "Test Widget",
+                        "quantity": 1,
+                        "uom": "PCS",
+                        "rate": "10%",
+                        "total_values": 110,
+                    }
+                ],
+            )
+            invoice = await invoice_service.create_invoice(db, user.tenant, data)
+            if not enqueue:
+                await db.commit()
+                job_ids.append(invoice.id)
+                continue
+            job = await submission_service.enqueue_submission(db, user.tenant_id, invoice.id)
+            job_ids.append(job.id)
+
+        return job_ids
+
+
+@pytest.mark.asyncio
+async def test_concurrent_enqueue_creates_one_job():
+    """Two concurrent enqueues of the same draft leave exactly one job."""
+    (invoice_id,) = await _queue_jobs(1, enqueue=False)
+    async with async_session_maker() as db:
+        tenant_id = (await db.execute(select(Invoice.tenant_id).where(Invoice.id == invoice_id))).scalar_one()
+
+    async def enqueue() -> bool:
+        async with async_session_maker() as db:
+            try:
+                await submission_service.enqueue_submission(db, tenant_id, invoice_id)
+            except invoice_service.InvoiceNotDraftError:
+                return False
+            return True
+
+    outcomes = await asyncio.gather(enqueue(), enqueue())
+    assert sorted(outcomes) == [False, True]
+
+    async with async_session_maker() as db:
+        jobs = (
+            await db.scalars(select(SubmissionJob.id).where(SubmissionJob.invoice_id == invoice_id))
+        ).all()
+    assert len(jobs) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sync_submits_send_once():
+    """Two concurrent synchronous submits of the same draft reach FBR once."""
+    (invoice_id,) = await _queue_jobs(1, enqueue=False)
+    async with async_session_maker() as db:
+        tenant_id = (await db.execute(select(Invoice.tenant_id).where(Invoice.id == invoice_id))).scalar_one()
+    fbr = CountingFBRService()
+
+    async def submit() -> bool:
+        async with async_session_maker() as db:
+            try:
+                await invoice_service.submit_invoice(db, tenant_id, invoice_id, fbr)
+            except invoice_service.InvoiceNotDraftError:
+                return False
+            return True
+
+    outcomes = await asyncio.gather(submit(), submit())
+    assert sorted(outcomes) == [False, True]
+    assert fbr.submitted == 1
+
+    async with async_session_maker() as db:
+        status = (await db.execute(select(Invoice.status).where(Invoice.id == invoice_id))).scalar_one()
+    assert status == InvoiceStatus.SUBMITTED
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_claim_disjoint_jobs():
+    """Two workers claiming at the same time never get the same job."""
+    job_ids = await _queue_jobs(4)
+
+    async def claim(owner: str) -> set[uuid.UUID]:
+        async with async_session_maker() as db:
+            return {job.id for job in await submission_service.claim_jobs(db, owner, 100)}
+
+    first, second = await asyncio.gather(claim("worker-a"), claim("worker-b"))
+
+    assert not first & second
+    assert set(job_ids) <= first | second
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed():
+    """A job held by a crashed worker is reclaimed once its lease expires."""
+    await _queue_jobs(1)
+
+    async with async_session_maker() as db:
+        claimed = await submission_service.claim_jobs(db, "crashed-worker", 1)
+        assert claimed
+        job_id = claimed[0].id
+
+        # Simulate the crashed worker's lease running out
+        await db.execute(
+            update(SubmissionJob)
+            .where(SubmissionJob.id == job_id)
+            .values(lease_expires_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+        )
+        await db.commit()
+
+        job = await submission_service.claim_job(db, job_id, "rescuer")
+
+    assert job is not None
+    assert job.lease_owner == "rescuer"
+    assert job.status == SubmissionJobStatus.RUNNING
+    assert job.claim_count == 2
+
+
+class CountingFBRService:
+    """Stand-in FBR service that only counts submissions."""
+
+    def __init__(self) -> None:
+        self.submitted = 0
+
+    async def submit_invoice(self, invoice, ensure_claim=None) -> dict:
+        if ensure_claim is not None:
+            await ensure_claim()
+        self.submitted += 1
+        return {"validationResponse": {"statusCode": "00", "status": "Valid"}, "invoiceNumber": "FBR-1"}
+
+
+@pytest.mark.asyncio
+async def test_reclaimed_job_is_not_resent_over_an_unresolved_attempt():
+    """A crashed claim's open attempt sends the invoice to the reconciler, not to FBR again."""
+    (job_id,) = await _queue_jobs(1)
+
+    async with async_session_maker() as db:
+        claimed = await submission_service.claim_job(db, job_id, "crashed-worker")
+        assert claimed is not None
+        invoice_id = claimed.invoice_id
+
+        # The crashed worker had opened its write-ahead attempt (outcome UNKNOWN)
+        await get_attempt_ledger().open(invoice_id, 1, "https://fbr.example/post")
+        await db.execute(
+            update(SubmissionJob)
+            .where(SubmissionJob.id == job_id)
+            .values(lease_expires_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+        )
+        await db.commit()
+
+        job = await submission_service.claim_job(db, job_id, "rescuer")
+        assert job is not None
+        fbr = CountingFBRService()
+        job = await submission_service.run_submission_job(db, job, fbr)
+
+        invoice_status = (await db.execute(select(Invoice.status).where(Invoice.id == invoice_id))).scalar_one()
+
+    assert fbr.submitted == 0
+    assert job.status == SubmissionJobStatus.FAILED
+    assert invoice_status == InvoiceStatus.UNKNOWN
+
+
+@pytest.mark.asyncio
+async def test_run_stops_once_lease_is_reclaimed():
+    """A runner whose lease passed to another claim neither sends nor settles the job."""
+    (job_id,) = await _queue_jobs(1)
+
+    async with async_session_maker() as db:
+        job = await submission_service.claim_job(db, job_id, "slow-worker")
+        assert job is not None
+        invoice_id = job.invoice_id
+
+        async with async_session_maker() as other:
+            await other.execute(
+                update(SubmissionJob).where(SubmissionJob.id == job_id).values(lease_owner="rescuer")
+            )
+            await other.commit()
+
+        fbr = CountingFBRService()
+        await submission_service.run_submission_job(db, job, fbr)
+
+    async with async_session_maker() as db:
+        job = await db.get(SubmissionJob, job_id)
+        invoice_status = (await db.execute(select(Invoice.status).where(Invoice.id == invoice_id))).scalar_one()
+
+    assert fbr.submitted == 0
+    assert job.status == SubmissionJobStatus.RUNNING
+    assert job.lease_owner == "rescuer"
+    assert invoice_status == InvoiceStatus.QUEUED
+
+    # The rescuer is imaginary; don't leave its job for other tests to claim
+    async with async_session_maker() as db:
+        await db.execute(
+            update(SubmissionJob)
+            .where(SubmissionJob.id == job_id)
+            .values(status=SubmissionJobStatus.FAILED, lease_owner=None)
+        )
+        await db.commit()
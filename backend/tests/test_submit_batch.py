@@ -0,0 +1,90 @@
+"""Tests for bulk invoice submission."""
+
+import uuid
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Invoice, InvoiceStatus
+from app.services import invoice_service
+from app.services.attempt_ledger import get_attempt_ledger
+from conftest import login_headers
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_reports_per_invoice_outcomes(client_with_mock_fbr, create_draft):
+    """Drafts are submitted; unknown and non-draft ids are reported, not submitted."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+
+    draft_ids = [await create_draft(client, headers) for _ in range(3)]
+    missing_id = str(uuid.uuid4())
+
+    response = await client.post(
+        "/api/v1/invoices/submit-batch",
+        json={"invoice_ids": draft_ids + [missing_id]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    results = {r["invoice_id"]: r for r in body["results"]}
+    assert list(results) == draft_ids + [missing_id]
+    for invoice_id in draft_ids:
+        assert results[invoice_id]["status"] in ["submitted", "failed"]
+    assert results[missing_id]["status"] is None
+    assert body["submitted"] + body["failed"] == 4
+
+    # Already-processed invoices are not sent again
+    again = await client.post(
+        "/api/v1/invoices/submit-batch",
+        json={"invoice_ids": draft_ids},
+        headers=headers,
+    )
+    assert again.status_code == 200
+    assert again.json()["submitted"] == 0
+    assert all(r["error"] for r in again.json()["results"])
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_requires_ids(client_with_mock_fbr):
+    """An empty batch is rejected by validation."""
+    client, _ = client_with_mock_fbr
+    headers = await login_headers(client)
+
+    response = await client.post(
+        "/api/v1/invoices/submit-batch", json={"invoice_ids": []}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+class CrashingFBRService:
+    """Raises mid-submission, after opening an attempt for the invoices in `sent`."""
+
+    def __init__(self, sent: set[UUID]):
+        self.sent = sent
+
+    async def submit_invoice(self, invoice) -> dict:
+        if invoice.id in self.sent:
+            await get_attempt_ledger().open(invoice.id, 1, "https://fbr.example/post")
+        raise RuntimeError("worker bug")
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_crash_after_send_is_unknown(client, create_draft):
+    """A crash fails the invoice only if no attempt was opened; otherwise it is UNKNOWN."""
+    headers = await login_headers(client)
+    sent, unsent = [UUID(await create_draft(client, headers)) for _ in range(2)]
+
+    async with async_session_maker() as db:
+        tenant_id = (await db.execute(select(Invoice.tenant_id).where(Invoice.id == sent))).scalar_one()
+        outcomes = await invoice_service.submit_invoices_batch(
+            db, tenant_id, [sent, unsent], CrashingFBRService({sent})
+        )
+
+    assert [(invoice_id, status) for invoice_id, status, _ in outcomes] == [
+        (sent, InvoiceStatus.UNKNOWN),
+        (unsent, InvoiceStatus.FAILED),
+    ]
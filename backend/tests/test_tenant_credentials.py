@@ -0,0 +1,178 @@
+"""Tests for per-tenant FBR tokens."""
+
+import uuid
+from types import SimpleNamespace
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import Invoice, Tenant
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.fbr_service import FBRService
+from app.services.rate_limiter import FBRRateLimiter
+from app.services.tenant_credentials import TenantTokenCache, TenantTokenError
+from app.utils.security import decrypt_secret, encrypt_secret
+from conftest import login_headers
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingDecrypt:
+    """decrypt_secret that counts how often it runs."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, stored: str) -> str:
+        self.calls += 1
+        return decrypt_secret(stored)
+
+
+def _cache(clock: FakeClock, decrypt: CountingDecrypt, **overrides) -> TenantTokenCache:
+    settings = get_settings().model_copy(
+        update={
+            "fbr_auth_token": "platform-token",
+            "fbr_token_cache_size": 2,
+            "fbr_token_cache_ttl_seconds": 60.0,
+            **overrides,
+        }
+    )
+    return TenantTokenCache(settings=settings, clock=clock, decrypt=decrypt)
+
+
+def _tenant(token: str | None) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), fbr_token=encrypt_secret(token) if token else None)
+
+
+def test_encrypted_secret_round_trip():
+    """Tokens are stored encrypted; legacy plaintext values still read back."""
+    stored = encrypt_secret("tenant-token")
+    assert stored != "tenant-token"
+    assert decrypt_secret(stored) == "tenant-token"
+    assert decrypt_secret("legacy-plaintext") == "legacy-plaintext"
+
+
+def test_cache_decrypts_once_per_ttl():
+    """Repeated lookups hit the cache until the TTL expires."""
+    clock, decrypt = FakeClock(), CountingDecrypt()
+    cache = _cache(clock, decrypt)
+    tenant = _tenant("tenant-a")
+
+    assert cache.token_for(tenant) == "tenant-a"
+    assert cache.token_for(tenant) == "tenant-a"
+    assert decrypt.calls == 1
+
+    clock.now = 61.0
+    assert cache.token_for(tenant) == "tenant-a"
+    assert decrypt.calls == 2
+
+
+def test_cache_evicts_least_recently_used():
+    """Beyond the size limit the least recently used tenant is dropped."""
+    clock, decrypt = FakeClock(), CountingDecrypt()
+    cache = _cache(clock, decrypt)
+    a, b, c = _tenant("a"), _tenant("b"), _tenant("c")
+
+    cache.token_for(a)
+    cache.token_for(b)
+    cache.token_for(a)  # b is now least recently used
+    cache.token_for(c)
+    assert decrypt.calls == 3
+
+    cache.token_for(a)
+    assert decrypt.calls == 3
+    cache.token_for(b)
+    assert decrypt.calls == 4
+
+
+def test_rotation_is_picked_up_without_restart():
+    """A different stored value, or an explicit invalidation, forces a fresh decrypt."""
+    clock, decrypt = FakeClock(), CountingDecrypt()
+    cache = _cache(clock, decrypt)
+    tenant = _tenant("old-token")
+    assert cache.token_for(tenant) == "old-token"
+
+    tenant.fbr_token = encrypt_secret("new-token")
+    assert cache.token_for(tenant) == "new-token"
+
+    cache.invalidate(tenant.id)
+    assert cache.token_for(tenant) == "new-token"
+    assert decrypt.calls == 3
+
+
+def test_fallback_and_undecryptable_tokens():
+    """Tenants without a token use the platform token; corrupt ones raise."""
+    cache = _cache(FakeClock(), CountingDecrypt())
+    assert cache.token_for(_tenant(None)) == "platform-token"
+    assert cache.token_for(None) == "platform-token"
+
+    broken = SimpleNamespace(id=uuid.uuid4(), fbr_token="fernet:not-a-valid-token")
+    with pytest.raises(TenantTokenError):
+        cache.token_for(broken)
+
+
+@pytest.mark.asyncio
+async def test_submission_uses_rotated_tenant_token(client, create_draft):
+    """Rotating through the API changes the Authorization header of the next submission."""
+    headers = await login_headers(client)
+    invoice_id = await create_draft(client, headers)
+    async with async_session_maker() as db:
+        tenant_id = (await db.get(Invoice, UUID(invoice_id))).tenant_id
+        original = (await db.get(Tenant, tenant_id)).fbr_token
+
+    response = await client.put(
+        "/api/v1/tenant/fbr-token", json={"fbr_token": "rotated-token"}, headers=headers
+    )
+    assert response.status_code == 204
+
+    async with async_session_maker() as db:
+        invoice = (
+            await db.execute(
+                select(Invoice)
+                .where(Invoice.id == UUID(invoice_id))
+                .options(selectinload(Invoice.items), selectinload(Invoice.tenant))
+            )
+        ).scalar_one()
+    assert invoice.tenant.fbr_token.startswith("fernet:")
+
+    seen: list[str] = []
+
+    def gateway(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"invoiceNumber": "7000007DI1747119701593"})
+
+    settings = get_settings().model_copy(
+        update={"fbr_rate_limit_enabled": False, "fbr_breaker_enabled": False}
+    )
+    service = FBRService(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(gateway)),
+        rate_limiter=FBRRateLimiter(settings=settings),
+        breaker=CircuitBreaker(settings=settings),
+    )
+    try:
+        await service.submit_invoice(invoice)
+        assert seen == ["Bearer rotated-token"]
+
+        # Clearing the token falls back to the platform token
+        response = await client.put("/api/v1/tenant/fbr-token", json={"fbr_token": None}, headers=headers)
+        assert response.status_code == 204
+        async with async_session_maker() as db:
+            assert (await db.get(Tenant, tenant_id)).fbr_token is None
+    finally:
+        await service.client.aclose()
+        async with async_session_maker() as db:
+            await db.execute(update(Tenant).where(Tenant.id == tenant_id).values(fbr_token=original))
+            await db.commit()
@@ -0,0 +1,90 @@
+"""Tests for batch pre-validation and the validation result cache."""
+
+import uuid
+
+import pytest
+
+from app.config import get_settings
+from app.services.validation_cache import ValidationCache
+from conftest import login_headers
+
+VALID = {"validationResponse": {"statusCode": "00", "status": "Valid", "invoiceStatuses": []}}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_validation_cache_ttl_lru_and_conclusive_only():
+    """Entries expire, the least recently used is evicted, and errors are never cached."""
+    clock = FakeClock()
+    settings = get_settings().model_copy(
+        update={"fbr_validation_cache_size": 2, "fbr_validation_cache_ttl_seconds": 60.0}
+    )
+    cache = ValidationCache(settings=settings, clock=clock)
+
+    cache.put("error", {"error": "ReadTimeout"})
+    assert cache.get("error") is None
+
+    cache.put("a", VALID)
+    cache.put("b", VALID)
+    assert cache.get("a") == VALID  # b is now least recently used
+    cache.put("c", VALID)
+    assert cache.get("b") is None
+    assert cache.get("c") == VALID
+
+    clock.now = 61.0
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_reuses_results_for_unchanged_drafts(client_with_mock_fbr, create_draft):
+    """Unchanged drafts are answered from the cache; others are reported, not validated."""
+    client, mock_service = client_with_mock_fbr
+    headers = await login_headers(client)
+
+    calls = 0
+    validate = mock_service.validate_invoice
+
+    async def counting_validate(invoice, payload=None, db=None):
+        nonlocal calls
+        calls += 1
+        return await validate(invoice, payload)
+
+    mock_service.validate_invoice = counting_validate
+
+    # invoiceRefNo is not part of the payload; vary the buyer so each draft
+    # has its own body (and SHA-256) instead of sharing one cache entry
+    draft_ids = [
+        await create_draft(client, headers, buyer_business_name=f"Batch Buyer {uuid.uuid4().hex[:8]}")
+        for _ in range(3)
+    ]
+    missing_id = str(uuid.uuid4())
+
+    response = await client.post(
+        "/api/v1/invoices/validate-batch",
+        json={"invoice_ids": draft_ids + [missing_id]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    results = {r["invoice_id"]: r for r in body["results"]}
+
+    assert list(results) == draft_ids + [missing_id]
+    assert body["valid"] == 3 and body["errors"] == 1
+    assert all(results[i]["valid"] and not results[i]["cached"] for i in draft_ids)
+    assert results[missing_id]["valid"] is None
+    assert calls == 3
+
+    again = await client.post(
+        "/api/v1/invoices/validate-batch", json={"invoice_ids": draft_ids}, headers=headers
+    )
+    assert again.status_code == 200
+    assert all(r["cached"] and r["valid"] for r in again.json()["results"])
+    assert calls == 3